@@ -3,21 +3,35 @@
 Upbit Pro Algo-Trader v3.0
 
 API 키 등 민감 정보의 안전한 암호화/복호화
+- PBKDF2 반복 횟수는 벤치마크로 결정하고 보안 파일에 함께 저장
+- 파생된 키는 세션 동안 메모리에 캐시 (잠금 해제 후 재조회 시 KDF 반복 없음)
 """
 
 import os
+import time
 import base64
 import hashlib
-from typing import Optional
+import threading
+from typing import Dict, Optional, Tuple
 
-# 암호화 라이브러리 (옵션)
-try:
-    from cryptography.fernet import Fernet, InvalidToken
-    from cryptography.hazmat.primitives import hashes
-    from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
-    CRYPTO_AVAILABLE = True
-except ImportError:
-    CRYPTO_AVAILABLE = False
+from upbit_startup import module_available
+
+# 암호화 라이브러리 (옵션 - 설치 여부만 확인, 실제 import는 초기화 시)
+CRYPTO_AVAILABLE = module_available('cryptography')
+
+# PBKDF2-SHA256 반복 횟수
+DEFAULT_KDF_ITERATIONS = 480000  # 반복 횟수 정보가 없는 기존 보안 파일
+MIN_KDF_ITERATIONS = 600000      # 새 보안 파일의 하한 (OWASP 권장 600,000회, 느린 PC에서도 이 이상)
+
+def benchmark_kdf(target_seconds: float = 0.5, probe_iterations: int = 20000) -> int:
+    """target_seconds 동안 걸리는 PBKDF2 반복 횟수 측정 (1만 단위 내림, 하한 MIN_KDF_ITERATIONS)"""
+    start = time.perf_counter()
+    hashlib.pbkdf2_hmac('sha256', b'benchmark', os.urandom(16), probe_iterations)
+    elapsed = max(time.perf_counter() - start, 1e-6)
+    rate = probe_iterations / elapsed
+    
+    iterations = int(rate * target_seconds) // 10000 * 10000
+    return max(iterations, MIN_KDF_ITERATIONS)
 
 
 class CryptoManager:
@@ -26,14 +40,25 @@ class CryptoManager:
     # 솔트 파일 경로
     SALT_FILE = ".upbit_salt"
     
-    def __init__(self, master_password: str = ""):
+    # 세션 키 캐시: (솔트, 반복 횟수, 비밀번호 다이제스트) → Fernet 키
+    _key_cache: Dict[Tuple[bytes, int, bytes], bytes] = {}
+    _key_cache_lock = threading.Lock()
+    
+    def __init__(self, master_password: str = "", iterations: int = DEFAULT_KDF_ITERATIONS):
         self.master_password = master_password
-        self.cipher: Optional[Fernet] = None
+        self.iterations = iterations
+        self.cipher: Optional['Fernet'] = None
         self.is_initialized = False
         
         if master_password:
             self.initialize(master_password)
     
+    @classmethod
+    def clear_key_cache(cls):
+        """세션 키 캐시 비우기 (잠금 시)"""
+        with cls._key_cache_lock:
+            cls._key_cache.clear()
+    
     def initialize(self, master_password: str) -> bool:
         """암호화 초기화"""
         if not CRYPTO_AVAILABLE:
@@ -41,6 +66,7 @@ class CryptoManager:
             return False
         
         try:
+            from cryptography.fernet import Fernet
             self.master_password = master_password
             salt = self._get_or_create_salt()
             key = self._derive_key(master_password, salt)
@@ -64,14 +90,25 @@ class CryptoManager:
             return salt
     
     def _derive_key(self, password: str, salt: bytes) -> bytes:
-        """비밀번호에서 키 파생 (PBKDF2)"""
+        """비밀번호에서 키 파생 (PBKDF2, 세션 캐시)"""
+        from cryptography.hazmat.primitives import hashes
+        from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
+        
+        cache_key = (salt, self.iterations, hashlib.sha256(salt + password.encode()).digest())
+        with self._key_cache_lock:
+            key = self._key_cache.get(cache_key)
+        if key is not None:
+            return key
+        
         kdf = PBKDF2HMAC(
             algorithm=hashes.SHA256(),
             length=32,
             salt=salt,
-            iterations=480000,
+            iterations=self.iterations,
         )
         key = base64.urlsafe_b64encode(kdf.derive(password.encode()))
+        with self._key_cache_lock:
+            self._key_cache[cache_key] = key
         return key
     
     def encrypt(self, data: str) -> str:
@@ -87,6 +124,8 @@ class CryptoManager:
         if not self.is_initialized or not self.cipher:
             raise RuntimeError("암호화 모듈이 초기화되지 않았습니다.")
         
+        from cryptography.fernet import InvalidToken
+        
         try:
             decoded = base64.urlsafe_b64decode(encrypted_data.encode())
             decrypted = self.cipher.decrypt(decoded)
@@ -137,10 +176,12 @@ class SecureStorage:
     SECURE_FILE = ".upbit_secure"
     TEST_STRING = "UPBIT_SECURE_TEST"
     
-    def __init__(self):
+    def __init__(self, kdf_iterations: int = 0, kdf_target_seconds: float = 0.5):
         self.crypto: Optional[CryptoManager] = None
         self.data = {}
         self.is_unlocked = False
+        self.kdf_iterations = kdf_iterations  # 0 = 새 저장소 생성 시 벤치마크로 결정 (하한 MIN_KDF_ITERATIONS)
+        self.kdf_target_seconds = kdf_target_seconds
     
     def is_first_run(self) -> bool:
         """첫 실행 여부 확인"""
@@ -148,12 +189,15 @@ class SecureStorage:
     
     def setup(self, master_password: str) -> bool:
         """보안 저장소 초기 설정"""
-        self.crypto = CryptoManager(master_password)
+        iterations = max(self.kdf_iterations, MIN_KDF_ITERATIONS) if self.kdf_iterations \
+            else benchmark_kdf(self.kdf_target_seconds)
+        self.crypto = CryptoManager(master_password, iterations)
         if not self.crypto.is_initialized:
             return False
         
         # 테스트 문자열 암호화하여 저장 (비밀번호 검증용)
         self.data = {
+            '_kdf_iterations': iterations,
             '_test': self.crypto.encrypt(self.TEST_STRING),
             'access_key': '',
             'secret_key': '',
@@ -166,12 +210,17 @@ class SecureStorage:
     
     def unlock(self, master_password: str) -> bool:
         """저장소 잠금 해제"""
-        self.crypto = CryptoManager(master_password)
+        try:
+            self._load()
+        except Exception:
+            return False
+        
+        iterations = int(self.data.get('_kdf_iterations', DEFAULT_KDF_ITERATIONS))
+        self.crypto = CryptoManager(master_password, iterations)
         if not self.crypto.is_initialized:
             return False
         
         try:
-            self._load()
             # 테스트 문자열로 비밀번호 검증
             test = self.crypto.decrypt(self.data.get('_test', ''))
             if test != self.TEST_STRING:
@@ -181,6 +230,12 @@ class SecureStorage:
         except Exception:
             return False
     
+    def lock(self):
+        """저장소 잠금 (세션 키 캐시 삭제)"""
+        self.crypto = None
+        self.is_unlocked = False
+        CryptoManager.clear_key_cache()
+    
     def _load(self):
         """파일에서 로드"""
         if os.path.exists(self.SECURE_FILE):
@@ -3,20 +3,16 @@
 Upbit Pro Algo-Trader v3.0
 
 거래 알림, 일일 리포트 등을 텔레그램으로 발송
+실제 전송은 upbit_notifiers의 공유 텔레그램 클라이언트가 담당
+(프로세스 공용 이벤트 루프 1개, 채팅방당 전송 간격 제한 및 묶음 전송)
 """
 
-import asyncio
-import threading
 from datetime import datetime
 from typing import Optional
 
-# 텔레그램 봇 라이브러리 (옵션)
-try:
-    from telegram import Bot
-    from telegram.error import TelegramError
-    TELEGRAM_AVAILABLE = True
-except ImportError:
-    TELEGRAM_AVAILABLE = False
+from upbit_notifiers import (
+    TELEGRAM_AVAILABLE, EventType, TelegramNotifier as TelegramClient, get_telegram_client
+)
 
 
 class TelegramNotifier:
@@ -25,10 +21,8 @@ class TelegramNotifier:
     def __init__(self, bot_token: str = "", chat_id: str = ""):
         self.bot_token = bot_token
         self.chat_id = chat_id
-        self.bot: Optional[Bot] = None
+        self.client: Optional[TelegramClient] = None
         self.enabled = False
-        self._loop = None
-        self._thread = None
         
         # 알림 설정
         self.notify_buy = True      # 매수 알림
@@ -40,60 +34,24 @@ class TelegramNotifier:
             self.initialize()
     
     def initialize(self) -> bool:
-        """봇 초기화"""
-        if not TELEGRAM_AVAILABLE:
-            print("[텔레그램] python-telegram-bot 라이브러리가 설치되지 않았습니다.")
-            return False
-        
+        """공유 텔레그램 클라이언트 연결"""
         if not self.bot_token or not self.chat_id:
             return False
         
         try:
-            self.bot = Bot(token=self.bot_token)
-            self.enabled = True
-            
-            # 비동기 이벤트 루프를 별도 스레드에서 실행
-            self._loop = asyncio.new_event_loop()
-            self._thread = threading.Thread(target=self._run_loop, daemon=True)
-            self._thread.start()
-            
-            return True
+            self.client = get_telegram_client(self.bot_token, self.chat_id)
+            self.enabled = self.client.enabled
+            return self.enabled
         except Exception as e:
             print(f"[텔레그램] 초기화 실패: {e}")
             self.enabled = False
             return False
     
-    def _run_loop(self):
-        """이벤트 루프 실행"""
-        asyncio.set_event_loop(self._loop)
-        self._loop.run_forever()
-    
-    def _schedule_coroutine(self, coro):
-        """코루틴을 이벤트 루프에 스케줄"""
-        if self._loop and self._loop.is_running():
-            asyncio.run_coroutine_threadsafe(coro, self._loop)
-    
-    async def _send_message_async(self, message: str) -> bool:
-        """비동기 메시지 발송"""
-        if not self.bot or not self.enabled:
-            return False
-        
-        try:
-            await self.bot.send_message(
-                chat_id=self.chat_id,
-                text=message,
-                parse_mode='HTML'
-            )
-            return True
-        except TelegramError as e:
-            print(f"[텔레그램] 발송 실패: {e}")
-            return False
-    
-    def send_message(self, message: str):
-        """동기 래퍼 - 메시지 발송"""
-        if not self.enabled:
+    def send_message(self, message: str, event_type: EventType = EventType.INFO):
+        """메시지 발송 (HTML, 공유 클라이언트 대기열에 추가만 함)"""
+        if not self.enabled or not self.client:
             return
-        self._schedule_coroutine(self._send_message_async(message))
+        self.client.send(message, event_type, html_text=True)
     
     def send_buy_alert(self, ticker: str, price: float, amount: float):
         """매수 체결 알림"""
@@ -108,7 +66,7 @@ class TelegramNotifier:
             f"금액: {amount:,.0f}원\n"
             f"시간: {datetime.now().strftime('%H:%M:%S')}"
         )
-        self.send_message(message)
+        self.send_message(message, EventType.BUY)
     
     def send_sell_alert(self, ticker: str, price: float, profit_rate: float, reason: str = ""):
         """매도 체결 알림"""
@@ -127,7 +85,7 @@ class TelegramNotifier:
             f"사유: {reason}\n"
             f"시간: {datetime.now().strftime('%H:%M:%S')}"
         )
-        self.send_message(message)
+        self.send_message(message, EventType.SELL)
     
     def send_loss_cut_alert(self, ticker: str, price: float, loss_rate: float):
         """손절 알림"""
@@ -142,7 +100,7 @@ class TelegramNotifier:
             f"손실률: <b>{loss_rate:.2f}%</b>\n"
             f"시간: {datetime.now().strftime('%H:%M:%S')}"
         )
-        self.send_message(message)
+        self.send_message(message, EventType.STOP_LOSS)
     
     def send_daily_report(self, stats: dict):
         """일일 리포트 발송"""
@@ -210,9 +168,7 @@ class TelegramNotifier:
         self.notify_daily = daily
     
     def stop(self):
-        """종료"""
-        if self._loop:
-            self._loop.call_soon_threadsafe(self._loop.stop)
+        """종료 (공유 클라이언트는 유지, 이 인스턴스의 발송만 중단)"""
         self.enabled = False
 
 
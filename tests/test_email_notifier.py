@@ -0,0 +1,197 @@
+"""
+EmailNotifier 세션 재사용 / 재연결 / keepalive 테스트
+
+localhost에 최소 SMTP 서버를 띄워 실제 smtplib 대화로 확인합니다.
+"""
+
+import socket
+import socketserver
+import threading
+
+import pytest
+
+from upbit_notifiers import (
+    EmailNotifier, EventType, Notification, NotificationDispatcher, ChannelPolicy, PartialDelivery
+)
+
+
+class _SMTPHandler(socketserver.StreamRequestHandler):
+    """EHLO / AUTH PLAIN / MAIL / RCPT / DATA / NOOP / RSET / QUIT만 처리"""
+
+    def handle(self):
+        server = self.server
+        with server.lock:
+            server.connections += 1
+            server.sockets.append(self.connection)
+        self._reply("220 localhost test SMTP")
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            command = line.decode('ascii', 'replace').strip()
+            verb = command.split(' ', 1)[0].upper()
+            if verb == 'EHLO':
+                self._reply("250-localhost", "250 AUTH PLAIN LOGIN")
+            elif verb == 'HELO':
+                self._reply("250 localhost")
+            elif verb == 'AUTH':
+                self._reply("235 Authentication successful")
+            elif verb in ('MAIL', 'RCPT', 'RSET'):
+                self._reply("250 OK")
+            elif verb == 'NOOP':
+                with server.lock:
+                    server.noops += 1
+                self._reply("250 OK")
+            elif verb == 'DATA':
+                self._reply("354 End data with <CR><LF>.<CR><LF>")
+                while self.rfile.readline() not in (b'.\r\n', b''):
+                    pass
+                with server.lock:
+                    server.messages += 1
+                    fail = server.fail_after is not None and server.messages > server.fail_after
+                if fail:
+                    self.connection.close()
+                    return
+                self._reply("250 OK queued")
+            elif verb == 'QUIT':
+                self._reply("221 Bye")
+                return
+            else:
+                self._reply("502 Command not implemented")
+
+    def _reply(self, *lines):
+        self.wfile.write(''.join(f"{line}\r\n" for line in lines).encode('ascii'))
+
+
+class _SMTPServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self):
+        super().__init__(('127.0.0.1', 0), _SMTPHandler)
+        self.lock = threading.Lock()
+        self.connections = 0
+        self.messages = 0
+        self.noops = 0
+        self.fail_after = None  # N통 이후 DATA에서 연결 끊기
+        self.sockets = []
+
+    def drop_all(self):
+        """서버 쪽에서 열린 연결 모두 끊기 (유휴 타임아웃 / 재시작 흉내)"""
+        with self.lock:
+            sockets, self.sockets = self.sockets, []
+        for sock in sockets:
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+            sock.close()
+
+
+@pytest.fixture
+def smtp_server():
+    server = _SMTPServer()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _notifier(server, **kwargs):
+    return EmailNotifier('127.0.0.1', server.server_address[1], 'user', 'pass',
+                         ['to@example.com'], use_tls=False, timeout=5, **kwargs)
+
+
+def test_session_reused_across_sends(smtp_server):
+    email = _notifier(smtp_server)
+    assert email.send_messages([("a", "1"), ("b", "2")]) == 2
+    assert email.send("c", "3")
+    assert smtp_server.messages == 3
+    assert email.connect_count == 1
+    assert smtp_server.connections == 1
+    email.close()
+
+
+def test_reconnect_after_server_drop(smtp_server):
+    email = _notifier(smtp_server)
+    assert email.send("a", "1")
+    smtp_server.drop_all()
+
+    assert email.send("b", "2")
+    assert smtp_server.messages == 2
+    assert email.connect_count == 2
+    email.close()
+
+
+def test_keepalive_noop_and_idle_close(smtp_server):
+    email = _notifier(smtp_server)
+    assert email.send("a", "1")
+
+    email.keepalive()
+    assert smtp_server.noops == 1
+    assert email._server is not None
+
+    # 서버가 끊은 세션은 keepalive에서 정리되고 다음 전송 때 다시 연결
+    smtp_server.drop_all()
+    email.keepalive()
+    assert email._server is None
+    assert email.send("b", "2")
+    assert email.connect_count == 2
+
+    # 유휴 시간 초과 시 NOOP 없이 종료
+    email.idle_timeout = 0
+    email.keepalive()
+    assert email._server is None
+    assert smtp_server.noops == 1
+    email.close()
+
+
+def test_partial_batch_reports_remaining(smtp_server):
+    email = _notifier(smtp_server)
+    smtp_server.fail_after = 1  # 첫 통만 성공, 두 번째 DATA에서 끊김 (재연결 후에도 실패)
+    batch = [
+        Notification(EventType.EMERGENCY, "e1"),
+        Notification(EventType.EMERGENCY, "e2"),
+        Notification(EventType.ERROR, "err"),
+    ]
+    with pytest.raises(PartialDelivery) as info:
+        email.send_batch(list(batch))
+    assert info.value.sent == 1
+    assert [n.message for n in info.value.remaining] == ["e2", "err"]
+    email.close()
+
+
+def test_dispatcher_counts_partial_delivery(smtp_server):
+    email = _notifier(smtp_server)
+    smtp_server.fail_after = 1
+    dispatcher = NotificationDispatcher()
+    done = threading.Event()
+    calls = []
+
+    def sender(batch):
+        calls.append([n.message for n in batch])
+        if len(calls) == 2:
+            smtp_server.fail_after = None  # 재시도에서는 성공
+        try:
+            return email.send_batch(batch)
+        finally:
+            if len(calls) == 2:
+                done.set()
+
+    dispatcher.register('email', sender, ChannelPolicy(coalesce_window=0, min_interval=0,
+                                                       backoff_base=0.01, max_batch=10))
+    # 두 알림이 한 배치로 묶이도록 루프를 잠시 붙잡아 둔 채 제출
+    gate = threading.Event()
+    dispatcher._loop.call_soon_threadsafe(gate.wait)
+    dispatcher.submit('email', Notification(EventType.EMERGENCY, "e1"))
+    dispatcher.submit('email', Notification(EventType.EMERGENCY, "e2"))
+    gate.set()
+    assert done.wait(5)
+    dispatcher.stop()
+    email.close()
+
+    assert calls[0] == ["e1", "e2"]
+    assert calls[1] == ["e2"]  # 이미 보낸 e1은 다시 보내지 않음
+    assert dispatcher.stats()['email']['sent'] == 2
+    assert dispatcher.stats()['email']['failed'] == 0
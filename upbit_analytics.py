@@ -5,12 +5,17 @@ Upbit Analytics v1.0
 일별/월별/코인별 성과 분석 및 리포트 생성
 """
 
-import json
 import os
+import json
+import logging
+import pandas as pd
+import numpy as np
 from dataclasses import dataclass, field
 from typing import List, Dict, Optional
 from datetime import datetime, timedelta
-from collections import defaultdict
+
+from upbit_trade_journal import iter_trade_records
+from upbit_trade_store import TradeStore, is_store_path
 
 
 @dataclass
@@ -39,157 +44,329 @@ class CoinPerformance:
 
 
 class UpbitTradingAnalytics:
-    """Upbit 트레이딩 분석 클래스"""
+    """Upbit 트레이딩 분석 클래스
+
+    기록은 처음 한 번만 읽고, 이후에는 새로 추가된 기록만 읽어
+    타입이 지정된 컬럼형 프레임(pandas)에 이어 붙입니다.
+    - JSON Lines 저널: 마지막으로 읽은 바이트 오프셋부터 이어 읽기
+    - SQLite 저장소: 마지막으로 반영한 rowid 이후만 조회
+    - 기존 기록이 바뀐 경우(압축/삭제/파일 교체)에만 전체 재구성
+    - 시각은 추가 시 한 번만 파싱해 날짜/월/시간 컬럼으로 캐시
+    - 집계는 groupby 벡터 연산, 결과는 프레임이 바뀔 때까지 캐시
+    """
     
-    def __init__(self, history_file: str = "trade_history.json"):
+    STORE_FETCH_BATCH = 5000
+    
+    def __init__(self, history_file: str = "trade_history.db"):
         self.history_file = history_file
-        self.trade_history = self._load_history()
+        self.store: Optional[TradeStore] = TradeStore(history_file) if is_store_path(history_file) else None
+        self._reset()
+        self.refresh()
     
-    def _load_history(self) -> List[Dict]:
-        """거래 내역 로드"""
-        if os.path.exists(self.history_file):
-            try:
-                with open(self.history_file, 'r', encoding='utf-8') as f:
-                    return json.load(f)
-            except:
-                pass
-        return []
+    def _reset(self):
+        """프레임 및 읽기 위치 초기화"""
+        self.frame = self._build_frame([])
+        self._pending: List[Dict] = []
+        self._cache = {}
+        
+        # 읽기 위치 (저널: 오프셋/파일 식별자, 저장소: rowid/세대 번호)
+        self._offset = 0
+        self._file_id = None
+        self._is_array = False
+        self._mtime_ns = None
+        self._last_id = 0
+        self._generation = None
     
+    @staticmethod
+    def _build_frame(records: List[Dict]) -> pd.DataFrame:
+        """기록 dict 목록 → 타입 지정 프레임 (시각 파싱 및 파생 컬럼 계산)"""
+        timestamps = pd.Series(
+            [r.get('timestamp') or r.get('datetime') or '' for r in records], dtype=object
+        )
+        ts = pd.to_datetime(timestamps, format='ISO8601', errors='coerce')
+        profit = pd.to_numeric(
+            pd.Series([r.get('profit') for r in records], dtype=object), errors='coerce'
+        ).fillna(0.0).to_numpy(dtype=np.float64)
+        
+        return pd.DataFrame({
+            'timestamp': ts,
+            'date': ts.dt.normalize(),
+            'month': ts.dt.to_period('M'),
+            'hour': ts.dt.hour.astype('Int8'),
+            'ticker': pd.Categorical([r.get('ticker', 'UNKNOWN') for r in records]),
+            'type': pd.Categorical([r.get('type', '') for r in records]),
+            'profit': profit,
+            'win': profit > 0,
+            'loss': profit < 0,
+        })
+    
+    # =========================================================================
+    # 증분 동기화
+    # =========================================================================
     def refresh(self):
-        """데이터 새로고침"""
-        self.trade_history = self._load_history()
+        """새로 추가된 기록만 프레임에 반영"""
+        try:
+            if self.store:
+                self._sync_store()
+            else:
+                self._sync_file()
+        except Exception as e:
+            logging.error(f"거래 분석 데이터 갱신 실패: {e}")
+        self._flush_pending()
+    
+    def _sync_store(self):
+        """SQLite 저장소 증분 반영 (세대 번호가 바뀌면 전체 재구성)"""
+        generation = self.store.generation()
+        if generation != self._generation:
+            self._reset()
+            self._generation = generation
+        
+        while True:
+            rows = self.store.fetch_since(self._last_id, self.STORE_FETCH_BATCH)
+            self._pending.extend(rows)
+            if rows:
+                self._last_id = rows[-1]['id']
+            if len(rows) < self.STORE_FETCH_BATCH:
+                break
     
+    def _sync_file(self):
+        """JSON Lines 저널 증분 반영 (기존 JSON 배열은 변경 시 전체 재구성)"""
+        try:
+            st = os.stat(self.history_file)
+        except FileNotFoundError:
+            if self._file_id is not None:
+                self._reset()
+            return
+        
+        # 압축/삭제는 새 파일로 교체(os.replace)되므로 파일 식별자로 감지
+        file_id = (st.st_dev, st.st_ino)
+        changed = file_id != self._file_id or st.st_size < self._offset
+        if self._is_array and st.st_mtime_ns != self._mtime_ns:
+            changed = True
+        if changed:
+            self._reset()
+            self._file_id = file_id
+        
+        if st.st_size == self._offset:
+            return
+        
+        with open(self.history_file, 'rb') as f:
+            if self._offset == 0 and f.read(64).lstrip().startswith(b'['):
+                self._is_array = True
+                self._mtime_ns = st.st_mtime_ns
+                self._pending.extend(iter_trade_records(self.history_file))
+                self._offset = st.st_size
+                return
+            
+            f.seek(self._offset)
+            chunk = f.read()
+        
+        # 줄바꿈으로 끝난 라인까지만 반영 (기록 중인 마지막 줄은 다음에)
+        end = chunk.rfind(b'\n')
+        if end < 0:
+            return
+        lines = [line for line in chunk[:end].decode('utf-8', errors='replace').split('\n')
+                 if line.strip()]
+        self._offset += end + 1
+        
+        # 한 번에 배열로 파싱, 손상 라인이 있으면 라인 단위로 다시 파싱
+        try:
+            records = json.loads('[' + ','.join(lines) + ']')
+        except ValueError:
+            records = []
+            for line in lines:
+                try:
+                    records.append(json.loads(line))
+                except ValueError:
+                    logging.warning(f"거래 저널 손상 라인 무시 ({self.history_file})")
+        self._pending.extend(r for r in records if isinstance(r, dict))
+    
+    def _flush_pending(self):
+        """대기 기록을 한 번에 파싱해 프레임에 이어 붙이기"""
+        if not self._pending:
+            return
+        chunk = self._build_frame(self._pending)
+        self._pending = []
+        
+        if self.frame.empty:
+            self.frame = chunk
+        else:
+            # 카테고리를 합쳐 두어야 concat 후에도 category 타입 유지
+            frame = self.frame
+            for column in ('ticker', 'type'):
+                categories = frame[column].cat.categories.union(chunk[column].cat.categories)
+                frame[column] = frame[column].cat.set_categories(categories)
+                chunk[column] = chunk[column].cat.set_categories(categories)
+            self.frame = pd.concat([frame, chunk], ignore_index=True)
+        self._cache.clear()
+    
+    def _cached(self, key, compute):
+        """프레임이 바뀌기 전까지 집계 결과 재사용"""
+        if key not in self._cache:
+            self._cache[key] = compute()
+        return self._cache[key]
+    
+    def _time_sorted(self) -> pd.DataFrame:
+        """시각순 정렬 프레임 (시각 없는 기록 제외, 동일 시각은 기록 순서 유지)"""
+        return self._cached('time_sorted', lambda: (
+            self.frame[self.frame['timestamp'].notna()]
+            .sort_values('timestamp', kind='stable')
+        ))
+    
+    # =========================================================================
+    # 조회
+    # =========================================================================
     def get_daily_performance(self, days: int = 30) -> List[DailyPerformance]:
         """일별 성과 분석"""
         self.refresh()
         
-        daily_data = defaultdict(lambda: {
-            'trades': 0, 'wins': 0, 'losses': 0,
-            'pnl': 0.0, 'max_win': 0.0, 'max_loss': 0.0
-        })
-        
-        cutoff = datetime.now() - timedelta(days=days)
-        
-        for trade in self.trade_history:
-            try:
-                trade_date = trade.get('datetime', '')[:10]
-                trade_dt = datetime.strptime(trade_date, '%Y-%m-%d')
-                
-                if trade_dt < cutoff:
-                    continue
-                
-                profit = trade.get('profit', 0)
-                
-                daily_data[trade_date]['trades'] += 1
-                daily_data[trade_date]['pnl'] += profit
-                
-                if profit > 0:
-                    daily_data[trade_date]['wins'] += 1
-                    daily_data[trade_date]['max_win'] = max(
-                        daily_data[trade_date]['max_win'], profit
-                    )
-                elif profit < 0:
-                    daily_data[trade_date]['losses'] += 1
-                    daily_data[trade_date]['max_loss'] = min(
-                        daily_data[trade_date]['max_loss'], profit
-                    )
-            except:
-                continue
+        cutoff = pd.Timestamp(datetime.now() - timedelta(days=days)).normalize()
+        return self._cached(('daily', cutoff), lambda: self._daily_performance(cutoff))
+    
+    def _daily_performance(self, cutoff: pd.Timestamp) -> List[DailyPerformance]:
+        frame = self.frame[self.frame['date'] > cutoff]
+        if frame.empty:
+            return []
         
-        result = []
-        for date, data in sorted(daily_data.items()):
-            result.append(DailyPerformance(
-                date=date,
-                total_trades=data['trades'],
-                winning_trades=data['wins'],
-                losing_trades=data['losses'],
-                total_pnl=data['pnl'],
-                max_win=data['max_win'],
-                max_loss=data['max_loss']
-            ))
+        grouped = frame.assign(
+            pos=frame['profit'].clip(lower=0), neg=frame['profit'].clip(upper=0)
+        ).groupby('date', sort=True).agg(
+            trades=('profit', 'size'), wins=('win', 'sum'), losses=('loss', 'sum'),
+            pnl=('profit', 'sum'), max_win=('pos', 'max'), max_loss=('neg', 'min')
+        )
         
-        return result
+        return [
+            DailyPerformance(
+                date=date.strftime('%Y-%m-%d'),
+                total_trades=int(row.trades),
+                winning_trades=int(row.wins),
+                losing_trades=int(row.losses),
+                total_pnl=float(row.pnl),
+                max_win=float(row.max_win),
+                max_loss=float(row.max_loss)
+            )
+            for date, row in zip(grouped.index, grouped.itertuples(index=False))
+        ]
     
     def get_coin_performance(self) -> List[CoinPerformance]:
         """코인별 성과 분석"""
         self.refresh()
+        return self._cached('coins', self._coin_performance)
+    
+    def _coin_performance(self) -> List[CoinPerformance]:
+        if self.frame.empty:
+            return []
         
-        coin_data = defaultdict(lambda: {
-            'trades': 0, 'wins': 0, 'losses': 0, 'pnl': 0.0, 'pnl_list': []
-        })
-        
-        for trade in self.trade_history:
-            ticker = trade.get('ticker', 'UNKNOWN')
-            profit = trade.get('profit', 0)
-            
-            coin_data[ticker]['trades'] += 1
-            coin_data[ticker]['pnl'] += profit
-            coin_data[ticker]['pnl_list'].append(profit)
-            
-            if profit > 0:
-                coin_data[ticker]['wins'] += 1
-            elif profit < 0:
-                coin_data[ticker]['losses'] += 1
+        grouped = self.frame.groupby('ticker', observed=True).agg(
+            trades=('profit', 'size'), wins=('win', 'sum'),
+            losses=('loss', 'sum'), pnl=('profit', 'sum')
+        ).sort_values('pnl', ascending=False, kind='stable')
         
-        result = []
-        for ticker, data in coin_data.items():
-            avg_pnl = sum(data['pnl_list']) / len(data['pnl_list']) if data['pnl_list'] else 0
-            win_rate = data['wins'] / data['trades'] * 100 if data['trades'] > 0 else 0
-            
-            result.append(CoinPerformance(
-                ticker=ticker,
-                total_trades=data['trades'],
-                winning_trades=data['wins'],
-                losing_trades=data['losses'],
-                total_pnl=data['pnl'],
-                avg_pnl_pct=round(avg_pnl, 2),
-                win_rate=round(win_rate, 2)
-            ))
-        
-        return sorted(result, key=lambda x: x.total_pnl, reverse=True)
+        return [
+            CoinPerformance(
+                ticker=str(ticker),
+                total_trades=int(row.trades),
+                winning_trades=int(row.wins),
+                losing_trades=int(row.losses),
+                total_pnl=float(row.pnl),
+                avg_pnl_pct=round(row.pnl / row.trades, 2),
+                win_rate=round(row.wins / row.trades * 100, 2)
+            )
+            for ticker, row in zip(grouped.index, grouped.itertuples(index=False))
+        ]
     
     def get_monthly_summary(self) -> Dict[str, Dict]:
         """월별 요약"""
         self.refresh()
+        monthly = self._cached('monthly', lambda: self._period_summary('month'))
+        return {str(month): dict(data) for month, data in monthly.items()}
+    
+    def get_hourly_performance(self) -> Dict[int, Dict]:
+        """시간대(0~23시)별 성과"""
+        self.refresh()
+        hourly = self._cached('hourly', lambda: self._period_summary('hour'))
+        return {int(hour): dict(data) for hour, data in hourly.items()}
+    
+    def _period_summary(self, column: str) -> Dict:
+        frame = self.frame[self.frame[column].notna()]
+        if frame.empty:
+            return {}
         
-        monthly = defaultdict(lambda: {'trades': 0, 'pnl': 0.0, 'wins': 0})
+        grouped = frame.groupby(column, sort=True).agg(
+            trades=('profit', 'size'), pnl=('profit', 'sum'), wins=('win', 'sum')
+        )
+        return {
+            key: {
+                'trades': int(row.trades),
+                'pnl': float(row.pnl),
+                'wins': int(row.wins),
+                'win_rate': round(row.wins / row.trades * 100, 2),
+            }
+            for key, row in zip(grouped.index, grouped.itertuples(index=False))
+        }
+    
+    def get_rolling_win_rate(self, window: int = 20) -> pd.Series:
+        """최근 N건 청산 거래의 이동 승률(%) - 시각 인덱스"""
+        self.refresh()
         
-        for trade in self.trade_history:
-            try:
-                month = trade.get('datetime', '')[:7]  # YYYY-MM
-                profit = trade.get('profit', 0)
-                
-                monthly[month]['trades'] += 1
-                monthly[month]['pnl'] += profit
-                if profit > 0:
-                    monthly[month]['wins'] += 1
-            except:
-                continue
+        def compute():
+            closed = self._time_sorted()
+            closed = closed[closed['type'] != 'BUY']
+            return (closed['win'].astype(np.float64)
+                    .rolling(window, min_periods=1).mean()
+                    .mul(100)
+                    .set_axis(closed['timestamp']))
         
-        return dict(sorted(monthly.items()))
+        return self._cached(('rolling_win_rate', window), compute)
+    
+    def get_equity_curve(self) -> pd.DataFrame:
+        """누적 손익 곡선 및 낙폭 (columns: equity, peak, drawdown)"""
+        self.refresh()
+        return self._cached('equity_curve', self._equity_curve)
+    
+    def _equity_curve(self) -> pd.DataFrame:
+        ordered = self._time_sorted()
+        equity = ordered['profit'].cumsum().to_numpy()
+        # 고점은 시작 시점(0)부터 누적 최대값
+        peak = np.maximum.accumulate(np.maximum(equity, 0.0)) if len(equity) else equity
+        return pd.DataFrame(
+            {'equity': equity, 'peak': peak, 'drawdown': equity - peak},
+            index=ordered['timestamp'].to_numpy()
+        )
+    
+    def get_max_drawdown(self) -> float:
+        """최대 낙폭 (누적 손익 기준, 0 이하)"""
+        self.refresh()
+        return self._max_drawdown()
+    
+    def _max_drawdown(self) -> float:
+        curve = self._cached('equity_curve', self._equity_curve)
+        return float(curve['drawdown'].min()) if not curve.empty else 0.0
     
     def get_summary_stats(self) -> Dict:
         """전체 요약 통계"""
         self.refresh()
-        
-        if not self.trade_history:
+        return dict(self._cached('summary', self._summary_stats))
+    
+    def _summary_stats(self) -> Dict:
+        total = len(self.frame)
+        if not total:
             return {'total_trades': 0, 'total_pnl': 0, 'win_rate': 0}
         
-        total = len(self.trade_history)
-        wins = sum(1 for t in self.trade_history if t.get('profit', 0) > 0)
-        total_pnl = sum(t.get('profit', 0) for t in self.trade_history)
-        
-        pnl_list = [t.get('profit', 0) for t in self.trade_history if t.get('profit')]
+        profit = self.frame['profit'].to_numpy()
+        wins = int(self.frame['win'].sum())
+        nonzero = profit[profit != 0]
         
         return {
             'total_trades': total,
             'winning_trades': wins,
             'losing_trades': total - wins,
-            'win_rate': round(wins / total * 100, 2) if total > 0 else 0,
-            'total_pnl': round(total_pnl, 2),
-            'avg_pnl': round(sum(pnl_list) / len(pnl_list), 2) if pnl_list else 0,
-            'max_win': max(pnl_list) if pnl_list else 0,
-            'max_loss': min(pnl_list) if pnl_list else 0,
+            'win_rate': round(wins / total * 100, 2),
+            'total_pnl': round(float(profit.sum()), 2),
+            'avg_pnl': round(float(nonzero.mean()), 2) if nonzero.size else 0,
+            'max_win': float(nonzero.max()) if nonzero.size else 0,
+            'max_loss': float(nonzero.min()) if nonzero.size else 0,
+            'max_drawdown': round(self._max_drawdown(), 2),
         }
     
     def generate_report_html(self, output_path: str = "analytics_report.html") -> str:
@@ -197,6 +374,7 @@ class UpbitTradingAnalytics:
         stats = self.get_summary_stats()
         daily = self.get_daily_performance(30)
         coins = self.get_coin_performance()
+        hourly = self.get_hourly_performance()
         
         html = f"""
 <!DOCTYPE html>
@@ -243,6 +421,10 @@ class UpbitTradingAnalytics:
                 <div class="stat-value">{stats['avg_pnl']:+.2f}%</div>
                 <div class="stat-label">평균 손익</div>
             </div>
+            <div class="stat">
+                <div class="stat-value negative">{stats.get('max_drawdown', 0):+.2f}%</div>
+                <div class="stat-label">최대 낙폭</div>
+            </div>
         </div>
         
         <div class="card">
@@ -260,6 +442,14 @@ class UpbitTradingAnalytics:
                 {''.join(f"<tr><td>{d.date}</td><td>{d.total_trades}</td><td>{d.winning_trades}/{d.losing_trades}</td><td class='{'positive' if d.total_pnl >= 0 else 'negative'}'>{d.total_pnl:+.2f}%</td></tr>" for d in daily[-15:])}
             </table>
         </div>
+        
+        <div class="card">
+            <h2>🕒 시간대별 성과</h2>
+            <table>
+                <tr><th>시간</th><th>거래수</th><th>승률</th><th>손익</th></tr>
+                {''.join(f"<tr><td>{h:02d}시</td><td>{v['trades']}</td><td>{v['win_rate']}%</td><td class='{'positive' if v['pnl'] >= 0 else 'negative'}'>{v['pnl']:+.2f}%</td></tr>" for h, v in hourly.items())}
+            </table>
+        </div>
     </div>
 </body>
 </html>
@@ -0,0 +1,368 @@
+"""
+Upbit Candles v1.0
+캔들 캐시 / 실시간 캔들 집계 for Upbit Pro Algo-Trader
+
+같은 캔들 구간 안에서 반복되는 get_ohlcv 호출을 줄이는 공용 캐시
+- 캔들 구간 경계(KST 기준: 4시간봉 01/05/09/13/17/21시, 일봉 09시)까지 유효
+- 구간 경계 전이라도 max_age를 넘긴 데이터는 다시 조회 (진행 중 봉 갱신)
+- 업비트 시세 API 호출 간격 제한 (초당 10회), fetch_many는 여러 종목 동시 조회
+
+CandleAggregator: 현재가 스냅샷 스트림으로 봉을 직접 만들어 지표 계산에 API 호출 없음
+- 처음 사용하는 (종목, 간격)만 CandleCache로 시드, 이후 스냅샷마다 진행 봉 갱신 / 새 봉 생성
+- 시세가 끊겼던 종목은 REST로 다시 채울 때까지 로컬 봉을 쓰지 않음
+"""
+
+import time
+import datetime
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+
+from upbit_startup import lazy_import
+
+try:
+    pyupbit = lazy_import('pyupbit')
+except ImportError:
+    pyupbit = None
+
+try:
+    pd = lazy_import('pandas')
+except ImportError:
+    pd = None
+
+from upbit_config import Config
+
+
+logger = logging.getLogger('UpbitTrader')
+
+# pyupbit 캔들 간격 → 구간 길이 (초)
+INTERVAL_SECONDS = {
+    "minute1": 60,
+    "minute3": 180,
+    "minute5": 300,
+    "minute10": 600,
+    "minute15": 900,
+    "minute30": 1800,
+    "minute60": 3600,
+    "minute240": 14400,
+    "day": 86400,
+}
+
+
+def candle_start(interval: str, now: Optional[float] = None) -> float:
+    """now가 속한 캔들의 시작 시각 (epoch 초)
+
+    업비트 분봉/일봉은 UTC 자정 기준으로 정렬됩니다 (일봉 = KST 09:00 시작).
+    """
+    seconds = INTERVAL_SECONDS.get(interval, 86400)
+    now = time.time() if now is None else now
+    return now - (now % seconds)
+
+
+def next_candle_boundary(interval: str, now: Optional[float] = None) -> float:
+    """다음 캔들 시작 시각 (epoch 초)"""
+    return candle_start(interval, now) + INTERVAL_SECONDS.get(interval, 86400)
+
+
+def is_current_candle(df, interval: str, now: Optional[float] = None) -> bool:
+    """DataFrame 마지막 봉이 현재 캔들인지 (경계 직후 거래가 없으면 새 봉이 아직 없음)
+
+    get_ohlcv 인덱스는 KST 기준 캔들 시작 시각(naive)입니다.
+    """
+    if df is None or len(df) == 0:
+        return False
+    start_kst = (datetime.datetime.fromtimestamp(candle_start(interval, now), datetime.timezone.utc)
+                 .replace(tzinfo=None) + datetime.timedelta(hours=9))
+    return df.index[-1] >= start_kst
+
+
+class CandleCache:
+    """(티커, 캔들 간격)별 OHLCV DataFrame 캐시 (스레드 안전)"""
+
+    def __init__(self, min_interval: float = Config.CANDLE_API_MIN_INTERVAL):
+        """
+        Args:
+            min_interval: get_ohlcv 호출 최소 간격 (초)
+        """
+        self.min_interval = min_interval
+        # (ticker, interval) → (DataFrame, 조회 시각, 캔들 시작 시각)
+        self._frames: Dict[Tuple[str, str], Tuple[object, float, float]] = {}
+        self._lock = threading.Lock()
+        self._api_lock = threading.Lock()
+        self._next_slot = 0.0
+        self.api_calls = 0
+        self.hits = 0
+
+    def get(self, ticker: str, interval: str, count: int,
+            max_age: Optional[float] = None):
+        """최근 count개 캔들 (캐시가 유효하면 API 호출 없음, 실패 시 None)
+
+        Args:
+            max_age: 캐시 최대 사용 시간 (초). None이면 캔들 구간이 바뀔 때까지 사용
+        """
+        cached = self.peek(ticker, interval, count, max_age)
+        if cached is not None:
+            return cached
+
+        df = self._fetch(ticker, interval, count)
+        if df is None or len(df) == 0:
+            return None
+
+        self._store(ticker, interval, df)
+        return df.iloc[-count:]
+
+    def fetch_many(self, tickers: Iterable[str], interval: str, count: int,
+                   max_workers: int = Config.CANDLE_FETCH_WORKERS) -> Dict[str, object]:
+        """여러 종목 캔들을 동시에 새로 조회해 캐시에 저장 (실패 종목은 None)
+
+        호출 시작 간격은 min_interval로 제한되고, 응답 대기만 겹칩니다.
+        """
+        tickers = list(tickers)
+        if not tickers:
+            return {}
+
+        def fetch(ticker):
+            df = self._fetch(ticker, interval, count)
+            if df is None or len(df) == 0:
+                return None
+            self._store(ticker, interval, df)
+            return df
+
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(tickers))),
+                                thread_name_prefix="CandleFetch") as pool:
+            return dict(zip(tickers, pool.map(fetch, tickers)))
+
+    def peek(self, ticker: str, interval: str, count: int,
+             max_age: Optional[float] = None):
+        """캐시에 유효한 데이터가 있으면 반환 (API 호출 없음)"""
+        now = time.time()
+        with self._lock:
+            entry = self._frames.get((ticker, interval))
+            if entry is None:
+                return None
+            df, fetched_at, start = entry
+            if start != candle_start(interval, now) or len(df) < count:
+                return None
+            if max_age is not None and now - fetched_at > max_age:
+                return None
+            self.hits += 1
+        return df.iloc[-count:]
+
+    def invalidate(self, ticker: Optional[str] = None):
+        """캐시 삭제 (ticker 없으면 전체)"""
+        with self._lock:
+            if ticker is None:
+                self._frames.clear()
+            else:
+                for key in [k for k in self._frames if k[0] == ticker]:
+                    del self._frames[key]
+
+    def _store(self, ticker: str, interval: str, df):
+        now = time.time()
+        with self._lock:
+            self._frames[(ticker, interval)] = (df, now, candle_start(interval, now))
+
+    def _fetch(self, ticker: str, interval: str, count: int):
+        """호출 간격을 지켜 get_ohlcv 호출 (여러 스레드에서 호출 가능)"""
+        # 호출 시각 예약 (잠금은 예약에만 사용, 대기와 요청은 잠금 밖에서)
+        with self._api_lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.min_interval
+            self.api_calls += 1
+        if slot > now:
+            time.sleep(slot - now)
+
+        try:
+            return pyupbit.get_ohlcv(ticker, interval=interval, count=count)
+        except Exception as e:
+            logger.warning(f"캔들 조회 실패 ({ticker}, {interval}): {e}")
+            return None
+
+
+class _Series:
+    """(티커, 간격) 하나의 봉 목록 - [시작 epoch, 시가, 고가, 저가, 종가, 거래량]"""
+
+    __slots__ = ('bars', 'limit', 'acc')
+
+    def __init__(self, bars: List[List[float]], limit: int):
+        self.bars = bars
+        self.limit = limit
+        self.acc: Optional[float] = None  # 직전 스냅샷 누적 거래량 (봉 거래량 = 차이)
+
+
+class CandleAggregator:
+    """현재가 스냅샷 → (티커, 간격)별 OHLCV 봉 (엔진 스레드 전용)
+
+    - 시드: 처음 조회하는 (티커, 간격)은 CandleCache(REST)로 채움 - 사용하는 간격만 유지
+    - 진행 봉: 스냅샷 체결가로 고가/저가/종가 갱신, 체결 시각이 다음 구간이면 새 봉
+    - 거래량: 누적 거래량(acc_trade_volume, UTC 자정 초기화) 차이를 체결 시각의 봉에 더함
+    - 일봉: 스냅샷의 시가/고가/저가/누적 거래량이 곧 진행 중인 일봉 값
+    - 끊김: 같은 종목 스냅샷 간격이 gap_seconds를 넘으면 그 종목 봉은 REST 재조회 전까지 사용 안 함
+
+    분봉 고가/저가는 폴링 간격(1초) 사이의 체결을 보지 못하므로 근사값입니다.
+    캔들 경계마다 refresh_targets가 REST로 다시 시드하지 않아도 되도록,
+    끊김이 없으면 로컬 봉을 그대로 이어 갑니다.
+    """
+
+    def __init__(self, cache: CandleCache,
+                 max_bars: int = Config.CANDLE_HISTORY_BARS,
+                 gap_seconds: float = Config.CANDLE_STREAM_GAP):
+        self.cache = cache
+        self.max_bars = max_bars
+        self.gap_seconds = gap_seconds
+        self._series: Dict[str, Dict[str, _Series]] = {}  # ticker → interval → 봉 목록
+        self._last_seen: Dict[str, float] = {}            # ticker → 마지막 스냅샷 수신 시각
+        self._stale: Set[Tuple[str, str]] = set()         # REST 재조회가 필요한 (ticker, interval)
+        self.local_hits = 0
+
+    # =========================================================================
+    # 조회
+    # =========================================================================
+    def get(self, ticker: str, interval: str, count: int,
+            max_age: Optional[float] = None):
+        """최근 count개 캔들 (로컬 봉이 있으면 API 호출 없음, 실패 시 None)
+
+        로컬 봉이 없거나 끊김 이후면 CandleCache로 조회해 다시 시드합니다.
+        max_age는 CandleCache 조회에만 적용됩니다 (로컬 봉은 항상 최신).
+        """
+        df = self.peek(ticker, interval, count)
+        if df is not None:
+            return df
+
+        stale = (ticker, interval) in self._stale
+        df = self.cache.get(ticker, interval, max(count, self.max_bars),
+                            0.0 if stale else max_age)
+        if df is None or len(df) == 0:
+            return None
+        self.seed(ticker, interval, df)
+        return df.iloc[-count:]
+
+    def peek(self, ticker: str, interval: str, count: int):
+        """로컬 봉으로 만든 DataFrame (없거나 부족하면 None, API 호출 없음)"""
+        series = self._series.get(ticker, {}).get(interval)
+        if series is None or (ticker, interval) in self._stale or len(series.bars) < count:
+            return None
+        self.local_hits += 1
+        return self._frame(series.bars[-count:])
+
+    def array(self, ticker: str, interval: str, count: int):
+        """최근 count개 봉 배열 (N×6: 시작 epoch, 시가, 고가, 저가, 종가, 거래량, 실패 시 None)
+
+        DataFrame을 만들지 않는 계산용 조회 - 로컬 봉이 부족하면 get()으로 다시 시드합니다.
+        """
+        if not self.has_bars(ticker, interval, count):
+            if self.get(ticker, interval, count) is None:
+                return None
+        else:
+            self.local_hits += 1
+        series = self._series[ticker][interval]
+        return np.array(series.bars[-count:], dtype=float)
+
+    def has_bars(self, ticker: str, interval: str, count: int) -> bool:
+        """로컬 봉만으로 최근 count개를 만들 수 있는지 (API 호출 없음)"""
+        series = self._series.get(ticker, {}).get(interval)
+        return (series is not None and (ticker, interval) not in self._stale
+                and len(series.bars) >= count)
+
+    def is_live(self, ticker: str, interval: str) -> bool:
+        """REST 조회 없이 로컬 봉을 쓸 수 있는지"""
+        return (interval in self._series.get(ticker, {})
+                and (ticker, interval) not in self._stale)
+
+    # =========================================================================
+    # 시드 / 집계
+    # =========================================================================
+    def seed(self, ticker: str, interval: str, df):
+        """get_ohlcv DataFrame으로 봉 목록 교체 (끊김 표시 해제)"""
+        if df is None or len(df) == 0:
+            return
+        # 인덱스: KST 기준 캔들 시작 시각 (naive) → epoch 초
+        starts = (df.index - pd.Timestamp('1970-01-01')) // pd.Timedelta(seconds=1) - 9 * 3600
+        values = df[['open', 'high', 'low', 'close', 'volume']].to_numpy(dtype=float)
+        bars = [[float(start), *row] for start, row in zip(starts, values.tolist())]
+        self._series.setdefault(ticker, {})[interval] = _Series(bars, max(self.max_bars, len(bars)))
+        self._stale.discard((ticker, interval))
+
+    def ingest(self, snapshots: Iterable[Dict], now: Optional[float] = None) -> List[str]:
+        """현재가 스냅샷(get_current_price verbose) 반영
+
+        Returns:
+            이번에 끊김이 감지된 티커 목록 (REST 재조회 대상)
+        """
+        now = time.time() if now is None else now
+        gaps = []
+        for snap in snapshots:
+            ticker = snap.get('market')
+            price = snap.get('trade_price')
+            if not ticker or price is None:
+                continue
+
+            last = self._last_seen.get(ticker)
+            self._last_seen[ticker] = now
+            by_interval = self._series.get(ticker)
+            if not by_interval:
+                continue
+            if last is not None and now - last > self.gap_seconds:
+                self._stale.update((ticker, interval) for interval in by_interval)
+                gaps.append(ticker)
+
+            ts = snap.get('trade_timestamp')
+            ts = ts / 1000 if ts else now
+            acc = snap.get('acc_trade_volume')
+            for interval, series in by_interval.items():
+                self._update(series, interval, snap, ts, price, acc)
+        return gaps
+
+    def discard(self, ticker: str):
+        """종목 봉 삭제 (감시 종목 제외 시)"""
+        self._series.pop(ticker, None)
+        self._last_seen.pop(ticker, None)
+        self._stale = {key for key in self._stale if key[0] != ticker}
+
+    @staticmethod
+    def _update(series: _Series, interval: str, snap: Dict, ts: float, price: float,
+                acc: Optional[float]):
+        # 누적 거래량 차이 (감소 = UTC 자정 초기화 → 새 누적값 전체가 이번 몫)
+        volume = 0.0
+        if acc is not None:
+            if series.acc is not None:
+                volume = acc - series.acc if acc >= series.acc else acc
+            series.acc = acc
+
+        bars = series.bars
+        bar = bars[-1]
+        start = candle_start(interval, ts)
+        if start < bar[0]:
+            return  # 이미 지난 봉의 늦은 스냅샷
+        if start > bar[0]:
+            # 새 봉 (체결이 없던 구간은 업비트와 같이 봉을 만들지 않음)
+            bar = [start, price, price, price, price, 0.0]
+            bars.append(bar)
+            if len(bars) > series.limit:
+                del bars[:len(bars) - series.limit]
+        else:
+            if price > bar[2]:
+                bar[2] = price
+            if price < bar[3]:
+                bar[3] = price
+            bar[4] = price
+        bar[5] += volume
+
+        if interval == 'day' and snap.get('opening_price') is not None:
+            # 현재가 API 시가/고가/저가/누적 거래량은 UTC 자정(KST 09:00) 기준 = 진행 중인 일봉
+            bar[1] = snap['opening_price']
+            bar[2] = snap.get('high_price', bar[2])
+            bar[3] = snap.get('low_price', bar[3])
+            if acc is not None:
+                bar[5] = acc
+
+    @staticmethod
+    def _frame(bars: List[List[float]]):
+        """봉 목록 → get_ohlcv와 같은 형식의 DataFrame (KST naive 인덱스)"""
+        index = pd.to_datetime([bar[0] + 9 * 3600 for bar in bars], unit='s')
+        return pd.DataFrame([bar[1:] for bar in bars], index=index, dtype=float,
+                            columns=['open', 'high', 'low', 'close', 'volume'])
@@ -142,9 +142,11 @@ class Config:
     DYNAMIC_POSITION_WIN_RATIO = 1.5     # 이익 시 확대 비율
     DYNAMIC_POSITION_MAX_RATIO = 20.0    # 최대 투자 비율
     
-    # 돌파 확인 (N틱 유지)
+    # 돌파 확인 (N틱 유지, 유지 시간 조건은 0이면 사용 안 함)
     DEFAULT_BREAKOUT_CONFIRM_TICKS = 3
+    DEFAULT_BREAKOUT_CONFIRM_SECONDS = 0
     DEFAULT_USE_BREAKOUT_CONFIRM = False
+    RECENT_PRICE_CAPACITY = 128  # 종목별 최근 가격 링 버퍼 크기 (틱)
     
     # MTF (다중 시간프레임)
     DEFAULT_USE_MTF = False
@@ -157,21 +159,60 @@ class Config:
     GAP_DOWN_K_ADJUST = 1.2  # 갭다운 시 K값 확대 (적극)
     GAP_THRESHOLD = 2.0      # 갭 비율 임계값 (%)
     
+    # ========================================================================
+    # 캔들 캐시 / 전 종목 스캐너
+    # ========================================================================
+    CANDLE_API_MIN_INTERVAL = 0.11  # 캔들 API 호출 간격 (업비트 시세 조회 초당 10회 제한)
+    CANDLE_CACHE_MAX_AGE = 300      # 진행 중인 분봉 재조회 주기 (초)
+    CANDLE_HISTORY_BARS = 60        # 캔들 경계마다 조회하는 봉 수 (MACD 50봉 포함 모든 지표 커버)
+    CANDLE_FETCH_WORKERS = 4        # 캔들 동시 조회 스레드 수
+    CANDLE_ROLLOVER_GRACE = 2.0     # 캔들 경계 후 갱신까지 대기 (초, 새 봉 생성 여유)
+    CANDLE_ROLLOVER_RETRY = 10.0    # 새 봉이 아직 없는 종목 재조회 간격 (초)
+    CANDLE_STREAM_GAP = 10.0        # 시세 스냅샷이 이 시간(초) 이상 끊기면 캔들 REST 재조회
+    FEATURE_BASE_INTERVAL = "minute60"  # MTF 피처 기준 봉 (4시간봉/일봉은 리샘플링)
+    FEATURE_BASE_BARS = 200         # 기준 봉 유지 개수 (일봉 추세 6일 + 진행 중인 날 포함)
+    SCANNER_MIN_TRADE_VALUE = 1_000_000_000  # 분석 대상 최소 24시간 거래대금 (원)
+    SCANNER_NEAR_PCT = 2.0          # 목표가 아래 이 비율(%) 이내면 후보
+    SCANNER_MAX_CHASE_PCT = 3.0     # 목표가 위 이 비율(%) 초과면 추격 매수로 보고 제외
+    SCANNER_TOP_N = 10              # 감시 코인 자동 구성 시 상위 N개
+    
+    # 자동 유니버스 (24시간 거래대금 상위 N종목, 매매 중 주기적 갱신)
+    DEFAULT_USE_AUTO_UNIVERSE = False
+    DEFAULT_AUTO_UNIVERSE_TOP_N = 10
+    DEFAULT_AUTO_UNIVERSE_REFRESH_MINUTES = 60
+    
     # ========================================================================
     # 파일 경로
     # ========================================================================
     SETTINGS_FILE = "upbit_settings.json"
     PRESETS_FILE = "upbit_presets.json"
-    TRADE_HISTORY_FILE = "trade_history.json"
+    TRADE_HISTORY_FILE = "trade_history.db"  # .db → SQLite 저장소, .jsonl → 추가 전용 저널
+    TRADE_JOURNAL_FILE = "trade_history.jsonl"
+    LEGACY_TRADE_HISTORY_FILE = "trade_history.json"  # 이전 대상 (JSON 배열)
+    TRADE_JOURNAL_COMPACT_EVERY = 1000  # N건 추가마다 저널 압축
+    STATE_FILE = "upbit_state.json"  # 매매 상태 스냅샷 (변경 로그는 + '.wal')
+    STATE_CHECKPOINT_INTERVAL = 30  # 매매 중 상태 스냅샷 주기 (초)
     LOG_DIR = "logs"
     
     # ========================================================================
     # 시스템 설정
     # ========================================================================
     PRICE_UPDATE_INTERVAL = 1
+    # 적응형 시세 조회 (종목별 주기 = 조건 가격까지 거리 / 최근 변동성, 보유 여부)
+    POLL_MIN_INTERVAL = 0.5         # 최소 조회 주기 (초) - 손절가 근처 보유 종목, 주문 중 종목
+    POLL_HELD_MAX_INTERVAL = 2.0    # 보유 종목 최대 조회 주기 (초)
+    POLL_IDLE_MAX_INTERVAL = 5.0    # 감시 종목 최대 조회 주기 (초) - 목표가와 멀 때
+    POLL_SAFETY_SIGMA = 3.0         # 한 주기 안에 조건 가격에 닿는 움직임이 이 시그마 이상이 되도록
+    POLL_VOL_FLOOR = 0.02           # 변동성 하한 (%/√초)
+    POLL_MAX_REQUESTS_PER_SEC = 4   # 현재가 일괄 조회 요청 한도 (업비트 ticker 그룹 초당 10회 중)
     API_MAX_RETRIES = 3
     API_RETRY_DELAY = 1
     MAX_LOG_LINES = 500
+    LOG_MAX_BYTES = 5 * 1024 * 1024  # 파일 로그 로테이션 크기
+    LOG_BACKUP_COUNT = 5
+    LOG_FLUSH_INTERVAL_MS = 200  # 화면 로그 일괄 반영 주기
+    TABLE_REFRESH_FPS = 5  # 모니터링 테이블 최대 갱신 횟수 (초당)
+    STARTUP_PRELOAD_DELAY_MS = 1500  # 창 표시 후 pyupbit/pandas 미리 로드까지 대기
     
     # ========================================================================
     # 기본 프리셋 정의
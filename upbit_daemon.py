@@ -0,0 +1,209 @@
+"""
+Upbit Trading Daemon v1.0
+헤드리스 실행기 for Upbit Pro Algo-Trader
+
+PyQt 없이 리눅스 서버에서 매매 엔진(upbit_engine) 실행
+- 매매 설정은 GUI와 같은 설정 파일(upbit_settings.json)에서 읽고 옵션으로 덮어쓰기
+- API 키: 환경변수 UPBIT_ACCESS_KEY / UPBIT_SECRET_KEY 우선, 없으면 설정 파일
+- --dry-run: API 연결 없이 감시/신호 로그만 (주문 없음)
+- --scan N: 시작 시 KRW 전 종목을 스캔해 상위 N개 후보를 감시 코인으로 사용
+- SIGINT / SIGTERM 수신 시 가격 폴링과 루프를 정리하고 종료
+- 저장된 매매 상태(upbit_state.json)가 있으면 잔고와 맞춘 뒤 이어서 매매 (--fresh: 새로 시작)
+
+사용법:
+    python upbit_daemon.py
+    python upbit_daemon.py --coins KRW-BTC,KRW-ETH --candle 1시간 --dry-run
+    python upbit_daemon.py --scan 10
+    python upbit_daemon.py --fresh
+"""
+
+import os
+import sys
+import signal
+import argparse
+import datetime
+import logging
+from pathlib import Path
+from typing import List, Optional
+
+from upbit_config import Config
+from upbit_engine import (
+    TradingEngine, TradingSettings, EngineListener, EngineLoop, PriceFeed,
+    parse_coins, read_settings_file
+)
+from upbit_scanner import format_candidates
+from upbit_log_pipeline import setup_queue_logging
+from upbit_startup import preload
+from upbit_state import StateStore
+from upbit_trade_store import open_trade_history
+
+
+logger = logging.getLogger('UpbitTrader')
+
+
+class DaemonListener(EngineListener):
+    """엔진 이벤트 → 로그"""
+
+    def __init__(self):
+        self.engine: Optional[TradingEngine] = None
+        self.feed: Optional[PriceFeed] = None
+
+    def universe_changed(self, tickers: List[str]):
+        if self.feed is not None:
+            self.feed.set_coins(tickers)
+
+    def log(self, msg: str):
+        logger.info(msg)
+
+    def stats_changed(self):
+        if self.engine is None:
+            return
+        e = self.engine
+        winrate = (e.win_count / e.trade_count * 100) if e.trade_count > 0 else 0
+        logger.info(f"📈 당일 실현손익: {e.total_realized_profit:,.0f}원 "
+                    f"(거래 {e.trade_count}회, 승률 {winrate:.1f}%)")
+
+    def balance_changed(self, balance: float):
+        logger.debug(f"주문가능금액: {balance:,.0f}원")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog='upbit_daemon',
+        description="Upbit Pro Algo-Trader 헤드리스 매매 엔진"
+    )
+    parser.add_argument('--settings', default=Config.SETTINGS_FILE,
+                        help=f"설정 파일 경로 (기본: {Config.SETTINGS_FILE})")
+    parser.add_argument('--coins', help="감시 코인 (콤마 구분, 예: KRW-BTC,KRW-ETH)")
+    parser.add_argument('--candle', choices=list(Config.CANDLE_INTERVALS),
+                        help="캔들 간격")
+    parser.add_argument('--interval', type=float, default=Config.PRICE_UPDATE_INTERVAL,
+                        help=f"가격 조회 주기 초 (기본: {Config.PRICE_UPDATE_INTERVAL})")
+    parser.add_argument('--log-dir', default=Config.LOG_DIR,
+                        help=f"로그 디렉터리 (기본: {Config.LOG_DIR})")
+    parser.add_argument('--dry-run', action='store_true',
+                        help="API 연결 없이 신호만 기록 (주문 없음)")
+    parser.add_argument('--auto-universe', type=int, metavar='N', nargs='?',
+                        const=Config.DEFAULT_AUTO_UNIVERSE_TOP_N,
+                        help="24시간 거래대금 상위 N개 자동 감시 (매매 중 주기적 갱신)")
+    parser.add_argument('--scan', type=int, metavar='N', nargs='?', const=Config.SCANNER_TOP_N,
+                        help=f"KRW 전 종목 스캔 상위 N개를 감시 코인으로 사용 (기본 N: {Config.SCANNER_TOP_N})")
+    parser.add_argument('--fresh', action='store_true',
+                        help="저장된 매매 상태를 이어가지 않고 새로 시작")
+    return parser
+
+
+def setup_logging(log_dir: str):
+    log_path = Path(log_dir)
+    log_path.mkdir(exist_ok=True)
+    log_file = log_path / f"upbit_daemon_{datetime.datetime.now().strftime('%Y%m%d')}.log"
+
+    logger.setLevel(logging.DEBUG)
+    return setup_queue_logging(
+        logger, str(log_file),
+        max_bytes=Config.LOG_MAX_BYTES, backup_count=Config.LOG_BACKUP_COUNT
+    )
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    log_listener = setup_logging(args.log_dir)
+
+    try:
+        raw = read_settings_file(args.settings)
+    except Exception as e:
+        logger.error(f"설정 파일 읽기 실패 ({args.settings}): {e}")
+        log_listener.stop()
+        return 2
+
+    settings = TradingSettings.from_dict(raw)
+    if args.coins:
+        settings.coins = parse_coins(args.coins)
+    if args.candle:
+        settings.candle = args.candle
+    if args.auto_universe:
+        settings.auto_universe = True
+        settings.auto_universe_top_n = args.auto_universe
+
+    invalid_coins = [c for c in settings.coins if not c.startswith("KRW-")]
+    if not settings.auto_universe and (not settings.coins or invalid_coins):
+        logger.error(f"잘못된 코인 목록: {', '.join(invalid_coins) or '(없음)'} - 'KRW-' 형식이어야 합니다")
+        log_listener.stop()
+        return 2
+
+    loop = EngineLoop()
+    trade_store = open_trade_history(
+        Config.TRADE_HISTORY_FILE,
+        legacy_paths=(Config.TRADE_JOURNAL_FILE, Config.LEGACY_TRADE_HISTORY_FILE)
+    )
+    listener = DaemonListener()
+    # 드라이런은 실제 포지션이 없으므로 상태를 저장/복원하지 않음
+    engine = TradingEngine(settings, trade_store=trade_store,
+                           scheduler=loop.call_later, listener=listener,
+                           post=loop.call_soon,
+                           state_store=None if args.dry_run else StateStore())
+    listener.engine = engine
+    feed = PriceFeed(engine.mailbox.put, args.interval, lambda: engine.poll_intervals)
+    listener.feed = feed
+
+    try:
+        if args.dry_run:
+            logger.info("🧪 드라이런 모드 - 주문을 실행하지 않습니다")
+        else:
+            access = os.environ.get('UPBIT_ACCESS_KEY') or raw.get('access_key', '')
+            secret = os.environ.get('UPBIT_SECRET_KEY') or raw.get('secret_key', '')
+            if not access or not secret:
+                logger.error("API 키가 없습니다 (UPBIT_ACCESS_KEY / UPBIT_SECRET_KEY 또는 설정 파일)")
+                return 2
+            try:
+                balance = engine.connect(access.strip(), secret.strip())
+            except Exception as e:
+                logger.error(f"❌ API 연결 실패: {e}")
+                return 1
+            logger.info(f"✅ 업비트 API 연결 성공 (잔고: {balance:,.0f}원)")
+
+        if args.scan:
+            candidates = engine.scan_market(args.scan)
+            for line in format_candidates(candidates, args.scan):
+                logger.info(f"  {line}")
+            if candidates:
+                engine.settings.coins = [c.ticker for c in candidates]
+                engine.settings.auto_universe = False
+            else:
+                logger.warning("🔎 스캔 후보 없음 - 설정의 감시 코인 사용")
+
+        state = None if args.fresh else engine.load_state()
+        count = engine.resume(state) if state else engine.start()
+        if count == 0:
+            logger.error("유효한 코인이 없습니다")
+            return 1
+
+        def shutdown(signum, frame):
+            logger.info(f"종료 신호 수신 ({signal.Signals(signum).name})")
+            loop.stop()
+
+        signal.signal(signal.SIGINT, shutdown)
+        signal.signal(signal.SIGTERM, shutdown)
+
+        # 지연 import된 pyupbit를 가격 조회 스레드보다 먼저 메인 스레드에서 로드
+        preload('pyupbit')
+        feed.set_coins(list(engine.universe))
+        feed.start()
+        loop.call_every(1.0, engine.check_day_rollover)
+        loop.run_forever()
+
+        engine.stop()
+        pending = engine.timers.pending()
+        if pending:
+            logger.info(f"⏳ 남은 예약 작업 {len(pending)}개: "
+                        + ", ".join(f"{label or key} ({remaining:.0f}초)" for key, label, remaining in pending[:10]))
+        return 0
+    finally:
+        feed.stop()
+        trade_store.close()
+        logger.info("데몬 종료")
+        log_listener.stop()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
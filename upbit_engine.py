@@ -0,0 +1,2103 @@
+"""
+Upbit Trading Engine v1.0
+GUI 독립 매매 엔진 for Upbit Pro Algo-Trader
+
+PyQt 없이 동작하는 매매 코어 (Qt 앱과 헤드리스 데몬은 엔진의 클라이언트)
+- TradingSettings: 위젯 대신 읽는 타입 지정 설정 (설정 파일 키와 호환)
+- TradingEngine: 유니버스 상태, 매수/매도 조건, 주문 실행, 일일 통계
+- EngineListener: 로그/화면 갱신 등 상태 변화를 클라이언트로 전달
+- EngineLoop / PriceFeed: 헤드리스 실행용 단일 스레드 루프와 가격 폴링 스레드
+- SnapshotMailbox: 가격 피드 → 엔진 최신값 우편함 (엔진이 바쁘면 종목별 최신 스냅샷만 전달)
+- PollSchedule: 종목별 적응형 조회 주기 (엔진이 계산한 poll_intervals 사용, 요청 한도 유지)
+- 상태 저장: 상태 변화는 StateStore 변경 로그로, 주기적으로 스냅샷 (resume으로 재시작 이어가기)
+
+엔진 메서드는 한 스레드(Qt 메인 스레드 또는 EngineLoop)에서만 호출하고,
+체결 확인 같은 지연 작업은 주입된 scheduler(delay_sec, func)로 예약합니다.
+"""
+
+import os
+import json
+import math
+import time
+import heapq
+import functools
+import datetime
+import itertools
+import threading
+import logging
+from dataclasses import dataclass, field, fields, asdict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from upbit_startup import lazy_import
+
+# pyupbit/pandas는 첫 사용 시 로드 (GUI 창 표시 지연 방지)
+try:
+    pyupbit = lazy_import('pyupbit')
+    pd = lazy_import('pandas')
+except ImportError:
+    pyupbit = None
+    pd = None
+
+from upbit_config import Config
+from upbit_strategy import UpbitStrategyManager
+from upbit_candles import CandleAggregator, CandleCache, next_candle_boundary, is_current_candle
+from upbit_scanner import MarketScanner, ScanCandidate
+from upbit_features import FeatureStore
+from upbit_positions import (PositionBook, PositionView, MIN_ORDER_KRW,
+                             EXIT_STOP_LOSS, EXIT_PARTIAL, EXIT_TRAILING)
+from upbit_orders import OrderExecutor, PRIORITY_ENTRY, PRIORITY_EXIT
+from upbit_timers import TimerQueue
+
+
+logger = logging.getLogger('UpbitTrader')
+
+# scheduler(delay_sec, func) - 클라이언트 이벤트 루프에 지연 호출 예약
+Scheduler = Callable[[float, Callable[[], Any]], Any]
+
+
+def parse_coins(text: str) -> List[str]:
+    """콤마 구분 코인 목록 파싱 ("KRW-BTC, KRW-ETH" → ['KRW-BTC', 'KRW-ETH'])"""
+    return [c for c in text.replace(" ", "").split(',') if c]
+
+
+# ============================================================================
+# 설정
+# ============================================================================
+@dataclass
+class TradingSettings:
+    """매매 설정 (필드명 = 설정 파일 키)"""
+    coins: List[str] = field(default_factory=lambda: parse_coins(Config.DEFAULT_COINS))
+    candle: str = Config.DEFAULT_CANDLE
+    betting_ratio: float = Config.DEFAULT_BETTING_RATIO
+    k_value: float = Config.DEFAULT_K_VALUE
+    ts_start: float = Config.DEFAULT_TS_START
+    ts_stop: float = Config.DEFAULT_TS_STOP
+    loss_cut: float = Config.DEFAULT_LOSS_CUT
+
+    # 필터
+    use_rsi: bool = Config.DEFAULT_USE_RSI
+    rsi_upper: int = Config.DEFAULT_RSI_UPPER
+    rsi_period: int = Config.DEFAULT_RSI_PERIOD
+    use_macd: bool = Config.DEFAULT_USE_MACD
+    use_volume: bool = Config.DEFAULT_USE_VOLUME
+    volume_mult: float = Config.DEFAULT_VOLUME_MULTIPLIER
+
+    # 리스크 관리
+    use_risk: bool = Config.DEFAULT_USE_RISK_MGMT
+    max_daily_loss: float = Config.DEFAULT_MAX_DAILY_LOSS
+    max_holdings: int = Config.DEFAULT_MAX_HOLDINGS
+    use_partial_tp: bool = False
+
+    # v3.0 고급 기능 (UpbitStrategyManager에서 사용)
+    use_cooldown: bool = Config.DEFAULT_USE_COOLDOWN
+    cooldown_minutes: int = Config.DEFAULT_COOLDOWN_MINUTES
+    use_time_exit: bool = Config.DEFAULT_USE_TIME_EXIT
+    max_holding_hours: int = Config.DEFAULT_MAX_HOLDING_HOURS
+    use_dynamic_position: bool = Config.DEFAULT_USE_DYNAMIC_POSITION
+    use_mtf: bool = Config.DEFAULT_USE_MTF
+    use_gap_analysis: bool = Config.DEFAULT_USE_GAP_ANALYSIS
+    use_breakout_confirm: bool = Config.DEFAULT_USE_BREAKOUT_CONFIRM
+    breakout_confirm_ticks: int = Config.DEFAULT_BREAKOUT_CONFIRM_TICKS
+    breakout_confirm_seconds: int = Config.DEFAULT_BREAKOUT_CONFIRM_SECONDS
+
+    # 자동 유니버스 (켜면 coins 대신 거래대금 상위 종목 감시)
+    auto_universe: bool = Config.DEFAULT_USE_AUTO_UNIVERSE
+    auto_universe_top_n: int = Config.DEFAULT_AUTO_UNIVERSE_TOP_N
+    auto_universe_refresh_minutes: int = Config.DEFAULT_AUTO_UNIVERSE_REFRESH_MINUTES
+
+    @property
+    def candle_interval(self) -> str:
+        """pyupbit 캔들 간격 문자열 (예: "4시간" → "minute240")"""
+        return Config.CANDLE_INTERVALS.get(self.candle, Config.CANDLE_INTERVALS[Config.DEFAULT_CANDLE])
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'TradingSettings':
+        """설정 파일 dict → 설정 (모르는 키는 무시, 값은 필드 타입으로 변환)"""
+        settings = cls()
+        for f in fields(cls):
+            if f.name not in data or data[f.name] is None:
+                continue
+            value = data[f.name]
+            default = getattr(settings, f.name)
+            try:
+                if f.name == 'coins':
+                    value = parse_coins(value) if isinstance(value, str) else [str(c) for c in value]
+                elif isinstance(default, bool):
+                    value = bool(value)
+                elif isinstance(default, (int, float, str)):
+                    value = type(default)(value)
+            except (TypeError, ValueError):
+                logger.warning(f"설정 값 무시 ({f.name}={value!r})")
+                continue
+            setattr(settings, f.name, value)
+        return settings
+
+    @classmethod
+    def from_file(cls, path: str = Config.SETTINGS_FILE) -> 'TradingSettings':
+        return cls.from_dict(read_settings_file(path))
+
+    def to_dict(self) -> Dict:
+        """설정 파일 형식 (coins는 콤마 구분 문자열)"""
+        data = asdict(self)
+        data['coins'] = ",".join(self.coins)
+        return data
+
+
+def read_settings_file(path: str = Config.SETTINGS_FILE) -> Dict:
+    """설정 파일 원본 dict (없으면 빈 dict)"""
+    if not os.path.exists(path):
+        return {}
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+# ============================================================================
+# 클라이언트 콜백
+# ============================================================================
+class EngineListener:
+    """엔진 상태 변화 수신 인터페이스 (필요한 메서드만 오버라이드)"""
+
+    def log(self, msg: str):
+        pass
+
+    def universe_cleared(self):
+        pass
+
+    def ticker_added(self, ticker: str, info: Dict):
+        pass
+
+    def ticker_removed(self, ticker: str, row: int):
+        pass
+
+    def target_changed(self, ticker: str, info: Dict):
+        """캔들 경계에서 목표가/MA 재계산 후"""
+        pass
+
+    def universe_changed(self, tickers: List[str]):
+        """매매 중 감시 종목 추가/제거 후 (가격 조회 대상 갱신용)"""
+        pass
+
+    def price_changed(self, ticker: str, info: Dict):
+        pass
+
+    def profit_changed(self, ticker: str, info: Dict, profit_rate: float):
+        pass
+
+    def state_changed(self, ticker: str, info: Dict):
+        pass
+
+    def position_changed(self, ticker: str, info: Dict):
+        pass
+
+    def trade_recorded(self, record: Dict, rowid: Optional[int]):
+        pass
+
+    def stats_changed(self):
+        pass
+
+    def balance_changed(self, balance: float):
+        pass
+
+
+# ============================================================================
+# 매매 엔진
+# ============================================================================
+class TradingEngine:
+    """변동성 돌파 매매 엔진 (GUI 독립)"""
+
+    ORDER_CHECK_DELAY = 2.0     # 체결 확인 간격 (초)
+    ORDER_CHECK_RETRIES = 30    # 최대 30회 (60초)
+
+    def __init__(self, settings: Optional[TradingSettings] = None,
+                 trade_store=None, scheduler: Optional[Scheduler] = None,
+                 listener: Optional[EngineListener] = None,
+                 post: Optional[Callable[[Callable[[], Any]], Any]] = None,
+                 state_store=None):
+        """
+        Args:
+            settings: 매매 설정 (None이면 기본값)
+            trade_store: 거래 기록 저장소 (TradeStore / TradeJournal, None이면 기록 안 함)
+            state_store: 매매 상태 저장소 (StateStore, None이면 재시작 이어가기 안 함)
+            scheduler: 지연 호출 예약 함수 (None이면 threading.Timer)
+            listener: 상태 변화 수신 클라이언트
+            post: 다른 스레드에서 엔진 스레드로 호출을 넘기는 함수 (스레드 안전).
+                  None이면 캔들 경계 갱신의 캔들 조회를 호출 스레드에서 직접 수행
+        """
+        self.settings = settings or TradingSettings()
+        self.trade_store = trade_store
+        self.state_store = state_store
+        self.scheduler = scheduler or _timer_scheduler
+        # 예약 작업 큐 (체결 확인 재시도 / 보유 시간 청산 / 쿨다운 만료 등 - 조회·취소 가능)
+        self.timers = TimerQueue(self.scheduler)
+        self.post = post
+        self.listener = listener or EngineListener()
+        self.logger = logger
+
+        self.upbit = None
+        self.universe: Dict[str, Dict] = {}
+        self.balance = 0
+        self.initial_balance = 0
+        self.total_realized_profit = 0
+        self.trade_count = 0
+        self.win_count = 0
+        self.is_running = False
+        self.is_connected = False
+        self.daily_loss_triggered = False
+        self._last_reset_date = datetime.date.today()
+        self._run_generation = 0  # 재시작 시 이전 주기 작업(유니버스/캔들 갱신) 예약 무효화
+
+        # v3.0: 전략 매니저 (고급 기능 상태, 설정은 self.settings에서 읽음)
+        self.strategy = UpbitStrategyManager(self)
+
+        # 포지션 상태 배열 (universe 종목 정보의 수량/매수가/최고가 등은 이 배열의 슬롯)
+        self.positions = PositionBook()
+
+        # 주문 실행기 (청산 레인 우선, post가 있으면 주문 API는 전용 스레드에서 호출)
+        self.orders = OrderExecutor(post)
+        self._exit_pending: set = set()  # 전량 매도 주문 후 체결 확인 전인 종목 (중복 매도 방지)
+        self._pending_orders: Dict[str, Dict] = {}  # 체결 확인 대기 주문 (uuid → 종목/구분, 재시작 시 확인 재개)
+
+        # 가격 피드 → 엔진 우편함 (피드 스레드는 mailbox.put, 엔진 스레드에서 drain_snapshots)
+        self.mailbox = SnapshotMailbox(
+            (lambda: post(self.drain_snapshots)) if post is not None else self.drain_snapshots)
+
+        # 적응형 시세 조회 주기 (엔진 스레드에서 통째로 교체, 피드 스레드는 읽기만)
+        self.poll_intervals: Dict[str, float] = {}
+        self._tick_vol: Dict[str, Tuple[float, float, float]] = {}  # ticker → (가격, 시각, 변동성 %/√초)
+
+        # 캔들 캐시 (목표가/MA 계산과 전 종목 스캐너가 공유)
+        self.candle_cache = CandleCache()
+        # 실시간 캔들 (시세 스냅샷으로 봉 집계 - 지표/목표가 계산은 여기서, 시드/끊김 복구만 REST)
+        self.candles = CandleAggregator(self.candle_cache)
+        # MTF 추세 / 갭 / MA (1시간봉 하나에서 리샘플링, 마감 봉 기준 캐시)
+        self.features = FeatureStore(self.candles)
+
+    # =========================================================================
+    # 공통
+    # =========================================================================
+    def log(self, msg: str):
+        self.listener.log(msg)
+
+    def call_later(self, delay: float, func: Callable[[], Any],
+                   key: Optional[Any] = None, label: str = '') -> Any:
+        """예약 작업 등록 (같은 key는 교체, self.timers.cancel(key)로 취소)"""
+        return self.timers.schedule(key, delay, func, label)
+
+    # =========================================================================
+    # 연결 및 잔고
+    # =========================================================================
+    def connect(self, access: str, secret: str) -> float:
+        """API 연결 후 KRW 잔고 반환 (실패 시 예외)"""
+        try:
+            self.upbit = pyupbit.Upbit(access, secret)
+            balance = self.upbit.get_balance("KRW")
+            if balance is None:
+                raise Exception("잔고 조회 실패")
+        except Exception:
+            self.is_connected = False
+            raise
+
+        self.is_connected = True
+        self.balance = balance
+        self.initial_balance = balance
+        self.listener.balance_changed(balance)
+        return balance
+
+    def refresh_balance(self):
+        """잔고 조회"""
+        if not self.upbit:
+            return
+        try:
+            self.balance = self.upbit.get_balance("KRW")
+            self.listener.balance_changed(self.balance)
+        except Exception as e:
+            self.logger.error(f"잔고 조회 실패: {e}")
+
+    # =========================================================================
+    # 매매 시작/중지
+    # =========================================================================
+    def start(self, coins: Optional[List[str]] = None) -> int:
+        """유니버스 초기화 후 매매 시작 (감시 종목 수 반환, 0이면 시작 안 함)
+
+        coins가 None이고 자동 유니버스가 켜져 있으면 거래대금 상위 종목으로 시작합니다.
+        """
+        if coins is None and self.settings.auto_universe:
+            coins = self.select_auto_universe()
+        coins = list(self.settings.coins if coins is None else coins)
+
+        self.universe = {}
+        self.positions.clear()
+        self._exit_pending.clear()
+        self.listener.universe_cleared()
+        self.is_running = True
+        self.daily_loss_triggered = False
+
+        prices = self._fetch_current_prices(coins)
+        self._seed_gap_base(self._fetch_gap_base(self._gap_base_missing(coins, self.settings.candle_interval)))
+        for coin in coins:
+            self.add_ticker(coin, prices.get(coin))
+
+        if self.universe:
+            self.log(f"🚀 자동매매 시작 (총 {len(self.universe)} 코인)")
+            self.logger.info(f"매매 시작: {len(self.universe)} 코인")
+            self._begin_run()
+        else:
+            self.is_running = False
+        return len(self.universe)
+
+    def _begin_run(self):
+        """주기 작업 예약 (캔들 경계 / 자동 유니버스 / 상태 스냅샷) + 시작 상태 저장"""
+        self._run_generation += 1
+        self._schedule_candle_rollover(self._run_generation)
+        if self.settings.auto_universe:
+            self._schedule_universe_refresh(self._run_generation)
+        if self.state_store is not None:
+            self._schedule_checkpoint(self._run_generation)
+            self.checkpoint_state()
+
+    # =========================================================================
+    # 감시 종목 (유니버스) 관리
+    # =========================================================================
+    def add_ticker(self, coin: str, current_price: Optional[float] = None) -> bool:
+        """감시 종목 추가 (목표가/MA 계산 실패 시 False)"""
+        if coin in self.universe:
+            return False
+
+        candle_interval = self.settings.candle_interval
+        try:
+            # 지표 계산에 필요한 봉을 한 번에 조회해 실시간 캔들 시드 (이후 스냅샷으로 집계)
+            self.candles.get(coin, candle_interval, Config.CANDLE_HISTORY_BARS)
+
+            # 목표가 및 MA 계산
+            target_price = self.calculate_target_price(coin, candle_interval, self._entry_k(coin))
+            ma5 = self.calculate_ma(coin, candle_interval, 5)
+            if current_price is None:
+                current_price = pyupbit.get_current_price(coin)
+
+            if target_price is None or ma5 is None:
+                self.log(f"[WARN] {coin} 데이터 조회 실패")
+                return False
+
+            info = PositionView(self.positions, self.positions.add(coin), {
+                'name': coin,
+                'state': '감시중',
+                'row': len(self.universe),
+                'target': target_price,
+                'ma5': ma5,
+                'current': current_price or 0,
+                'qty': 0,
+                'buy_price': 0,
+                'invest_amt': 0,
+                'high_since_buy': 0,
+                'max_profit_rate': 0.0
+            })
+            self.universe[coin] = info
+            self.listener.ticker_added(coin, info)
+            self._persist_ticker(coin)
+
+            self.log(f"[{coin}] 목표가:{target_price:,.0f}, MA5:{ma5:,.0f}")
+            return True
+
+        except Exception as e:
+            self.log(f"[ERROR] {coin} 초기화 실패: {e}")
+            self.logger.error(f"{coin} 초기화 실패: {e}")
+            return False
+
+    def remove_ticker(self, ticker: str) -> bool:
+        """감시 종목 제거
+
+        보유 중이거나 주문/체결 확인 중이면 바로 제거하지 않고
+        청산(매도 체결) 후 제거하도록 예약합니다 (False 반환).
+        """
+        info = self.universe.get(ticker)
+        if info is None:
+            return False
+        if info['qty'] > 0 or info['state'] in ('주문중', '체결확인실패'):
+            if not info.get('remove_after_exit'):
+                info['remove_after_exit'] = True
+                self.log(f"[{ticker}] 포지션 청산 후 감시 목록에서 제거 예정")
+            return False
+
+        row = info['row']
+        del self.universe[ticker]
+        for i, other in enumerate(self.universe.values()):
+            other['row'] = i
+        self.strategy.clear_recent_prices(ticker)
+        self.candles.discard(ticker)
+        self.features.discard(ticker)
+        self.positions.release(ticker)
+        self._persist_ticker(ticker)
+        self.listener.ticker_removed(ticker, row)
+        return True
+
+    def update_universe(self, coins: List[str],
+                        prices: Optional[Dict[str, float]] = None) -> Tuple[List[str], List[str]]:
+        """매매 중 감시 종목 교체 (유지되는 종목의 상태/포지션은 그대로)
+
+        Args:
+            prices: 미리 조회한 새 종목 현재가 (None이면 여기서 일괄 조회)
+
+        Returns:
+            (추가된 종목, 제거된 종목) - 포지션이 있어 제거가 예약된 종목은 제외
+        """
+        wanted = set(coins)
+        removed = [t for t in list(self.universe) if t not in wanted and self.remove_ticker(t)]
+        new_coins = [c for c in coins if c not in self.universe]
+        if prices is None:
+            prices = self._fetch_current_prices(new_coins)
+        added = [c for c in new_coins if self.add_ticker(c, prices.get(c))]
+        for c in coins:
+            if c in self.universe:
+                self.universe[c].pop('remove_after_exit', None)
+
+        if added or removed:
+            self.listener.universe_changed(list(self.universe))
+        return added, removed
+
+    def select_auto_universe(self) -> List[str]:
+        """24시간 거래대금 상위 종목 (현재가 일괄 조회 1~2회)"""
+        scanner = MarketScanner(self.settings, self.candle_cache)
+        return scanner.top_by_trade_value(self.settings.auto_universe_top_n)
+
+    def refresh_auto_universe(self):
+        """자동 유니버스 갱신 (거래대금 순위 변화 반영)
+
+        post가 있으면 순위 / 새 종목 현재가 / 새 종목 캔들 조회는 워커 스레드에서 하고
+        종목 추가/제거는 엔진 스레드에서 반영합니다 (refresh_targets와 같은 방식).
+        """
+        interval = self.settings.candle_interval
+        generation = self._run_generation
+        watched = set(self.universe)
+
+        def fetch():
+            try:
+                coins = self.select_auto_universe()
+            except Exception as e:
+                self.logger.error(f"자동 유니버스 조회 실패: {e}")
+                return [], {}, {}, {}
+            new_coins = [c for c in coins if c not in watched]
+            return (coins, self._fetch_current_prices(new_coins),
+                    self.candle_cache.fetch_many(new_coins, interval, Config.CANDLE_HISTORY_BARS),
+                    self._fetch_gap_base(self._gap_base_missing(new_coins, interval)))
+
+        def apply(result):
+            if generation == self._run_generation and self.is_running:
+                self._apply_universe(interval, *result)
+
+        if self.post is None:
+            apply(fetch())
+        else:
+            threading.Thread(
+                target=lambda: self.post(functools.partial(apply, fetch())),
+                name="UniverseRefresh", daemon=True
+            ).start()
+
+    def _apply_universe(self, interval: str, coins: List[str], prices: Dict[str, float],
+                        frames: Dict[str, Any], base_frames: Dict[str, Any]):
+        """조회한 순위 / 캔들로 감시 종목 교체 (엔진 스레드, 네트워크 없음)"""
+        if not coins or interval != self.settings.candle_interval:
+            return
+
+        for ticker, df in frames.items():
+            if df is not None:
+                self.candles.seed(ticker, interval, df)
+        self._seed_gap_base(base_frames)
+        # 캔들 조회에 실패한 새 종목은 이번에는 건너뜀 (다음 갱신 때 다시 시도)
+        coins = [c for c in coins if c in self.universe or frames.get(c) is not None]
+        prices = {c: prices.get(c, 0) for c in frames}
+
+        added, removed = self.update_universe(coins, prices)
+        if added or removed:
+            self.log(f"🔄 감시 종목 갱신: 추가 {', '.join(added) or '-'} / 제거 {', '.join(removed) or '-'}")
+
+    def _schedule_universe_refresh(self, generation: int):
+        def refresh():
+            # 중지/재시작되었거나 자동 유니버스를 끈 경우 예약 종료
+            if generation != self._run_generation or not self.is_running:
+                return
+            if not self.settings.auto_universe:
+                return
+            self.refresh_auto_universe()
+            self._schedule_universe_refresh(generation)
+
+        minutes = max(1, self.settings.auto_universe_refresh_minutes)
+        self.call_later(minutes * 60, refresh, key=('universe_refresh',), label="자동 유니버스 갱신")
+
+    def _fetch_current_prices(self, coins: List[str]) -> Dict[str, float]:
+        """현재가 일괄 조회 (실패 시 빈 dict - add_ticker가 개별 조회)"""
+        if not coins:
+            return {}
+        try:
+            prices = pyupbit.get_current_price(list(coins))
+        except Exception as e:
+            self.logger.warning(f"현재가 일괄 조회 실패: {e}")
+            return {}
+        if isinstance(prices, dict):
+            return prices
+        return {coins[0]: prices} if prices else {}
+
+    # =========================================================================
+    # 캔들 경계 갱신 (목표가 / MA / 갭 조정 K)
+    # =========================================================================
+    def _schedule_candle_rollover(self, generation: int):
+        """다음 캔들 시작 직후 전 종목 목표가 갱신 예약"""
+        interval = self.settings.candle_interval
+        delay = next_candle_boundary(interval) - time.time() + Config.CANDLE_ROLLOVER_GRACE
+
+        def rollover():
+            if generation != self._run_generation or not self.is_running:
+                return
+            self.refresh_targets()
+            self._schedule_candle_rollover(generation)
+
+        self.call_later(max(delay, 0.0), rollover, key=('candle_rollover',), label="캔들 경계 목표가 갱신")
+
+    def refresh_targets(self, tickers: Optional[List[str]] = None, attempt: int = 0):
+        """전 종목 목표가/MA/갭 조정 K 일괄 재계산
+
+        실시간 캔들이 이어지고 있는 종목은 로컬 봉으로 바로 계산하고,
+        시드 전이거나 시세가 끊겼던 종목만 캔들을 동시 조회해 다시 시드합니다.
+        post가 있으면 캔들 조회는 워커 스레드에서 하고 반영은 엔진 스레드에서 합니다.
+        """
+        tickers = list(self.universe) if tickers is None else tickers
+        if not tickers:
+            return
+        interval = self.settings.candle_interval
+        generation = self._run_generation
+        remote = [t for t in tickers if not self.candles.is_live(t, interval)]
+        base_remote = self._gap_base_missing(tickers, interval)
+
+        def fetch():
+            return (self.candle_cache.fetch_many(remote, interval, Config.CANDLE_HISTORY_BARS),
+                    self._fetch_gap_base(base_remote))
+
+        def apply(result):
+            if generation == self._run_generation and self.is_running:
+                frames, base_frames = result
+                self._apply_targets(interval, tickers, frames, attempt, base_frames)
+
+        if self.post is None or not (remote or base_remote):
+            apply(fetch())
+        else:
+            threading.Thread(
+                target=lambda: self.post(functools.partial(apply, fetch())),
+                name="CandleRollover", daemon=True
+            ).start()
+
+    def _apply_targets(self, interval: str, tickers: List[str], frames: Dict[str, Any], attempt: int,
+                       base_frames: Optional[Dict[str, Any]] = None):
+        """조회한 캔들로 다시 시드한 뒤 목표가/MA 반영 (엔진 스레드, 네트워크 없음)"""
+        if interval != self.settings.candle_interval:
+            return  # 갱신 중 캔들 간격 변경 - 다음 경계에서 새 간격으로 갱신
+
+        for ticker, df in frames.items():
+            if df is not None:
+                self.candles.seed(ticker, interval, df)
+        self._seed_gap_base(base_frames or {})
+
+        updated, stale = 0, []
+        for ticker in tickers:
+            info = self.universe.get(ticker)
+            if info is None:
+                continue
+            df = self.candles.peek(ticker, interval, 2)
+            if not is_current_candle(df, interval):
+                stale.append(ticker)  # 새 봉이 아직 없음 (경계 이후 체결 없음)
+                continue
+
+            target = self.calculate_target_price(ticker, interval, self._entry_k(ticker))
+            ma5 = self.calculate_ma(ticker, interval, 5)
+            if target is None or ma5 is None:
+                continue
+            info['target'] = target
+            info['ma5'] = ma5
+            self.listener.target_changed(ticker, info)
+            updated += 1
+
+        if updated:
+            self.log(f"🕐 새 캔들: {updated}종목 목표가/MA 갱신")
+        if stale:
+            if attempt < 3:
+                self.call_later(Config.CANDLE_ROLLOVER_RETRY,
+                                lambda: self.refresh_targets(stale, attempt + 1),
+                                key=('candle_retry',), label="새 캔들 재조회")
+            else:
+                self.log(f"[WARN] 새 캔들 없음 (이전 목표가 유지): {', '.join(stale)}")
+
+    def _entry_k(self, ticker: str) -> float:
+        """목표가 계산용 K (갭 분석 사용 시 갭 조정 - 로컬 봉만 사용)
+
+        엔진 스레드에서 호출되므로 갭 계산용 봉이 로컬에 없으면 (끊김 후 재조회 전 등)
+        REST로 조회하지 않고 기본 K를 씁니다.
+        """
+        k = self.settings.k_value
+        if self.settings.use_gap_analysis:
+            if self.features.is_local(ticker, self.settings.candle_interval):
+                k = self.strategy.get_gap_adjusted_k(ticker, k)
+            else:
+                self.logger.debug(f"{ticker} 갭 분석용 봉 없음 - 기본 K 사용")
+        return k
+
+    def _gap_base_missing(self, tickers: List[str], interval: str) -> List[str]:
+        """갭 분석에 필요한 기준 봉(리샘플링 원본)이 로컬에 없는 종목"""
+        if (not self.settings.use_gap_analysis
+                or self.features.source_interval(interval) == interval):
+            return []  # 캔들 간격 봉 그대로 사용 - 목표가 계산용 조회로 충분
+        return [t for t in tickers if not self.features.is_local(t, interval)]
+
+    def _fetch_gap_base(self, tickers: List[str]) -> Dict[str, Any]:
+        """갭 분석 기준 봉 동시 조회 (워커 스레드)"""
+        return self.candle_cache.fetch_many(tickers, self.features.base_interval, self.features.base_bars)
+
+    def _seed_gap_base(self, frames: Dict[str, Any]):
+        """조회한 갭 분석 기준 봉 시드 (엔진 스레드)"""
+        for ticker, df in frames.items():
+            if df is not None:
+                self.candles.seed(ticker, self.features.base_interval, df)
+
+    def stop(self):
+        """매매 중지"""
+        self.is_running = False
+        self.checkpoint_state()
+        self.log("⏹️ 매매가 중지되었습니다")
+        self.logger.info(f"매매 중지 (시세 우편함: {self.mailbox.summary()})")
+
+    # =========================================================================
+    # 상태 저장 / 재시작 이어가기
+    # =========================================================================
+    def export_state(self) -> Dict[str, Any]:
+        """엔진 상태 스냅샷 (StateStore 저장 형식)"""
+        interval = self.settings.candle_interval
+        strategy = self.strategy.export_state()
+        return {
+            'saved_at': time.time(),
+            'running': self.is_running,
+            'interval': interval,
+            'candle_end': next_candle_boundary(interval),
+            'stats': self._stats_state(),
+            'universe': {t: self._ticker_state(info) for t, info in self.universe.items()},
+            'cooldowns': strategy['cooldowns'],
+            'holding': strategy['holding'],
+            'orders': dict(self._pending_orders),
+        }
+
+    def _ticker_state(self, info: PositionView) -> Dict[str, Any]:
+        """종목 1개 저장 형식 (포지션 배열 값 + 완료한 분할 익절 레벨)"""
+        data = info.to_dict()
+        data.pop('name', None)
+        data.pop('row', None)
+        data['partial_done'] = np.flatnonzero(self.positions.partial_done[info.slot]).tolist()
+        return data
+
+    def _stats_state(self) -> Dict[str, Any]:
+        return {
+            'date': self._last_reset_date.isoformat(),
+            'initial_balance': self.initial_balance,
+            'total_realized_profit': self.total_realized_profit,
+            'trade_count': self.trade_count,
+            'win_count': self.win_count,
+            'daily_loss_triggered': self.daily_loss_triggered,
+            'consecutive_profits': self.strategy.consecutive_profits,
+            'consecutive_losses': self.strategy.consecutive_losses,
+        }
+
+    def _put_state(self, section: str, key: Optional[str], value: Any):
+        """상태 변경 로그 1줄 (저장소가 없으면 무시, 실패해도 매매는 계속)"""
+        if self.state_store is None:
+            return
+        try:
+            self.state_store.put(section, key, value)
+        except Exception as e:
+            self.logger.error(f"상태 기록 실패 ({section}/{key}): {e}")
+
+    def _persist_ticker(self, ticker: str):
+        if self.state_store is not None:
+            info = self.universe.get(ticker)
+            self._put_state('universe', ticker, self._ticker_state(info) if info is not None else None)
+
+    def _persist_stats(self):
+        if self.state_store is not None:
+            self._put_state('stats', None, self._stats_state())
+
+    def _track_order(self, uuid: str, ticker: str, side: str, reason: str = '', qty: float = 0.0):
+        """체결 확인 대기 주문 기록 (재시작 시 체결 확인 재개)"""
+        order = {'ticker': ticker, 'side': side, 'reason': reason, 'qty': float(qty)}
+        self._pending_orders[uuid] = order
+        self._put_state('orders', uuid, order)
+
+    def _untrack_order(self, uuid: str):
+        if self._pending_orders.pop(uuid, None) is not None:
+            self._put_state('orders', uuid, None)
+
+    def checkpoint_state(self):
+        """상태 스냅샷 저장 (변경 로그 비움)"""
+        if self.state_store is None:
+            return
+        try:
+            self.state_store.checkpoint(self.export_state())
+        except Exception as e:
+            self.logger.error(f"상태 스냅샷 저장 실패: {e}")
+
+    def _schedule_checkpoint(self, generation: int):
+        """주기적 스냅샷 (변경 로그에 남기지 않는 최고가 / 최고 수익률 / 현재가 갱신 포함)"""
+        def checkpoint():
+            if generation != self._run_generation or not self.is_running:
+                return
+            self.checkpoint_state()
+            self._schedule_checkpoint(generation)
+
+        self.call_later(Config.STATE_CHECKPOINT_INTERVAL, checkpoint,
+                        key=('state_checkpoint',), label="상태 스냅샷 저장")
+
+    def load_state(self) -> Optional[Dict[str, Any]]:
+        """저장된 매매 상태 (없거나 감시 종목이 없으면 None)"""
+        if self.state_store is None:
+            return None
+        try:
+            state = self.state_store.load()
+        except Exception as e:
+            self.logger.error(f"매매 상태 로드 실패: {e}")
+            return None
+        if not state or not state.get('universe'):
+            return None
+        return state
+
+    def resume(self, state: Dict[str, Any]) -> int:
+        """저장된 상태로 매매 재개 (감시 종목 수 반환, 0이면 시작 안 함)
+
+        포지션은 잔고와 맞춘 뒤 캔들 조회 없이 바로 청산 감시를 재개합니다
+        (청산 판정은 매수가/최고가만 사용). 저장 시점과 같은 캔들이면 목표가/MA도
+        그대로 쓰고, 캔들이 바뀌었으면 보유/주문 종목은 목표가만 다시 계산하고
+        보유하지 않은 종목은 새로 초기화합니다. 대기 주문은 체결 확인을 재개합니다.
+        """
+        started = time.perf_counter()
+        interval = self.settings.candle_interval
+        same_candle = (state.get('interval') == interval
+                       and state.get('candle_end') == next_candle_boundary(interval))
+        orders = state.get('orders') or {}
+        saved = self.reconcile_positions(state.get('universe') or {}, orders)
+
+        self.universe = {}
+        self.positions.clear()
+        self._exit_pending.clear()
+        self._pending_orders = {}
+        self.listener.universe_cleared()
+        self.is_running = True
+        self._restore_stats(state.get('stats') or {})
+
+        prices = self._fetch_current_prices(list(saved))
+        stale, reinit = [], []
+        for ticker, data in saved.items():
+            if same_candle or data.get('qty', 0) > 0 or data.get('state') != '감시중':
+                self._restore_ticker(ticker, data, prices.get(ticker))
+                if not same_candle:
+                    stale.append(ticker)
+            else:
+                reinit.append(ticker)
+        self._seed_gap_base(self._fetch_gap_base(self._gap_base_missing(reinit, self.settings.candle_interval)))
+        for ticker in reinit:
+            self.add_ticker(ticker, prices.get(ticker))
+
+        # 쿨다운 / 보유 시작 시각 / 보유 시간 청산 예약
+        holding = {t: ts for t, ts in (state.get('holding') or {}).items()
+                   if t in self.universe and self.universe[t]['qty'] > 0}
+        self.strategy.restore_state(state.get('cooldowns') or {}, holding)
+        for ticker, started_at in holding.items():
+            self._schedule_time_exit(ticker, started_at)
+
+        for uuid, order in orders.items():
+            if order.get('ticker') in self.universe:
+                self._resume_order(uuid, order)
+
+        if not self.universe:
+            self.is_running = False
+            return 0
+
+        held = self.holdings_count()
+        self.log(f"♻️ 이전 상태로 매매 재개 (감시 {len(self.universe)}종목, 보유 {held}종목, "
+                 f"대기 주문 {len(self._pending_orders)}건, {time.perf_counter() - started:.1f}초)")
+        self.logger.info(f"매매 재개: {len(self.universe)} 코인 (보유 {held}, 캔들 재계산 {len(stale)})")
+        self._begin_run()
+        if stale:
+            self.refresh_targets(stale)
+        return len(self.universe)
+
+    def reconcile_positions(self, saved: Dict[str, Dict], orders: Dict[str, Dict]) -> Dict[str, Dict]:
+        """저장된 포지션을 거래소 잔고와 맞춤 (get_balances 1회)
+
+        - 대기 주문이 있는 종목은 재개한 체결 확인이 반영하므로 그대로 둠
+        - 잔고가 없어진 포지션(중단 중 수동 매도 등)은 감시중으로 정리
+        - 주문중 / 체결확인실패였던 종목은 잔고가 있으면 보유중으로 복구
+        - 수량이 다르면 잔고 수량을 따르고 투자금은 같은 비율로 조정
+        """
+        saved = {t: dict(data) for t, data in saved.items()}
+        if not self.upbit:
+            return saved
+        try:
+            balances = self.upbit.get_balances() or []
+        except Exception as e:
+            self.log(f"[WARN] 잔고 조회 실패 - 저장된 포지션 그대로 복원: {e}")
+            return saved
+
+        held = {}
+        for item in balances:
+            currency = item.get('currency', '')
+            if not currency or currency == 'KRW':
+                continue
+            qty = float(item.get('balance', 0)) + float(item.get('locked', 0))
+            held[f"{item.get('unit_currency', 'KRW')}-{currency}"] = (qty, float(item.get('avg_buy_price', 0)))
+
+        pending = {order.get('ticker') for order in orders.values()}
+        for ticker, data in saved.items():
+            saved_qty = data.get('qty', 0)
+            if ticker in pending or (saved_qty <= 0 and data.get('state') not in ('주문중', '체결확인실패')):
+                continue
+
+            qty, avg_price = held.get(ticker, (0.0, 0.0))
+            if qty * (data.get('buy_price') or avg_price) < MIN_ORDER_KRW:
+                if saved_qty > 0:
+                    self.log(f"⚠️ [{ticker}] 잔고 없음 - 저장된 포지션 정리 ({saved_qty:.8f})")
+                data.update(state='감시중', qty=0, buy_price=0, invest_amt=0,
+                            high_since_buy=0, max_profit_rate=0.0, partial_done=[])
+            elif saved_qty <= 0:
+                self.log(f"🔄 [{ticker}] 중단 중 체결된 매수 복구: {qty:.8f} @ {avg_price:,.0f}원")
+                data.update(state='보유중', qty=qty, buy_price=avg_price, invest_amt=qty * avg_price,
+                            high_since_buy=avg_price, max_profit_rate=0.0, partial_done=[])
+            else:
+                if abs(qty - saved_qty) > saved_qty * 1e-6:
+                    self.log(f"🔄 [{ticker}] 보유 수량 조정: {saved_qty:.8f} → {qty:.8f}")
+                    data['invest_amt'] = data.get('invest_amt', 0) * qty / saved_qty
+                    data['qty'] = qty
+                data['state'] = '보유중'
+        return saved
+
+    def _restore_ticker(self, ticker: str, data: Dict[str, Any], current_price: Optional[float]):
+        """저장된 종목 상태로 유니버스 항목 생성 (캔들 조회 없음)"""
+        info = PositionView(self.positions, self.positions.add(ticker), {
+            'name': ticker,
+            'state': data.get('state', '감시중'),
+            'row': len(self.universe),
+            'target': data.get('target', 0),
+            'ma5': data.get('ma5', 0),
+            'current': current_price or data.get('current', 0),
+            'qty': data.get('qty', 0),
+            'buy_price': data.get('buy_price', 0),
+            'invest_amt': data.get('invest_amt', 0),
+            'high_since_buy': data.get('high_since_buy', 0),
+            'max_profit_rate': data.get('max_profit_rate', 0.0)
+        })
+        for level in data.get('partial_done', []):
+            if level < len(self.positions.levels):
+                self.positions.partial_done[info.slot, level] = True
+        if data.get('remove_after_exit'):
+            info['remove_after_exit'] = True
+        self.universe[ticker] = info
+        self.listener.ticker_added(ticker, info)
+        if info['qty'] > 0:
+            self.listener.position_changed(ticker, info)
+
+    def _restore_stats(self, stats: Dict[str, Any]):
+        """일일 통계 (같은 날짜일 때만)와 연속 손익 복원"""
+        if stats.get('date') == self._last_reset_date.isoformat():
+            self.initial_balance = stats.get('initial_balance') or self.initial_balance
+            self.total_realized_profit = stats.get('total_realized_profit', 0)
+            self.trade_count = stats.get('trade_count', 0)
+            self.win_count = stats.get('win_count', 0)
+            self.daily_loss_triggered = stats.get('daily_loss_triggered', False)
+        self.strategy.consecutive_profits = stats.get('consecutive_profits', 0)
+        self.strategy.consecutive_losses = stats.get('consecutive_losses', 0)
+        self.listener.stats_changed()
+
+    def _resume_order(self, uuid: str, order: Dict[str, Any]):
+        """저장된 대기 주문의 체결 확인 재개"""
+        ticker, side, reason = order['ticker'], order.get('side'), order.get('reason', '')
+        self._track_order(uuid, ticker, side, reason, order.get('qty', 0.0))
+        if side == 'buy':
+            check, label = (lambda: self.check_buy_execution(ticker, uuid)), "매수"
+        elif side == 'sell':
+            self._exit_pending.add(ticker)
+            check, label = (lambda: self.check_sell_execution(ticker, uuid, reason)), "매도"
+        else:
+            qty = order.get('qty', 0.0)
+            check, label = (lambda: self._check_partial_sell_execution(ticker, uuid, qty, reason)), "분할 매도"
+        self.call_later(self.ORDER_CHECK_DELAY, check,
+                        key=('order', uuid), label=f"{ticker} {label} 체결 확인")
+
+    # =========================================================================
+    # 일일 통계
+    # =========================================================================
+    def check_day_rollover(self, now: Optional[datetime.datetime] = None):
+        """날짜가 바뀌었으면 일일 통계 초기화 (주기적으로 호출)"""
+        today = (now or datetime.datetime.now()).date()
+        if today != self._last_reset_date:
+            self._last_reset_date = today
+            self.reset_daily_stats()
+
+    def reset_daily_stats(self):
+        """일일 통계 초기화 (자정 자동 실행)"""
+        self.daily_loss_triggered = False
+        self.reset_statistics()
+        self.log("📅 일일 통계 초기화 (자정)")
+        self.logger.info("일일 통계 초기화")
+
+    def reset_statistics(self):
+        self.total_realized_profit = 0
+        self.trade_count = 0
+        self.win_count = 0
+        self._persist_stats()
+        self.listener.stats_changed()
+
+    def scan_market(self, top_n: Optional[int] = None) -> List[ScanCandidate]:
+        """KRW 전 종목 돌파 후보 스캔 (엔진 상태를 바꾸지 않으므로 워커 스레드에서 호출 가능)"""
+        return MarketScanner(self.settings, self.candle_cache).scan(top_n)
+
+    def holdings_count(self) -> int:
+        return sum(1 for info in self.universe.values() if info['qty'] > 0)
+
+    def get_holdings(self) -> List[Dict]:
+        """현재 보유 중인 모든 코인 정보 반환"""
+        holdings = []
+
+        for ticker, info in self.universe.items():
+            if info.get('state') == '보유중' and info.get('qty', 0) > 0:
+                buy_price = info.get('buy_price', 0)
+                current = info.get('current', 0)
+
+                if buy_price > 0:
+                    pnl = (current - buy_price) / buy_price * 100
+                else:
+                    pnl = 0
+
+                holdings.append({
+                    'ticker': ticker,
+                    'qty': info.get('qty', 0),
+                    'buy_price': buy_price,
+                    'current': current,
+                    'pnl': pnl
+                })
+
+        return holdings
+
+    def record_trade(self, ticker, trade_type, price, quantity, profit=0, reason="") -> Dict:
+        """거래 기록 추가 (저장소 1건 추가 후 클라이언트에 통지)"""
+        record = {
+            'timestamp': datetime.datetime.now().isoformat(),
+            'ticker': ticker,
+            'type': trade_type,  # 'BUY' / 'SELL' / 'PARTIAL_SELL'
+            'price': price,
+            'quantity': quantity,
+            'amount': price * quantity,
+            'profit': profit,
+            'reason': reason
+        }
+        rowid = None
+        if self.trade_store is not None:
+            try:
+                rowid = self.trade_store.append(record)
+            except Exception as e:
+                self.logger.error(f"거래 기록 저장 실패: {e}")
+        self.listener.trade_recorded(record, rowid)
+        return record
+
+    # =========================================================================
+    # 전략 계산
+    # =========================================================================
+    def calculate_target_price(self, ticker, interval, k=None):
+        """변동성 돌파 목표가 계산"""
+        try:
+            df = self.candles.get(ticker, interval, 2)
+            if df is None or len(df) < 2:
+                return None
+
+            prev_high = df.iloc[-2]['high']
+            prev_low = df.iloc[-2]['low']
+            volatility = prev_high - prev_low
+
+            current_open = df.iloc[-1]['open']
+            if k is None:
+                k = self.settings.k_value
+
+            return current_open + (volatility * k)
+        except Exception as e:
+            self.logger.error(f"목표가 계산 실패 ({ticker}): {e}")
+            return None
+
+    def calculate_ma(self, ticker, interval, period=5):
+        """이동평균 계산"""
+        try:
+            df = self.candles.get(ticker, interval, period + 1)
+            if df is None or len(df) < period:
+                return None
+            return df['close'].rolling(window=period).mean().iloc[-1]
+        except Exception as e:
+            self.logger.error(f"MA 계산 실패 ({ticker}): {e}")
+            return None
+
+    def _candles(self, ticker, count, max_age=None):
+        """지표 계산용 캔들 (실시간 캔들 - 진행 중인 봉의 종가/고가/저가는 최신 가격으로 보정)"""
+        df = self.candles.get(ticker, self.settings.candle_interval, count, max_age)
+        if df is None or len(df) == 0:
+            return df
+
+        info = self.universe.get(ticker)
+        price = info.get('current') if info else None
+        if price:
+            df = df.copy()
+            last = df.index[-1]
+            df.at[last, 'close'] = price
+            df.at[last, 'high'] = max(df.at[last, 'high'], price)
+            df.at[last, 'low'] = min(df.at[last, 'low'], price)
+        return df
+
+    def calculate_rsi(self, ticker, period=14):
+        """RSI 계산"""
+        try:
+            df = self._candles(ticker, period+2)
+            if df is None or len(df) < period + 1:
+                return 50
+
+            delta = df['close'].diff()
+            gain = delta.where(delta > 0, 0)
+            loss = (-delta).where(delta < 0, 0)
+
+            avg_gain = gain.rolling(window=period).mean().iloc[-1]
+            avg_loss = loss.rolling(window=period).mean().iloc[-1]
+
+            if avg_loss == 0:
+                return 100
+
+            rs = avg_gain / avg_loss
+            return 100 - (100 / (1 + rs))
+        except Exception as e:
+            return 50
+
+    def calculate_macd(self, ticker):
+        """MACD 계산 (MACD, Signal, Histogram 반환)"""
+        try:
+            df = self._candles(ticker, 50)
+            if df is None or len(df) < 30:
+                return 0, 0, 0
+
+            close = df['close']
+
+            # EMA 계산
+            ema_fast = close.ewm(span=Config.DEFAULT_MACD_FAST, adjust=False).mean()
+            ema_slow = close.ewm(span=Config.DEFAULT_MACD_SLOW, adjust=False).mean()
+
+            # MACD = 단기 EMA - 장기 EMA
+            macd = ema_fast - ema_slow
+
+            # Signal = MACD의 9일 EMA
+            signal = macd.ewm(span=Config.DEFAULT_MACD_SIGNAL, adjust=False).mean()
+
+            # Histogram = MACD - Signal
+            histogram = macd - signal
+
+            return macd.iloc[-1], signal.iloc[-1], histogram.iloc[-1]
+        except Exception as e:
+            self.logger.error(f"MACD 계산 실패 ({ticker}): {e}")
+            return 0, 0, 0
+
+    def calculate_bollinger_bands(self, ticker):
+        """볼린저 밴드 계산 (상단, 중간, 하단 반환)"""
+        try:
+            period = Config.DEFAULT_BB_PERIOD
+            df = self._candles(ticker, period + 5)
+            if df is None or len(df) < period:
+                return None, None, None
+
+            close = df['close']
+
+            # 중간선 (SMA)
+            middle = close.rolling(window=period).mean().iloc[-1]
+
+            # 표준편차
+            std = close.rolling(window=period).std().iloc[-1]
+
+            # 상단/하단 밴드
+            upper = middle + (std * Config.DEFAULT_BB_STD)
+            lower = middle - (std * Config.DEFAULT_BB_STD)
+
+            return upper, middle, lower
+        except Exception as e:
+            self.logger.error(f"볼린저 밴드 계산 실패 ({ticker}): {e}")
+            return None, None, None
+
+    def calculate_atr(self, ticker, period=14):
+        """ATR (Average True Range) 계산"""
+        try:
+            df = self._candles(ticker, period + 5)
+            if df is None or len(df) < period:
+                return None
+
+            high = df['high']
+            low = df['low']
+            close = df['close']
+
+            # True Range 계산 (DataFrame 내장 연산 사용)
+            tr1 = high - low
+            tr2 = (high - close.shift()).abs()
+            tr3 = (low - close.shift()).abs()
+
+            # 각 행에서 최대값 선택
+            df['tr'] = tr1
+            df.loc[tr2 > df['tr'], 'tr'] = tr2
+            df.loc[tr3 > df['tr'], 'tr'] = tr3
+
+            # ATR = True Range의 이동평균
+            atr = df['tr'].rolling(window=period).mean().iloc[-1]
+            return atr
+        except Exception as e:
+            self.logger.error(f"ATR 계산 실패 ({ticker}): {e}")
+            return None
+
+    def calculate_volume_avg(self, ticker, period=20):
+        """평균 거래량 계산"""
+        try:
+            # 진행 중인 봉 거래량은 스냅샷 누적 거래량으로 집계 (시드 전에만 CANDLE_CACHE_MAX_AGE 적용)
+            df = self._candles(ticker, period + 1, Config.CANDLE_CACHE_MAX_AGE)
+            if df is None or len(df) < period:
+                return None, None
+
+            current_volume = df.iloc[-1]['volume']
+            avg_volume = df['volume'].iloc[:-1].mean()
+
+            return current_volume, avg_volume
+        except Exception as e:
+            return None, None
+
+    def calculate_stoch_rsi(self, ticker, rsi_period=14, stoch_period=14, k_period=3, d_period=3):
+        """스토캐스틱 RSI 계산 (v2.5 신규)"""
+        try:
+            df = self._candles(ticker, rsi_period + stoch_period + 10)
+            if df is None or len(df) < rsi_period + stoch_period:
+                return 50, 50  # 기본값
+
+            # RSI 계산
+            delta = df['close'].diff()
+            gain = delta.where(delta > 0, 0)
+            loss = (-delta).where(delta < 0, 0)
+            avg_gain = gain.rolling(window=rsi_period).mean()
+            avg_loss = loss.rolling(window=rsi_period).mean()
+            rs = avg_gain / avg_loss
+            rsi = 100 - (100 / (1 + rs))
+
+            # 스토캐스틱 RSI 계산
+            rsi_min = rsi.rolling(window=stoch_period).min()
+            rsi_max = rsi.rolling(window=stoch_period).max()
+            stoch_rsi = (rsi - rsi_min) / (rsi_max - rsi_min) * 100
+
+            # %K, %D
+            k = stoch_rsi.rolling(window=k_period).mean().iloc[-1]
+            d = stoch_rsi.rolling(window=d_period).mean().iloc[-1]
+
+            return k if not pd.isna(k) else 50, d if not pd.isna(d) else 50
+        except Exception as e:
+            self.logger.error(f"스토캐스틱 RSI 계산 실패 ({ticker}): {e}")
+            return 50, 50
+
+    def calculate_dmi_adx(self, ticker, period=14):
+        """DMI와 ADX 계산 (v2.7) - 추세 강도 측정"""
+        try:
+            df = self._candles(ticker, period * 3)
+            if df is None or len(df) < period * 2:
+                return 0, 0, 0  # +DI, -DI, ADX
+
+            high = df['high']
+            low = df['low']
+            close = df['close']
+
+            # +DM, -DM 계산
+            plus_dm = high.diff()
+            minus_dm = -low.diff()
+            plus_dm[plus_dm < 0] = 0
+            minus_dm[minus_dm < 0] = 0
+
+            # 조건: +DM > -DM일 때만 +DM 유효
+            plus_dm[(plus_dm < minus_dm) | (plus_dm < 0)] = 0
+            minus_dm[(minus_dm < plus_dm) | (minus_dm < 0)] = 0
+
+            # True Range
+            tr1 = high - low
+            tr2 = (high - close.shift()).abs()
+            tr3 = (low - close.shift()).abs()
+            tr = pd.concat([tr1, tr2, tr3], axis=1).max(axis=1)
+
+            # 평활화 (Wilder 스무딩)
+            atr = tr.rolling(window=period).mean()
+
+            # ZeroDivision 방지: ATR이 0인 경우 처리
+            atr_safe = atr.replace(0, float('nan'))
+            plus_di = 100 * (plus_dm.rolling(window=period).mean() / atr_safe)
+            minus_di = 100 * (minus_dm.rolling(window=period).mean() / atr_safe)
+
+            # DX와 ADX - ZeroDivision 방지
+            di_sum = plus_di + minus_di
+            di_sum_safe = di_sum.replace(0, float('nan'))
+            dx = 100 * (abs(plus_di - minus_di) / di_sum_safe)
+            adx = dx.rolling(window=period).mean()
+
+            # NaN 처리
+            plus_di_val = plus_di.iloc[-1]
+            minus_di_val = minus_di.iloc[-1]
+            adx_val = adx.iloc[-1]
+
+            return (
+                0 if pd.isna(plus_di_val) else plus_di_val,
+                0 if pd.isna(minus_di_val) else minus_di_val,
+                0 if pd.isna(adx_val) else adx_val
+            )
+        except Exception as e:
+            self.logger.error(f"DMI/ADX 계산 실패 ({ticker}): {e}")
+            return 0, 0, 0
+
+    def api_call_with_retry(self, func, *args, max_retries=None, delay=None):
+        """API 호출 재시도 래퍼 (v2.5 신규)"""
+        max_retries = max_retries or Config.API_MAX_RETRIES
+        delay = delay or Config.API_RETRY_DELAY
+
+        for attempt in range(max_retries):
+            try:
+                result = func(*args)
+                return result
+            except Exception as e:
+                if attempt < max_retries - 1:
+                    self.logger.warning(f"API 호출 실패 (시도 {attempt + 1}/{max_retries}): {e}")
+                    time.sleep(delay * (attempt + 1))
+                else:
+                    self.logger.error(f"API 호출 최종 실패: {e}")
+                    raise
+
+    def calculate_entry_score(self, ticker, curr_price, info):
+        """진입 점수 계산 (v2.5 신규) - 0~100점"""
+        s = self.settings
+        score = 0
+        reasons = []
+        weights = Config.ENTRY_WEIGHTS
+
+        # 1. 목표가 돌파 (필수 조건이지만 점수로도 반영)
+        if curr_price >= info['target']:
+            score += weights['target_break']
+            reasons.append(f"+{weights['target_break']} 목표가 돌파")
+
+        # 2. MA5 필터
+        if curr_price >= info['ma5']:
+            score += weights['ma_filter']
+            reasons.append(f"+{weights['ma_filter']} MA5 위")
+
+        # 3. RSI 최적 구간
+        if s.use_rsi:
+            rsi = self.calculate_rsi(ticker, s.rsi_period)
+            if 30 <= rsi <= 70:
+                score += weights['rsi_optimal']
+                reasons.append(f"+{weights['rsi_optimal']} RSI {rsi:.1f} (최적)")
+            elif rsi < 30:
+                score += weights['rsi_optimal'] // 2  # 과매도는 절반 점수
+                reasons.append(f"+{weights['rsi_optimal']//2} RSI {rsi:.1f} (과매도)")
+        else:
+            score += weights['rsi_optimal']  # RSI 미사용시 만점
+
+        # 4. MACD 골든크로스
+        if s.use_macd:
+            macd, signal, histogram = self.calculate_macd(ticker)
+            if macd > signal:
+                score += weights['macd_golden']
+                reasons.append(f"+{weights['macd_golden']} MACD 골든크로스")
+        else:
+            score += weights['macd_golden']  # MACD 미사용시 만점
+
+        # 5. 거래량 확인
+        if s.use_volume:
+            curr_vol, avg_vol = self.calculate_volume_avg(ticker, Config.DEFAULT_VOLUME_PERIOD)
+            if curr_vol and avg_vol:
+                required_vol = avg_vol * s.volume_mult
+                if curr_vol >= required_vol:
+                    score += weights['volume_confirm']
+                    reasons.append(f"+{weights['volume_confirm']} 거래량 충분")
+        else:
+            score += weights['volume_confirm']
+
+        # 6. 볼린저 밴드 포지션
+        upper, middle, lower = self.calculate_bollinger_bands(ticker)
+        if lower and middle:
+            if lower <= curr_price <= middle:  # 하단~중간: 최적
+                score += weights['bb_position']
+                reasons.append(f"+{weights['bb_position']} BB 최적 구간")
+            elif middle < curr_price <= upper:  # 중간~상단: 절반
+                score += weights['bb_position'] // 2
+                reasons.append(f"+{weights['bb_position']//2} BB 중상단")
+
+        return score, reasons
+
+    # =========================================================================
+    # 가격 업데이트 및 조건 확인
+    # =========================================================================
+    def drain_snapshots(self):
+        """우편함에 쌓인 종목별 최신 스냅샷 처리 (엔진 스레드)"""
+        snapshots = self.mailbox.take()
+        if snapshots:
+            self.on_snapshots(snapshots)
+
+    def on_snapshots(self, snapshots: List[Dict[str, Any]]):
+        """현재가 스냅샷(get_current_price verbose) 반영 - 실시간 캔들 집계 후 가격 처리"""
+        gaps = self.candles.ingest(snapshots)
+        gaps = [t for t in gaps if t in self.universe]
+        if gaps and self.is_running:
+            self.log(f"📡 시세 끊김 감지 - 캔들 재조회: {', '.join(gaps)}")
+            self.refresh_targets(gaps)
+        self.on_prices({s['market']: s['trade_price'] for s in snapshots
+                        if s.get('market') and s.get('trade_price') is not None})
+
+    def on_prices(self, prices: Dict[str, float]):
+        """실시간 가격 업데이트"""
+        if not self.is_running:
+            return
+
+        held, watching = [], []
+        now = time.monotonic()
+        for ticker, price in prices.items():
+            info = self.universe.get(ticker)
+            if info is None:
+                continue
+
+            self._update_volatility(ticker, price, now)
+            self.strategy.update_recent_price(ticker, price, target_price=info['target'])
+            info['current'] = price
+            self.listener.price_changed(ticker, info)
+
+            if info['state'] == '감시중' and info['qty'] == 0:
+                watching.append((ticker, price, info))
+            elif (info['state'] == '보유중' and info['qty'] > 0
+                  and ticker not in self._exit_pending):
+                held.append(info.slot)
+
+        # 1. 매도 로직 먼저 - 메모리 비교만 (I/O 없음), 주문은 청산 레인으로 제출
+        if held:
+            self._check_sell_conditions(np.array(held))
+
+        # 2. 매수 로직 - 지표 계산(캔들 시드 등 I/O 가능)은 청산 판정 이후
+        for ticker, price, info in watching:
+            if info['state'] == '감시중':
+                self._check_buy_condition(ticker, price, info)
+
+        self._update_poll_intervals(prices)
+
+    def _update_volatility(self, ticker, price, now):
+        """종목별 변동성 (조회 간 가격 변화율 / √경과초의 지수 이동 평균)"""
+        vol = Config.POLL_VOL_FLOOR
+        last = self._tick_vol.get(ticker)
+        if last is not None:
+            last_price, last_time, vol = last
+            elapsed = now - last_time
+            if last_price > 0 and elapsed > 0:
+                move = abs(price - last_price) / last_price * 100 / math.sqrt(max(elapsed, 0.1))
+                vol += 0.2 * (move - vol)
+        self._tick_vol[ticker] = (price, now, vol)
+
+    def _update_poll_intervals(self, prices):
+        """종목별 다음 조회 주기 계산
+
+        조건 가격(감시: 목표가, 보유: 손절가 / 트레일링 스톱 가격)까지 거리를
+        변동성으로 나눈 z로, 한 주기 동안의 움직임이 POLL_SAFETY_SIGMA 시그마가 되는
+        주기 (z / σ)² 초를 쓰고 POLL_MIN_INTERVAL ~ 상한으로 자릅니다.
+        주문 체결 확인 중인 종목만 POLL_MIN_INTERVAL, 매매가 끝난 종목은 유휴 상한으로 조회합니다.
+        """
+        s = self.settings
+        intervals = {t: v for t, v in self.poll_intervals.items() if t in self.universe}
+        for ticker in prices:
+            info = self.universe.get(ticker)
+            if info is None or not info['current']:
+                continue
+            price = info['current']
+
+            if info['state'] == '주문중' or ticker in self._exit_pending:
+                intervals[ticker] = Config.POLL_MIN_INTERVAL  # 매수 / 매도 체결 확인 중
+                continue
+            if info['state'] == '보유중' and info['qty'] > 0:
+                stop = info['buy_price'] * (1 - s.loss_cut / 100)
+                distance = (price - stop) / price * 100
+                if info['max_profit_rate'] >= s.ts_start:
+                    trail = info['high_since_buy'] * (1 - s.ts_stop / 100)
+                    distance = min(distance, (price - trail) / price * 100)
+                cap = Config.POLL_HELD_MAX_INTERVAL
+            elif info['state'] == '감시중':
+                distance = (info['target'] - price) / price * 100
+                cap = Config.POLL_IDLE_MAX_INTERVAL
+            else:
+                intervals[ticker] = Config.POLL_IDLE_MAX_INTERVAL  # 매도완료 / 체결확인실패
+                continue
+
+            vol = max(self._tick_vol.get(ticker, (0, 0, 0))[2], Config.POLL_VOL_FLOOR)
+            z = max(distance, 0.0) / vol
+            intervals[ticker] = min(max((z / Config.POLL_SAFETY_SIGMA) ** 2,
+                                        Config.POLL_MIN_INTERVAL), cap)
+        self.poll_intervals = intervals
+
+    def _check_buy_condition(self, ticker, curr, info):
+        """매수 조건 확인"""
+        s = self.settings
+
+        # 1. 목표가 돌파
+        if curr < info['target']:
+            return
+
+        # 2. MA5 위
+        if curr < info['ma5']:
+            return
+
+        # 3. RSI 필터
+        if s.use_rsi:
+            rsi = self.calculate_rsi(ticker, s.rsi_period)
+            if rsi >= s.rsi_upper:
+                self.log(f"[{ticker}] RSI {rsi:.1f} >= {s.rsi_upper} (과매수) 진입 보류")
+                return
+
+        # 4. MACD 필터 (골든크로스: MACD > Signal)
+        if s.use_macd:
+            macd, signal, histogram = self.calculate_macd(ticker)
+            if macd <= signal:
+                self.log(f"[{ticker}] MACD {macd:.2f} <= Signal {signal:.2f} (하락세) 진입 보류")
+                return
+
+        # 5. 거래량 필터
+        if s.use_volume:
+            curr_vol, avg_vol = self.calculate_volume_avg(ticker, Config.DEFAULT_VOLUME_PERIOD)
+            if curr_vol and avg_vol:
+                required_vol = avg_vol * s.volume_mult
+                if curr_vol < required_vol:
+                    self.log(f"[{ticker}] 거래량 부족 ({curr_vol:,.0f} < {required_vol:,.0f}) 진입 보류")
+                    return
+
+        # 6. 돌파 확인 (최근 N틱 / N초 동안 목표가 유지)
+        if s.use_breakout_confirm and not self.strategy.check_breakout_confirmation(
+                ticker, info['target'], s.breakout_confirm_ticks, s.breakout_confirm_seconds):
+            return
+
+        # 7. 재진입 쿨다운 (만료 시 예약 작업이 해제 - 여기서는 조회만)
+        if s.use_cooldown and ticker in self.strategy.cooldown_tickers:
+            return
+
+        # 8. 리스크 관리
+        if not self.check_risk_limits():
+            return
+
+        # 9. v2.7: 진입 점수 체크 (선택적)
+        score, reasons = self.calculate_entry_score(ticker, curr, info)
+        if score < Config.ENTRY_SCORE_THRESHOLD:
+            self.log(f"[{ticker}] 진입 점수 {score:.0f} < {Config.ENTRY_SCORE_THRESHOLD} 진입 보류")
+            return
+
+        # 매수 실행
+        self.log(f"[{ticker}] 진입 조건 충족 (점수: {score:.0f})")
+        self.execute_buy(ticker, curr)
+
+    def _check_sell_conditions(self, slots):
+        """보유 종목 매도 조건 일괄 확인 (손절 → 분할 익절 → 트레일링 스톱)
+
+        판정은 PositionBook.evaluate가 가격 벡터로 한 번에 하고,
+        여기서는 화면 갱신과 조건을 충족한 종목의 주문만 처리합니다.
+        """
+        s = self.settings
+        book = self.positions
+        rates, actions, levels, drops = book.evaluate(
+            slots, s.loss_cut, s.use_partial_tp, s.ts_start, s.ts_stop)
+
+        for slot, rate in zip(slots.tolist(), rates.tolist()):
+            if book.buy_price[slot] > 0:
+                ticker = book.tickers[slot]
+                self.listener.profit_changed(ticker, self.universe[ticker], rate)
+
+        for i in np.flatnonzero(actions).tolist():
+            slot = int(slots[i])
+            ticker = book.tickers[slot]
+            action = actions[i]
+
+            # 1. 손절
+            if action == EXIT_STOP_LOSS:
+                self.log(f"🛑 [{ticker}] 손절 조건 ({rates[i]:.2f}%) → 매도")
+                self.execute_sell(ticker, "손절")
+
+            # 2. 분할 익절 (v2.7 신규 - 한 번에 하나의 레벨만)
+            elif action == EXIT_PARTIAL:
+                level = book.levels[levels[i]]
+                rate, sell_ratio = level['rate'], level['sell_ratio']
+                partial_qty = float(book.qty[slot]) * (sell_ratio / 100)
+                self.log(f"💰 [{ticker}] {rate}% 도달 → {sell_ratio}% 분할 익절")
+                # 메모리에만 표시 (다음 틱 중복 방지) - 저장은 주문 접수 콜백에서
+                book.partial_done[slot, levels[i]] = True
+                self._execute_partial_sell(ticker, partial_qty, f"분할익절 {rate}%", int(levels[i]))
+
+            # 3. 트레일링 스톱
+            elif action == EXIT_TRAILING:
+                self.log(f"🎯 [{ticker}] 트레일링 스톱 (고점 대비 -{drops[i]:.2f}%) → 이익 실현")
+                self.execute_sell(ticker, "TS")
+
+    def _start_holding(self, ticker):
+        """매수 체결 후 보유 시작 기록 + 보유 시간 청산 예약"""
+        self.strategy.set_holding_start(ticker)
+        started_at = self.strategy.holding_start_times[ticker].timestamp()
+        self._put_state('holding', ticker, started_at)
+        self._schedule_time_exit(ticker, started_at)
+
+    def _schedule_time_exit(self, ticker, started_at):
+        if self.settings.use_time_exit:
+            self.timers.schedule_at(('time_exit', ticker), started_at + self.settings.max_holding_hours * 3600,
+                                    lambda: self._time_exit(ticker), f"{ticker} 보유 시간 청산")
+
+    def _end_holding(self, ticker):
+        """전량 매도 체결 후 보유 기록 / 시간 청산 예약 해제 + 재진입 쿨다운"""
+        self.strategy.clear_holding_start(ticker)
+        self.timers.cancel(('time_exit', ticker))
+        self._put_state('holding', ticker, None)
+        if self.settings.use_cooldown:
+            self.strategy.set_cooldown(ticker, self.settings.cooldown_minutes)
+            self._put_state('cooldowns', ticker, self.strategy.cooldown_tickers[ticker].timestamp())
+
+    def _time_exit(self, ticker):
+        """보유 시간 청산 기한 도달 (예약 작업)"""
+        info = self.universe.get(ticker)
+        if info is None or info['state'] != '보유중' or info['qty'] <= 0:
+            return
+        if self.strategy.check_holding_time_exit(ticker, self.settings.max_holding_hours):
+            self.execute_sell(ticker, "시간청산")
+
+    def check_risk_limits(self):
+        """리스크 한도 체크"""
+        s = self.settings
+        if not s.use_risk:
+            return True
+
+        # 일일 손실 한도
+        if self.initial_balance > 0:
+            loss_rate = (self.total_realized_profit / self.initial_balance) * 100
+
+            if loss_rate <= -s.max_daily_loss:
+                if not self.daily_loss_triggered:
+                    self.daily_loss_triggered = True
+                    self.log(f"🛑 일일 손실 한도 도달! ({loss_rate:.2f}%)")
+                return False
+
+        # 최대 보유 종목
+        if self.holdings_count() >= s.max_holdings:
+            return False
+
+        return True
+
+    # =========================================================================
+    # 주문 실행
+    # =========================================================================
+    def _set_state(self, info: Dict, state: str):
+        info['state'] = state
+        self._persist_ticker(info['name'])
+        self.listener.state_changed(info['name'], info)
+
+    def execute_buy(self, ticker, curr_price):
+        """매수 주문"""
+        if not self.upbit:
+            return
+
+        ratio = self.settings.betting_ratio / 100
+        bet_cash = self.balance * ratio
+
+        if bet_cash < 5000:  # 업비트 최소 주문금액
+            self.log(f"[{ticker}] 매수금액 부족 (최소 5,000원)")
+            return
+
+        # 응답 전 중복 매수 방지 - 제출 시점에 주문중, 실패하면 감시중으로 복귀
+        info = self.universe[ticker]
+        self._set_state(info, '주문중')
+
+        def done(result):
+            if result and 'uuid' in result:
+                self.log(f"📤 [{ticker}] 매수 주문: {bet_cash:,.0f}원")
+                self.logger.info(f"매수 주문: {ticker} {bet_cash:,.0f}원")
+                self._track_order(result['uuid'], ticker, 'buy')
+
+                # 체결 확인
+                self.call_later(self.ORDER_CHECK_DELAY,
+                                lambda: self.check_buy_execution(ticker, result['uuid']),
+                                key=('order', result['uuid']), label=f"{ticker} 매수 체결 확인")
+            else:
+                self.log(f"[ERROR] 매수 주문 실패: {result}")
+                self._restore_state(ticker, '주문중', '감시중')
+
+        def failed(e):
+            self.log(f"[ERROR] 매수 주문 실패: {e}")
+            self.logger.error(f"매수 주문 실패 ({ticker}): {e}")
+            self._restore_state(ticker, '주문중', '감시중')
+
+        # 시장가 매수 (진입 레인)
+        self.orders.submit(PRIORITY_ENTRY, lambda: self.upbit.buy_market_order(ticker, bet_cash),
+                           done, failed)
+
+    def _restore_state(self, ticker, expected, state):
+        """주문 실패 시 상태 복귀 (그 사이 다른 상태로 바뀌었으면 유지)"""
+        info = self.universe.get(ticker)
+        if info is not None and info['state'] == expected:
+            self._set_state(info, state)
+
+    def check_buy_execution(self, ticker, uuid, retry_count=0):
+        """매수 체결 확인 (최대 30회 재시도, 60초 타임아웃)"""
+        try:
+            order = self.upbit.get_order(uuid)
+            if order and order.get('state') == 'done':
+                info = self.universe[ticker]
+
+                # 체결 정보
+                executed_volume = float(order.get('executed_volume', 0))
+                paid_fee = float(order.get('paid_fee', 0))
+                total_price = float(order.get('price', 0)) + paid_fee
+
+                if executed_volume > 0:
+                    avg_price = total_price / executed_volume
+
+                    self.positions.open_position(info.slot, executed_volume, avg_price, total_price)
+                    self.listener.position_changed(ticker, info)
+                    self._set_state(info, '보유중')
+
+                    self.log(f"✅ [{ticker}] 매수 체결: {executed_volume:.8f} @ {avg_price:,.0f}원")
+                    self._start_holding(ticker)
+
+                    # v2.7: 거래 기록 추가
+                    self.record_trade(ticker, 'BUY', avg_price, executed_volume, 0, '매수 체결')
+
+                    self.refresh_balance()
+                self._untrack_order(uuid)
+            elif order and order.get('state') == 'cancel':
+                # 주문 취소됨
+                self._untrack_order(uuid)
+                info = self.universe.get(ticker)
+                if info:
+                    self._set_state(info, '감시중')
+                self.log(f"⚠️ [{ticker}] 매수 주문 취소됨")
+            else:
+                # 아직 체결 안됨, 재시도 횟수 확인
+                if retry_count < self.ORDER_CHECK_RETRIES:
+                    self.call_later(self.ORDER_CHECK_DELAY,
+                                    lambda: self.check_buy_execution(ticker, uuid, retry_count + 1),
+                                    key=('order', uuid), label=f"{ticker} 매수 체결 확인")
+                else:
+                    # 타임아웃 - 상태 복원
+                    self.log(f"[ERROR] [{ticker}] 매수 체결 확인 타임아웃 (60초)")
+                    self.logger.error(f"매수 체결 확인 타임아웃: {ticker}, uuid={uuid}")
+                    self._untrack_order(uuid)
+                    info = self.universe.get(ticker)
+                    if info:
+                        self._set_state(info, '체결확인실패')
+        except Exception as e:
+            self.logger.error(f"체결 확인 실패 ({ticker}): {e}")
+
+    def execute_sell(self, ticker, reason):
+        """매도 주문 (청산 레인 - 대기 중인 매수 주문보다 먼저 실행)"""
+        if not self.upbit:
+            return
+
+        info = self.universe[ticker]
+        qty = info['qty']
+        if qty == 0 or ticker in self._exit_pending:
+            return
+        self._exit_pending.add(ticker)
+
+        def done(result):
+            if result and 'uuid' in result:
+                self.log(f"📤 [{ticker}] 매도 주문: {qty:.8f} ({reason})")
+                self.logger.info(f"매도 주문: {ticker} {qty:.8f} ({reason})")
+                self._track_order(result['uuid'], ticker, 'sell', reason, qty)
+
+                self.call_later(self.ORDER_CHECK_DELAY,
+                                lambda: self.check_sell_execution(ticker, result['uuid'], reason),
+                                key=('order', result['uuid']), label=f"{ticker} 매도 체결 확인")
+            else:
+                self._exit_pending.discard(ticker)
+                self.log(f"[ERROR] 매도 주문 실패: {result}")
+
+        def failed(e):
+            self._exit_pending.discard(ticker)
+            self.log(f"[ERROR] 매도 주문 실패: {e}")
+            self.logger.error(f"매도 주문 실패 ({ticker}): {e}")
+
+        self.orders.submit(PRIORITY_EXIT, lambda: self.upbit.sell_market_order(ticker, qty),
+                           done, failed)
+
+    def _execute_partial_sell(self, ticker, qty, reason, level=None):
+        """부분 매도 주문 (v2.7 신규 - 분할 익절용)
+
+        level: 분할 익절 단계 - 주문이 접수되면 완료 표시를 저장하고,
+        실패하면 표시를 되돌려 다음 가격에서 다시 시도합니다.
+        """
+        if not self.upbit:
+            return
+
+        info = self.universe.get(ticker)
+        if not info or qty <= 0:
+            return
+
+        def rollback():
+            if level is not None and self.universe.get(ticker) is info:
+                self.positions.partial_done[info.slot, level] = False
+
+        def done(result):
+            if result and 'uuid' in result:
+                self.log(f"📤 [{ticker}] 분할 매도: {qty:.8f} ({reason})")
+                self.logger.info(f"분할 매도: {ticker} {qty:.8f} ({reason})")
+                self._persist_ticker(ticker)  # 분할 익절 단계 완료 표시
+                self._track_order(result['uuid'], ticker, 'partial', reason, qty)
+
+                # 체결 확인 (분할 매도용)
+                self.call_later(self.ORDER_CHECK_DELAY, lambda: self._check_partial_sell_execution(
+                    ticker, result['uuid'], qty, reason
+                ), key=('order', result['uuid']), label=f"{ticker} 분할 매도 체결 확인")
+            else:
+                rollback()
+                self.log(f"[ERROR] 분할 매도 실패: {result}")
+
+        def failed(e):
+            rollback()
+            self.log(f"[ERROR] 분할 매도 실패: {e}")
+            self.logger.error(f"분할 매도 실패 ({ticker}): {e}")
+
+        self.orders.submit(PRIORITY_EXIT, lambda: self.upbit.sell_market_order(ticker, qty),
+                           done, failed)
+
+    def _check_partial_sell_execution(self, ticker, uuid, qty, reason, retry_count=0):
+        """분할 매도 체결 확인"""
+        try:
+            order = self.upbit.get_order(uuid)
+            if order and order.get('state') == 'done':
+                self._untrack_order(uuid)
+                info = self.universe.get(ticker)
+                if not info:
+                    return
+
+                executed_volume = float(order.get('executed_volume', 0))
+                trades_price = float(order.get('trades', [{}])[0].get('price', 0)) if order.get('trades') else 0
+
+                # 보유 수량 감소
+                info['qty'] -= executed_volume
+
+                # 손익 계산 (부분)
+                sell_amount = executed_volume * trades_price
+                buy_portion = info['invest_amt'] * (executed_volume / (info['qty'] + executed_volume))
+                profit = sell_amount - buy_portion
+
+                self.total_realized_profit += profit
+                self.trade_count += 1
+                if profit > 0:
+                    self.win_count += 1
+
+                self._persist_ticker(ticker)
+                self._persist_stats()
+                self.listener.position_changed(ticker, info)
+                self.listener.stats_changed()
+
+                self.log(f"✅ [{ticker}] 분할 매도 체결 (손익: {profit:+,.0f}원)")
+                self.record_trade(ticker, 'PARTIAL_SELL', trades_price, executed_volume, profit, reason)
+
+                self.refresh_balance()
+            else:
+                if retry_count < self.ORDER_CHECK_RETRIES:
+                    self.call_later(self.ORDER_CHECK_DELAY, lambda: self._check_partial_sell_execution(
+                        ticker, uuid, qty, reason, retry_count + 1
+                    ), key=('order', uuid), label=f"{ticker} 분할 매도 체결 확인")
+                else:
+                    self.log(f"[ERROR] [{ticker}] 분할 매도 체결 확인 타임아웃")
+                    self._untrack_order(uuid)
+        except Exception as e:
+            self.logger.error(f"분할 매도 체결 확인 실패 ({ticker}): {e}")
+
+    def check_sell_execution(self, ticker, uuid, reason, retry_count=0):
+        """매도 체결 확인 (최대 30회 재시도, 60초 타임아웃)"""
+        try:
+            order = self.upbit.get_order(uuid)
+            if order and order.get('state') == 'done':
+                info = self.universe[ticker]
+
+                executed_volume = float(order.get('executed_volume', 0))
+                trades_price = float(order.get('trades', [{}])[0].get('price', 0)) if order.get('trades') else 0
+
+                # 손익 계산
+                sell_amount = executed_volume * trades_price
+                buy_amount = info['invest_amt']
+                profit = sell_amount - buy_amount
+
+                self.total_realized_profit += profit
+                self.trade_count += 1
+                if profit > 0:
+                    self.win_count += 1
+
+                self.positions.close_position(info.slot)
+                self._exit_pending.discard(ticker)
+                self._untrack_order(uuid)
+                self._end_holding(ticker)
+                # 쿨다운 사용 시 다시 감시 (재진입은 쿨다운 만료 후), 아니면 이 종목 매매 종료
+                self._set_state(info, '감시중' if self.settings.use_cooldown else '매도완료')
+                self._persist_stats()
+                self.listener.position_changed(ticker, info)
+                self.listener.stats_changed()
+
+                self.log(f"✅ [{ticker}] 매도 체결 (손익: {profit:+,.0f}원)")
+
+                # v2.7: 거래 기록 추가
+                self.record_trade(ticker, 'SELL', trades_price, executed_volume, profit, reason)
+
+                self.refresh_balance()
+
+                # 자동 유니버스에서 빠진 종목은 청산 후 제거
+                if info.get('remove_after_exit') and self.remove_ticker(ticker):
+                    self.listener.universe_changed(list(self.universe))
+            elif order and order.get('state') == 'cancel':
+                # 주문 취소됨
+                self.log(f"⚠️ [{ticker}] 매도 주문 취소됨")
+                self._exit_pending.discard(ticker)
+                self._untrack_order(uuid)
+                info = self.universe.get(ticker)
+                if info and info['qty'] > 0:
+                    self._set_state(info, '보유중')
+            else:
+                # 아직 체결 안됨, 재시도 횟수 확인
+                if retry_count < self.ORDER_CHECK_RETRIES:
+                    self.call_later(self.ORDER_CHECK_DELAY,
+                                    lambda: self.check_sell_execution(ticker, uuid, reason, retry_count + 1),
+                                    key=('order', uuid), label=f"{ticker} 매도 체결 확인")
+                else:
+                    # 타임아웃 - 로그만 기록 (실제 주문은 여전히 대기 중일 수 있음)
+                    self.log(f"[ERROR] [{ticker}] 매도 체결 확인 타임아웃 (60초)")
+                    self.logger.error(f"매도 체결 확인 타임아웃: {ticker}, uuid={uuid}")
+                    self._exit_pending.discard(ticker)
+                    self._untrack_order(uuid)
+                    info = self.universe.get(ticker)
+                    if info:
+                        self._set_state(info, '체결확인실패')
+        except Exception as e:
+            self.logger.error(f"매도 체결 확인 실패 ({ticker}): {e}")
+
+    def close_all_positions(self, reason: str = "긴급청산"):
+        """보유 종목 전량 시장가 매도"""
+        holdings = self.get_holdings()
+
+        if not holdings:
+            self.log("⚠️ 청산할 보유 코인이 없습니다")
+            return
+
+        self.log("🚨 긴급 전량 청산 시작")
+
+        for h in holdings:
+            ticker = h['ticker']
+            try:
+                self.execute_sell(ticker, reason)
+                self.log(f"🚨 [{ticker}] 긴급 청산 완료")
+            except Exception as e:
+                self.log(f"[ERROR] {ticker} 긴급 청산 실패: {e}")
+
+        self.log("🚨 긴급 전량 청산 종료")
+
+
+# ============================================================================
+# 헤드리스 실행 지원
+# ============================================================================
+def _timer_scheduler(delay: float, func: Callable[[], Any]):
+    """기본 스케줄러 (별도 이벤트 루프 없이 엔진만 쓸 때)"""
+    timer = threading.Timer(delay, func)
+    timer.daemon = True
+    timer.start()
+    return timer
+
+
+class EngineLoop:
+    """단일 스레드 이벤트 루프 - 엔진 콜백을 한 스레드에서 순서대로 실행
+
+    다른 스레드(가격 폴링 등)는 call_soon으로 작업을 넘기고,
+    지연 작업은 실행 시각 기준 힙에서 꺼내 실행합니다.
+    """
+
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._timers: List[Tuple[float, int, Callable, tuple]] = []
+        self._seq = itertools.count()
+        self._running = False
+
+    def call_soon(self, func: Callable, *args):
+        self.call_later(0, func, *args)
+
+    def call_later(self, delay: float, func: Callable, *args):
+        when = time.monotonic() + max(0.0, delay)
+        with self._cond:
+            heapq.heappush(self._timers, (when, next(self._seq), func, args))
+            self._cond.notify()
+
+    def call_every(self, interval: float, func: Callable):
+        """interval초마다 func 실행 (루프 종료 시까지)"""
+        def tick():
+            try:
+                func()
+            finally:
+                self.call_later(interval, tick)
+        self.call_later(interval, tick)
+
+    def run_forever(self):
+        """stop() 호출 전까지 예약된 작업 실행 (호출 스레드를 점유)"""
+        self._running = True
+        while True:
+            with self._cond:
+                while self._running:
+                    if self._timers:
+                        wait = self._timers[0][0] - time.monotonic()
+                        if wait <= 0:
+                            break
+                        self._cond.wait(wait)
+                    else:
+                        self._cond.wait()
+                if not self._running:
+                    return
+                _, _, func, args = heapq.heappop(self._timers)
+            try:
+                func(*args)
+            except Exception:
+                logger.exception("엔진 루프 작업 실패")
+
+    def stop(self):
+        """루프 종료 (어느 스레드에서나 호출 가능)"""
+        with self._cond:
+            self._running = False
+            self._cond.notify_all()
+
+
+class SnapshotMailbox:
+    """가격 피드 → 엔진 최신값 우편함 (스레드 안전)
+
+    피드 스레드는 put으로 종목별 스냅샷을 덮어쓰고, 엔진 스레드는 take로 한 번에 꺼냅니다.
+    엔진이 이전 배치를 처리하는 동안 들어온 스냅샷은 종목별 최신값 하나로 합쳐지므로
+    이벤트 큐에 배치가 쌓여 지난 가격으로 판단하는 일이 없습니다.
+    notify는 우편함이 비어 있다가 채워질 때만 호출됩니다 (엔진 스레드에 drain 예약).
+    """
+
+    def __init__(self, notify: Callable[[], Any]):
+        self.notify = notify
+        self._lock = threading.Lock()
+        self._pending: Dict[str, Dict[str, Any]] = {}
+        self._scheduled = False
+        self.received = 0   # 피드에서 받은 스냅샷 수
+        self.delivered = 0  # 엔진에 전달한 스냅샷 수
+        self.merged = 0     # 전달 전에 더 새 스냅샷으로 덮어쓴 수 (버린 지난 가격)
+        self.batches = 0    # 피드 배치 수
+        self.drains = 0     # 엔진 전달 횟수 (batches보다 작으면 배치가 합쳐진 것)
+
+    def put(self, snapshots: List[Dict[str, Any]]):
+        """스냅샷 등록 (피드 스레드)"""
+        with self._lock:
+            for snap in snapshots:
+                market = snap.get('market')
+                if not market:
+                    continue
+                if market in self._pending:
+                    self.merged += 1
+                self._pending[market] = snap
+                self.received += 1
+            self.batches += 1
+            wake = bool(self._pending) and not self._scheduled
+            if wake:
+                self._scheduled = True
+        if wake:
+            self.notify()
+
+    def take(self) -> List[Dict[str, Any]]:
+        """종목별 최신 스냅샷 전부 꺼내기 (엔진 스레드)"""
+        with self._lock:
+            snapshots = list(self._pending.values())
+            self._pending.clear()
+            self._scheduled = False
+            self.delivered += len(snapshots)
+            self.drains += 1
+        return snapshots
+
+    def summary(self) -> str:
+        return (f"수신 {self.received} / 전달 {self.delivered} / 병합 {self.merged} "
+                f"(배치 {self.batches} → 처리 {self.drains})")
+
+
+class PollSchedule:
+    """적응형 시세 조회 일정 (피드 스레드 전용)
+
+    종목별 다음 조회 시각을 두고, 조회할 때마다 기한이 된 종목만 묶어 한 번에 요청합니다.
+    다음 요청 전에 기한이 오는 종목도 같이 묶고, 요청 간격은 1 / max_rps 이상이라
+    종목 주기가 짧아져도 요청 한도를 넘지 않습니다.
+    """
+
+    def __init__(self, default_interval: float = Config.PRICE_UPDATE_INTERVAL,
+                 intervals: Optional[Callable[[], Dict[str, float]]] = None,
+                 max_rps: float = Config.POLL_MAX_REQUESTS_PER_SEC):
+        """
+        Args:
+            default_interval: 주기가 정해지지 않은 종목의 조회 주기 (초)
+            intervals: 종목별 조회 주기 dict를 돌려주는 함수 (예: lambda: engine.poll_intervals)
+            max_rps: 초당 최대 요청 수
+        """
+        self.default_interval = default_interval
+        self.intervals = intervals or dict
+        self.min_gap = 1.0 / max_rps
+        self._next: Dict[str, float] = {}
+        self.requests = 0
+        self.polled = 0
+
+    def due(self, coins: List[str], now: float) -> List[str]:
+        """이번 요청에 넣을 종목 (새 종목은 바로)"""
+        horizon = now + self.min_gap
+        return [c for c in coins if self._next.get(c, 0.0) <= horizon]
+
+    def mark(self, tickers: List[str], now: float):
+        """조회한 종목의 다음 기한 설정"""
+        intervals = self.intervals()
+        for ticker in tickers:
+            self._next[ticker] = now + intervals.get(ticker, self.default_interval)
+        self.requests += 1
+        self.polled += len(tickers)
+
+    def wait(self, coins: List[str], now: float) -> float:
+        """다음 요청까지 대기 시간 (초)"""
+        earliest = min((self._next.get(c, 0.0) for c in coins), default=now + self.default_interval)
+        return max(earliest - now, self.min_gap)
+
+
+class PriceFeed(threading.Thread):
+    """현재가 폴링 스레드 (스냅샷 목록을 sink(snapshots)로 전달 → engine.mailbox.put)"""
+
+    def __init__(self, sink: Callable[[List[Dict[str, Any]]], Any],
+                 interval: float = Config.PRICE_UPDATE_INTERVAL,
+                 intervals: Optional[Callable[[], Dict[str, float]]] = None):
+        """
+        Args:
+            interval: 기본 조회 주기 (초, 종목별 주기가 없을 때)
+            intervals: 종목별 적응형 조회 주기 (None이면 모든 종목 interval마다)
+        """
+        super().__init__(name='PriceFeed', daemon=True)
+        self.sink = sink
+        self.interval = interval
+        self.schedule = PollSchedule(interval, intervals)
+        self.coin_list: List[str] = []
+        self._stop_event = threading.Event()
+
+    def set_coins(self, coins: List[str]):
+        self.coin_list = list(coins)
+
+    def run(self):
+        while not self._stop_event.is_set():
+            coins = self.coin_list
+            wait = self.interval
+            if coins:
+                now = time.monotonic()
+                due = self.schedule.due(coins, now)
+                if due:
+                    try:
+                        snapshots = pyupbit.get_current_price(due, verbose=True)
+                        if snapshots:
+                            self.sink(snapshots if isinstance(snapshots, list) else [snapshots])
+                    except Exception as e:
+                        logger.warning(f"가격 조회 실패: {e}")
+                    self.schedule.mark(due, now)
+                wait = self.schedule.wait(coins, time.monotonic())
+            self._stop_event.wait(wait)
+
+    def stop(self):
+        self._stop_event.set()
@@ -0,0 +1,174 @@
+"""
+Upbit Features v1.0
+다중 시간프레임 피처 저장소 for Upbit Pro Algo-Trader
+
+MTF 추세 / 갭 / MA를 종목별 기준 봉 하나에서 계산
+- 기준 봉(FEATURE_BASE_INTERVAL, 1시간봉)만 실시간 캔들로 유지
+- 기준 봉의 배수 간격(4시간봉, 일봉)은 리샘플링으로 생성 - 간격별 별도 조회 없음
+- 추세 / 갭 / MA는 마감된 봉 기준으로 계산해 봉이 바뀔 때까지 재사용
+- 기준 봉으로 만들 수 없는 간격(1시간 미만 분봉)은 실시간 캔들의 해당 간격 사용
+"""
+
+import time
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+
+from upbit_config import Config
+from upbit_candles import INTERVAL_SECONDS, candle_start
+
+
+def resample(bars: np.ndarray, interval: str) -> np.ndarray:
+    """기준 봉 배열 → 상위 간격 봉 배열 (N×6: 시작 epoch, 시가, 고가, 저가, 종가, 거래량)
+
+    업비트 분봉/일봉은 모두 UTC 자정 기준으로 정렬되어 있어 시작 시각 나머지로 묶습니다.
+    첫 구간이 잘려 있으면 (기준 봉이 구간 중간부터 시작) 제외합니다.
+    """
+    if len(bars) == 0:
+        return bars
+    seconds = INTERVAL_SECONDS[interval]
+    keys = bars[:, 0] - bars[:, 0] % seconds
+    starts, first = np.unique(keys, return_index=True)
+    last = np.r_[first[1:], len(bars)] - 1
+    out = np.column_stack([
+        starts,
+        bars[first, 1],
+        np.maximum.reduceat(bars[:, 2], first),
+        np.minimum.reduceat(bars[:, 3], first),
+        bars[last, 4],
+        np.add.reduceat(bars[:, 5], first),
+    ])
+    if bars[0, 0] != starts[0]:
+        out = out[1:]
+    return out
+
+
+class FeatureStore:
+    """종목별 MTF 피처 (엔진 스레드 전용)"""
+
+    def __init__(self, candles,
+                 base_interval: str = Config.FEATURE_BASE_INTERVAL,
+                 base_bars: int = Config.FEATURE_BASE_BARS):
+        """
+        Args:
+            candles: CandleAggregator (기준 봉 공급)
+            base_interval: 기준 봉 간격
+            base_bars: 기준 봉 유지 개수 (일봉 추세 계산에 필요한 일수 이상)
+        """
+        self.candles = candles
+        self.base_interval = base_interval
+        self.base_bars = base_bars
+        # (ticker, interval, 피처 이름) → (계산 시점 봉 시작 epoch, 값)
+        self._features: Dict[Tuple[str, str, str], Tuple[float, Any]] = {}
+        self.computes = 0
+        self.hits = 0
+
+    # =========================================================================
+    # 봉 데이터
+    # =========================================================================
+    def bars(self, ticker: str, interval: str, count: int) -> Optional[np.ndarray]:
+        """interval 최근 count개 봉 배열 (진행 중인 봉 포함, 실패 시 None)"""
+        if self._derived(interval):
+            base = self.candles.array(ticker, self.base_interval, self.base_bars)
+            if base is None:
+                return None
+            return resample(base, interval)[-count:]
+        return self.candles.array(ticker, interval, count)
+
+    def source_interval(self, interval: str) -> str:
+        """interval 봉을 만드는 원본 간격 (리샘플링하면 기준 봉, 아니면 그대로)"""
+        return self.base_interval if self._derived(interval) else interval
+
+    def is_local(self, ticker: str, interval: str, count: int = 2) -> bool:
+        """bars(ticker, interval, count)를 REST 조회 없이 만들 수 있는지"""
+        if self._derived(interval):
+            return self.candles.has_bars(ticker, self.base_interval, self.base_bars)
+        return self.candles.has_bars(ticker, interval, count)
+
+    def _derived(self, interval: str) -> bool:
+        """기준 봉 리샘플링으로 만들 수 있는 간격인지"""
+        base = INTERVAL_SECONDS[self.base_interval]
+        seconds = INTERVAL_SECONDS.get(interval, 0)
+        return seconds > base and seconds % base == 0
+
+    # =========================================================================
+    # 피처 (마감된 봉 기준, 봉이 바뀔 때만 재계산)
+    # =========================================================================
+    def ma(self, ticker: str, interval: str, period: int = 5,
+           now: Optional[float] = None) -> Optional[float]:
+        """마감된 최근 period개 봉 종가 평균"""
+        return self._cached(ticker, interval, f'ma{period}', now,
+                            lambda start: self._compute_ma(ticker, interval, period, start))
+
+    def trend(self, ticker: str, interval: str, period: int = 5,
+              now: Optional[float] = None) -> str:
+        """추세 (UP/DOWN/SIDEWAYS) - 마감 봉 종가와 MA, MA 기울기"""
+        return self._cached(ticker, interval, f'trend{period}', now,
+                            lambda start: self._compute_trend(ticker, interval, period, start))
+
+    def gap_ratio(self, ticker: str, interval: str,
+                  now: Optional[float] = None) -> Optional[float]:
+        """시가갭 비율 (%) = (현재 봉 시가 - 직전 봉 종가) / 직전 봉 종가
+
+        현재 봉이 아직 없으면 (경계 이후 체결 없음) None - 캐시하지 않음
+        """
+        return self._cached(ticker, interval, 'gap', now,
+                            lambda start: self._compute_gap(ticker, interval, start))
+
+    def discard(self, ticker: str):
+        """종목 피처 삭제 (감시 종목 제외 시)"""
+        for key in [k for k in self._features if k[0] == ticker]:
+            del self._features[key]
+
+    def _cached(self, ticker: str, interval: str, name: str, now: Optional[float], compute):
+        start = candle_start(interval, time.time() if now is None else now)
+        key = (ticker, interval, name)
+        entry = self._features.get(key)
+        if entry is not None and entry[0] == start:
+            self.hits += 1
+            return entry[1]
+
+        value = compute(start)
+        self.computes += 1
+        if value is not None:
+            self._features[key] = (start, value)
+        return value
+
+    def _closed_closes(self, ticker: str, interval: str, count: int, start: float):
+        """현재 봉(start) 이전에 마감된 최근 count개 종가"""
+        bars = self.bars(ticker, interval, count + 1)
+        if bars is None:
+            return None
+        closed = bars[bars[:, 0] < start]
+        return closed[-count:, 4]
+
+    def _compute_ma(self, ticker, interval, period, start):
+        closes = self._closed_closes(ticker, interval, period, start)
+        if closes is None or len(closes) < period:
+            return None
+        return float(closes.mean())
+
+    def _compute_trend(self, ticker, interval, period, start):
+        closes = self._closed_closes(ticker, interval, period + 1, start)
+        if closes is None:
+            return None
+        if len(closes) < period + 1:
+            return 'SIDEWAYS'
+
+        current = closes[-1]
+        ma_current = closes[-period:].mean()
+        ma_prev = closes[:period].mean()
+        if current > ma_current and ma_current > ma_prev:
+            return 'UP'
+        elif current < ma_current and ma_current < ma_prev:
+            return 'DOWN'
+        return 'SIDEWAYS'
+
+    def _compute_gap(self, ticker, interval, start):
+        bars = self.bars(ticker, interval, 2)
+        if bars is None or len(bars) < 2 or bars[-1, 0] != start:
+            return None
+        prev_close = bars[-2, 4]
+        if prev_close <= 0:
+            return None
+        return float((bars[-1, 1] - prev_close) / prev_close * 100)
@@ -0,0 +1,249 @@
+"""
+Upbit History Model v1.0
+거래 내역 테이블 모델 for Upbit Pro Algo-Trader
+
+QAbstractTableModel 기반 거래 내역 뷰 모델
+- 셀마다 QTableWidgetItem을 만들지 않고 보이는 행만 data()로 표시
+- 페이지 단위 지연 로드 (canFetchMore / fetchMore)
+- 정렬/필터는 모델에서 처리 (SQLite 저장소는 SQL, 저널은 메모리)
+- 새 거래는 정렬 위치에 1행만 삽입 (전체 다시 그리기 없음)
+"""
+
+import datetime
+from typing import Dict, List, Optional
+
+from PyQt6.QtCore import Qt, QAbstractTableModel, QModelIndex, pyqtSignal
+from PyQt6.QtGui import QColor
+
+from upbit_trade_store import TradeStore
+
+
+# (헤더, 기록 키)
+HISTORY_COLUMNS = [
+    ("시간", 'timestamp'),
+    ("코인", 'ticker'),
+    ("구분", 'type'),
+    ("가격", 'price'),
+    ("금액", 'amount'),
+    ("손익", 'profit'),
+    ("사유", 'reason'),
+]
+
+NUMERIC_KEYS = ('price', 'amount', 'profit')
+
+COLOR_UP = QColor("#e63946")
+COLOR_DOWN = QColor("#4361ee")
+
+
+class TradeHistoryModel(QAbstractTableModel):
+    """거래 내역 테이블 모델 (지연 로드 + 정렬/필터)"""
+
+    count_changed = pyqtSignal(int)  # 필터 적용 후 전체 건수
+
+    PAGE_SIZE = 200
+
+    def __init__(self, trade_store, parent=None):
+        """
+        Args:
+            trade_store: TradeStore (SQL 조회) 또는 TradeJournal (메모리 조회)
+        """
+        super().__init__(parent)
+        self.trade_store = trade_store
+        self.is_sql = isinstance(trade_store, TradeStore)
+
+        self._sort_key_name = 'timestamp'
+        self._descending = True
+        self._ticker: Optional[str] = None
+        self._trade_type: Optional[str] = None
+
+        self._rows: List[Dict] = []     # 로드된 행 (정렬 순서)
+        self._total = 0                 # 필터 적용 후 전체 건수
+        self._records: List[Dict] = []  # 저널 모드 전체 기록
+        self._view: List[Dict] = []     # 저널 모드 정렬/필터 결과
+        self._next_id = 0
+
+        if not self.is_sql:
+            self._records = trade_store.load()
+            for record in self._records:
+                self._assign_id(record)
+
+        self.reload()
+
+    # =========================================================================
+    # QAbstractTableModel 인터페이스
+    # =========================================================================
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(HISTORY_COLUMNS)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
+            return HISTORY_COLUMNS[section][0]
+        return None
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        record = self._rows[index.row()]
+        key = HISTORY_COLUMNS[index.column()][1]
+
+        if role == Qt.ItemDataRole.DisplayRole:
+            return self._display(record, key)
+        if role == Qt.ItemDataRole.ForegroundRole:
+            if key == 'type':
+                return COLOR_UP if record.get('type') == 'BUY' else COLOR_DOWN
+            if key == 'profit':
+                profit = record.get('profit') or 0
+                if profit > 0:
+                    return COLOR_UP
+                if profit < 0:
+                    return COLOR_DOWN
+        return None
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and len(self._rows) < self._total
+
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid():
+            return
+        rows = self._query(len(self._rows), self.PAGE_SIZE)
+        if not rows:
+            self._total = len(self._rows)
+            return
+        start = len(self._rows)
+        self.beginInsertRows(QModelIndex(), start, start + len(rows) - 1)
+        self._rows.extend(rows)
+        self.endInsertRows()
+
+    def sort(self, column, order=Qt.SortOrder.AscendingOrder):
+        self._sort_key_name = HISTORY_COLUMNS[column][1]
+        self._descending = order == Qt.SortOrder.DescendingOrder
+        self.reload()
+
+    # =========================================================================
+    # 필터 / 갱신
+    # =========================================================================
+    def set_filter(self, ticker: Optional[str] = None, trade_type: Optional[str] = None):
+        """코인/구분 필터 (None = 전체)"""
+        self._ticker = ticker or None
+        self._trade_type = trade_type or None
+        self.reload()
+
+    def reload(self):
+        """정렬/필터 기준으로 처음부터 다시 로드 (첫 페이지만)"""
+        self.beginResetModel()
+        if self.is_sql:
+            self._total = self.trade_store.count(self._ticker, self._trade_type)
+        else:
+            self._view = sorted(
+                (r for r in self._records if self._matches(r)),
+                key=self._sort_key, reverse=self._descending
+            )
+            self._total = len(self._view)
+        self._rows = self._query(0, self.PAGE_SIZE)
+        self.endResetModel()
+        self.count_changed.emit(self._total)
+
+    def reset_records(self):
+        """저장소 내용이 바뀐 경우 (삭제 등) 전체 다시 읽기"""
+        if not self.is_sql:
+            self._records = self.trade_store.load()
+            self._next_id = 0
+            for record in self._records:
+                self._assign_id(record)
+        self.reload()
+
+    def add_record(self, record: Dict, rowid: Optional[int] = None):
+        """새 거래 1건 반영 - 정렬 위치가 로드된 범위 안이면 해당 위치에 삽입"""
+        record = dict(record)
+        if self.is_sql and rowid is not None:
+            record['id'] = rowid
+        else:
+            self._assign_id(record)
+
+        if not self.is_sql:
+            self._records.append(record)
+        if not self._matches(record):
+            return
+
+        key = self._sort_key(record)
+        if not self.is_sql:
+            self._view.insert(self._insert_position(self._view, key), record)
+
+        fully_loaded = len(self._rows) >= self._total
+        self._total += 1
+        pos = self._insert_position(self._rows, key)
+        if pos < len(self._rows) or fully_loaded:
+            self.beginInsertRows(QModelIndex(), pos, pos)
+            self._rows.insert(pos, record)
+            self.endInsertRows()
+        self.count_changed.emit(self._total)
+
+    def total_count(self) -> int:
+        """필터 적용 후 전체 건수"""
+        return self._total
+
+    def tickers(self) -> List[str]:
+        """기록된 코인 목록 (필터 콤보용)"""
+        if self.is_sql:
+            return self.trade_store.tickers()
+        return sorted({r.get('ticker', '') for r in self._records})
+
+    # =========================================================================
+    # 내부
+    # =========================================================================
+    def _query(self, offset: int, limit: int) -> List[Dict]:
+        if self.is_sql:
+            return self.trade_store.fetch(
+                offset, limit, order_by=self._sort_key_name, descending=self._descending,
+                ticker=self._ticker, trade_type=self._trade_type
+            )
+        return self._view[offset:offset + limit]
+
+    def _matches(self, record: Dict) -> bool:
+        if self._ticker and record.get('ticker') != self._ticker:
+            return False
+        if self._trade_type and record.get('type') != self._trade_type:
+            return False
+        return True
+
+    def _assign_id(self, record: Dict):
+        record['id'] = self._next_id
+        self._next_id += 1
+
+    def _sort_key(self, record: Dict) -> tuple:
+        """정렬 키 (동일 값은 기록 순서) - SQL의 ORDER BY col, id 와 동일"""
+        value = record.get(self._sort_key_name)
+        if self._sort_key_name in NUMERIC_KEYS:
+            value = float(value or 0)
+        else:
+            value = str(value or '')
+        return (value, record.get('id', 0))
+
+    def _insert_position(self, rows: List[Dict], key: tuple) -> int:
+        """정렬된 rows에서 key가 들어갈 위치 (이진 탐색)"""
+        lo, hi = 0, len(rows)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            mid_key = self._sort_key(rows[mid])
+            if (mid_key > key) if self._descending else (mid_key < key):
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    @staticmethod
+    def _display(record: Dict, key: str) -> str:
+        value = record.get(key)
+        if key == 'timestamp':
+            try:
+                return datetime.datetime.fromisoformat(str(value)).strftime("%m/%d %H:%M")
+            except ValueError:
+                return str(value or '')
+        if key in ('price', 'amount'):
+            return f"{value or 0:,.0f}"
+        if key == 'profit':
+            return f"{value:+,.0f}" if value else "-"
+        return str(value or '')
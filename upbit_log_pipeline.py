@@ -0,0 +1,109 @@
+"""
+Upbit Log Pipeline v1.0
+비동기 로그 파이프라인 for Upbit Pro Algo-Trader
+
+로그 폭주 시에도 매매 스레드가 멈추지 않도록
+- 파일 로그: QueueHandler → 백그라운드 QueueListener → RotatingFileHandler
+- 화면 로그: 고정 크기 링 버퍼에 쌓고 타이머로 묶어서 QPlainTextEdit에 반영
+  (줄 수 제한은 setMaximumBlockCount로 위젯이 처리)
+"""
+
+import queue
+import logging
+import logging.handlers
+from collections import deque
+from typing import List
+
+try:
+    from PyQt6.QtCore import QTimer
+    from PyQt6.QtWidgets import QPlainTextEdit
+except ImportError:  # 헤드리스 데몬: 파일 로그(setup_queue_logging)만 사용
+    QTimer = QPlainTextEdit = None
+
+
+def setup_queue_logging(logger: logging.Logger, log_file: str,
+                        max_bytes: int = 5 * 1024 * 1024, backup_count: int = 5,
+                        console: bool = True) -> logging.handlers.QueueListener:
+    """로거에 큐 핸들러 연결, 실제 파일 기록은 백그라운드 스레드에서 수행
+
+    Returns:
+        QueueListener (종료 시 stop() 호출로 남은 로그 기록)
+    """
+    log_queue = queue.SimpleQueue()
+
+    file_handler = logging.handlers.RotatingFileHandler(
+        log_file, maxBytes=max_bytes, backupCount=backup_count, encoding='utf-8'
+    )
+    file_handler.setLevel(logging.DEBUG)
+    file_handler.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(message)s'))
+    handlers = [file_handler]
+
+    if console:
+        console_handler = logging.StreamHandler()
+        console_handler.setLevel(logging.INFO)
+        console_handler.setFormatter(logging.Formatter('%(levelname)s - %(message)s'))
+        handlers.append(console_handler)
+
+    logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    listener.start()
+    return listener
+
+
+class LogRingBuffer:
+    """화면 로그용 고정 크기 링 버퍼 (어느 스레드에서나 append 가능)
+
+    deque.append / popleft는 원자적으로 동작하므로 별도 락이 없고,
+    반영 전에 maxlen을 넘으면 가장 오래된 줄부터 버려집니다.
+    """
+
+    def __init__(self, maxlen: int = 500):
+        self._lines = deque(maxlen=maxlen)
+
+    def append(self, line: str):
+        self._lines.append(line)
+
+    def drain(self) -> List[str]:
+        """쌓인 줄을 모두 꺼내기"""
+        lines = []
+        try:
+            while True:
+                lines.append(self._lines.popleft())
+        except IndexError:
+            pass
+        return lines
+
+    def __len__(self):
+        return len(self._lines)
+
+
+class LogPaneSink:
+    """링 버퍼 → QPlainTextEdit 주기적 일괄 반영"""
+
+    def __init__(self, widget: QPlainTextEdit, buffer: LogRingBuffer,
+                 max_lines: int = 500, interval_ms: int = 200):
+        self.widget = widget
+        self.buffer = buffer
+        self.widget.setMaximumBlockCount(max_lines)
+
+        self._timer = QTimer(widget)
+        self._timer.setInterval(interval_ms)
+        self._timer.timeout.connect(self.flush)
+        self._timer.start()
+
+    def flush(self):
+        """쌓인 로그를 한 번에 추가 (맨 아래를 보고 있을 때만 자동 스크롤)"""
+        lines = self.buffer.drain()
+        if not lines:
+            return
+
+        sb = self.widget.verticalScrollBar()
+        at_bottom = sb.value() >= sb.maximum() - 2
+        self.widget.appendPlainText('\n'.join(lines))
+        if at_bottom:
+            sb.setValue(sb.maximum())
+
+    def stop(self):
+        """타이머 중지 후 남은 로그 반영"""
+        self._timer.stop()
+        self.flush()
@@ -3,25 +3,39 @@ Upbit Notifiers v1.0
 다중 채널 알림 시스템 for Upbit Pro Algo-Trader
 
 Discord 웹훅, Email (SMTP), 텔레그램
+- 알림 전송은 NotificationDispatcher가 백그라운드 이벤트 루프에서 처리
+  (매매 경로에서는 큐에 넣기만 함, 프로세스 전체가 루프 하나를 공유)
+- 채널별 제한 큐, 재시도/백오프, 전송 간격 제한, 폭주 시 요약 메시지 병합
+- 텔레그램 클라이언트는 채팅방당 1개 (telegram_notifier.py도 공유)
+- 이메일은 SMTP 세션을 재사용 (NOOP 유지, 끊기면 다음 전송 때 재연결)
 """
 
 import json
+import html
+import time
+import asyncio
+import functools
 import threading
-import queue
 import smtplib
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
+from collections import deque
 from dataclasses import dataclass, field
 from typing import Optional, List, Dict, Callable
 from datetime import datetime
 from enum import Enum
 import logging
 
+from upbit_startup import lazy_import, module_available
+
 try:
-    import requests
+    requests = lazy_import('requests')
 except ImportError:
     requests = None
 
+# 텔레그램 봇 라이브러리 (옵션 - 없으면 HTTP API 직접 호출, 첫 전송 시 import)
+TELEGRAM_AVAILABLE = module_available('telegram')
+
 
 class EventType(Enum):
     """알림 이벤트 유형"""
@@ -49,9 +63,366 @@ class NotificationConfig:
     email_to: List[str] = field(default_factory=list)
 
 
+# 긴급 이벤트 - 병합 대기 없이 바로 전송
+URGENT_EVENTS = (EventType.EMERGENCY, EventType.ERROR, EventType.STOP_LOSS)
+
+
+@dataclass
+class Notification:
+    """전송 대기 알림 1건"""
+    event_type: EventType
+    message: str
+    data: Dict = field(default_factory=dict)
+    created: datetime = field(default_factory=datetime.now)
+
+    @property
+    def urgent(self) -> bool:
+        return self.event_type in URGENT_EVENTS
+
+    def line(self) -> str:
+        """요약 메시지용 한 줄 표현"""
+        return f"[{self.created.strftime('%H:%M:%S')}] {self.message}"
+
+
+def format_digest(batch: List[Notification], limit: int = 0) -> str:
+    """여러 알림을 요약 메시지 1건으로 병합 (limit: 최대 글자 수, 0 = 제한 없음)
+
+    길이를 넘으면 줄 경계에서 자르고 생략 건수 줄을 덧붙입니다
+    (HTML 모드에서 태그/엔티티가 중간에 잘리지 않도록).
+    """
+    lines = [n.line() for n in batch]
+    out = [f"📬 알림 요약 ({len(batch)}건)"] if len(batch) > 1 else []
+    text = "\n".join(out + lines)
+    if not limit or len(text) <= limit:
+        return text
+
+    reserve = len(f"… 외 {len(batch)}건 생략") + 1
+    size = sum(len(s) + 1 for s in out)
+    shown = 0
+    for line in lines:
+        if size + len(line) + 1 + reserve > limit:
+            break
+        out.append(line)
+        size += len(line) + 1
+        shown += 1
+    if shown == 0:
+        # 첫 알림 하나도 길면 그 알림의 앞쪽 줄만
+        for part in lines[0].split("\n"):
+            if size + len(part) + 1 + reserve > limit:
+                break
+            out.append(part)
+            size += len(part) + 1
+        out.append("… (이하 생략)" + (f" 외 {len(batch) - 1}건 생략" if len(batch) > 1 else ""))
+    else:
+        out.append(f"… 외 {len(batch) - shown}건 생략")
+    return "\n".join(out)
+
+
+@dataclass
+class ChannelPolicy:
+    """채널별 전송 정책"""
+    max_queue: int = 100            # 대기열 최대 건수 (초과 시 오래된 것부터 버림)
+    min_interval: float = 1.0       # 전송 간 최소 간격 (초)
+    coalesce_window: float = 2.0    # 첫 알림 후 추가 알림을 모으는 시간 (초)
+    max_batch: int = 20             # 요약 1건에 담을 최대 알림 수
+    max_retries: int = 3
+    backoff_base: float = 1.0       # 재시도 대기: base * 2^n (초)
+    backoff_max: float = 30.0
+
+
+class RateLimited(Exception):
+    """sender가 전송 한도 초과를 알릴 때 사용 (retry_after초 후 재시도)"""
+
+    def __init__(self, retry_after: float):
+        super().__init__(f"retry after {retry_after}s")
+        self.retry_after = retry_after
+
+
+class PartialDelivery(Exception):
+    """sender가 일부만 보냈을 때 사용 (sent건은 전송 완료, remaining만 재시도)"""
+
+    def __init__(self, sent: int, remaining: List['Notification']):
+        super().__init__(f"sent {sent}, {len(remaining)} remaining")
+        self.sent = sent
+        self.remaining = remaining
+
+
+class _ChannelState:
+    """디스패처 내부 채널 상태"""
+
+    def __init__(self, name: str, sender: Callable, policy: ChannelPolicy):
+        self.name = name
+        self.sender = sender
+        self.policy = policy
+        self.items: deque = deque()
+        self.dropped = 0
+        self.sent = 0
+        self.failed = 0
+        self.wakeup: Optional[asyncio.Event] = None
+        self.halt: Optional[asyncio.Event] = None  # 설정되면 대기 없이 남은 알림 전송 후 종료
+        self.task: Optional[asyncio.Task] = None
+        self.next_allowed = 0.0
+
+
+class NotificationDispatcher:
+    """비동기 알림 디스패처
+
+    백그라운드 스레드 하나에서 asyncio 이벤트 루프를 돌리고,
+    채널마다 소비 코루틴이 대기열을 비웁니다.
+    submit()은 deque에 추가하고 루프를 깨우기만 하므로 블로킹이 없습니다.
+    sender는 List[Notification]을 받아 성공 여부를 반환하며,
+    일반 함수는 실행기 스레드에서, 코루틴 함수는 루프에서 직접 실행됩니다.
+    """
+
+    def __init__(self):
+        self._channels: Dict[str, _ChannelState] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._stopping = False
+        self._stop_event: Optional[asyncio.Event] = None
+
+    # =========================================================================
+    # 설정 / 수명
+    # =========================================================================
+    def register(self, name: str, sender: Callable, policy: ChannelPolicy = None):
+        """채널 등록 (같은 이름이면 교체)"""
+        state = _ChannelState(name, sender, policy or ChannelPolicy())
+        self.start()
+        with self._lock:
+            old = self._channels.get(name)
+            if old:
+                state.items = old.items
+            self._channels[name] = state
+        self._loop.call_soon_threadsafe(self._start_consumer, state, old)
+
+    def unregister(self, name: str, timeout: float = 5.0):
+        """채널 제거 - 남은 알림은 병합 대기 없이 전송 시도 후 소비 코루틴 종료
+
+        다른 채널과 이벤트 루프는 그대로 둡니다.
+        """
+        with self._lock:
+            state = self._channels.pop(name, None)
+            running = self._thread is not None and self._thread.is_alive()
+        if state is None or not running or state.task is None:
+            return
+
+        async def _close():
+            state.halt.set()
+            state.wakeup.set()
+            done, _ = await asyncio.wait([state.task], timeout=timeout)
+            if not done:
+                state.task.cancel()
+
+        try:
+            asyncio.run_coroutine_threadsafe(_close(), self._loop).result(timeout + 1)
+        except Exception as e:
+            logging.warning(f"알림 채널 종료 중 오류 ({name}): {e}")
+
+    def start(self):
+        """이벤트 루프 스레드 시작 (이미 실행 중이면 무시)
+
+        stop() 후 다시 시작하면 등록되어 있던 채널의 소비 코루틴을 새 루프에서 다시 만듭니다.
+        """
+        with self._lock:
+            if self._thread and self._thread.is_alive():
+                return
+            self._stopping = False
+            self._stop_event = asyncio.Event()
+            self._loop = asyncio.new_event_loop()
+            self._thread = threading.Thread(
+                target=self._run_loop, name='NotificationDispatcher', daemon=True
+            )
+            self._thread.start()
+            for state in self._channels.values():
+                self._loop.call_soon_threadsafe(self._start_consumer, state, None)
+
+    def _run_loop(self):
+        loop = self._loop
+        asyncio.set_event_loop(loop)
+        loop.run_forever()
+        loop.close()
+
+    def _start_consumer(self, state: _ChannelState, old: Optional[_ChannelState]):
+        if old and old.task:
+            old.task.cancel()
+        state.wakeup = asyncio.Event()
+        state.halt = asyncio.Event()
+        state.task = self._loop.create_task(self._consume(state))
+        if state.items:
+            state.wakeup.set()
+
+    def stop(self, timeout: float = 5.0):
+        """남은 알림을 병합 대기 없이 전송 시도 후 종료"""
+        with self._lock:
+            if not self._thread or not self._thread.is_alive():
+                return
+            self._stopping = True
+            channels = list(self._channels.values())
+
+        async def _drain():
+            self._stop_event.set()  # 병합/간격/백오프 대기 즉시 해제
+            for state in channels:
+                if state.wakeup:
+                    state.halt.set()
+                    state.wakeup.set()
+            tasks = [s.task for s in channels if s.task]
+            if tasks:
+                await asyncio.wait(tasks, timeout=timeout)
+
+        try:
+            asyncio.run_coroutine_threadsafe(_drain(), self._loop).result(timeout + 1)
+        except Exception as e:
+            logging.warning(f"알림 디스패처 종료 중 오류: {e}")
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(timeout=1)
+
+    # =========================================================================
+    # 전송
+    # =========================================================================
+    def submit(self, name: str, notification: Notification) -> bool:
+        """알림 대기열 추가 (블로킹 없음) - 등록되지 않은 채널이면 False"""
+        state = self._channels.get(name)
+        if state is None or self._stopping:
+            return False
+
+        if len(state.items) >= state.policy.max_queue:
+            state.items.popleft()
+            state.dropped += 1
+        state.items.append(notification)
+
+        if state.wakeup is not None:
+            # 새 루프의 소비 코루틴이 아직 만들어지기 전이면 만들 때 대기열을 확인
+            self._loop.call_soon_threadsafe(state.wakeup.set)
+        return True
+
+    def call_periodic(self, interval: float, func: Callable):
+        """interval초마다 func를 실행기 스레드에서 실행 (종료 시 중단)
+
+        Returns:
+            concurrent.futures.Future (cancel()로 중단)
+        """
+        self.start()
+
+        async def _periodic():
+            loop = asyncio.get_running_loop()
+            while not self._stop_event.is_set():
+                await self._sleep(interval)
+                if self._stop_event.is_set():
+                    return
+                try:
+                    await loop.run_in_executor(None, func)
+                except Exception as e:
+                    logging.warning(f"주기 작업 오류: {e}")
+
+        return asyncio.run_coroutine_threadsafe(_periodic(), self._loop)
+
+    def stats(self) -> Dict[str, Dict]:
+        """채널별 전송 통계"""
+        return {
+            name: {'queued': len(s.items), 'sent': s.sent,
+                   'failed': s.failed, 'dropped': s.dropped}
+            for name, s in self._channels.items()
+        }
+
+    async def _consume(self, state: _ChannelState):
+        """채널 소비 루프 - 병합 대기 → 전송 간격 → 배치 전송"""
+        policy = state.policy
+        loop = asyncio.get_running_loop()
+
+        while True:
+            await state.wakeup.wait()
+            state.wakeup.clear()
+
+            while state.items:
+                if not any(n.urgent for n in state.items):
+                    await self._sleep(policy.coalesce_window, state.halt)
+                await self._sleep(state.next_allowed - loop.time(), state.halt)
+
+                batch = []
+                while state.items and len(batch) < policy.max_batch:
+                    batch.append(state.items.popleft())
+                if state.dropped:
+                    batch.append(Notification(
+                        EventType.WARNING, f"⚠️ 알림 대기열 초과로 {state.dropped}건 생략"
+                    ))
+                    state.dropped = 0
+
+                await self._deliver(state, batch)
+                state.next_allowed = loop.time() + policy.min_interval
+
+            if state.halt.is_set():
+                return
+
+    async def _deliver(self, state: _ChannelState, batch: List[Notification]):
+        """재시도/백오프 포함 전송"""
+        policy = state.policy
+        loop = asyncio.get_running_loop()
+
+        for attempt in range(policy.max_retries + 1):
+            delay = min(policy.backoff_base * (2 ** attempt), policy.backoff_max)
+            try:
+                if asyncio.iscoroutinefunction(state.sender):
+                    ok = await state.sender(batch)
+                else:
+                    ok = await loop.run_in_executor(None, state.sender, batch)
+                if ok:
+                    state.sent += len(batch)
+                    return
+            except RateLimited as e:
+                delay = e.retry_after
+                logging.warning(f"[{state.name}] 전송 한도 초과 - {delay:g}초 후 재시도")
+            except PartialDelivery as e:
+                state.sent += e.sent
+                batch = e.remaining
+                logging.warning(f"[{state.name}] 알림 {e.sent}건만 전송 - 나머지 {len(batch)}건 재시도")
+            except Exception as e:
+                logging.warning(f"[{state.name}] 알림 전송 오류: {e}")
+
+            if attempt < policy.max_retries and not state.halt.is_set():
+                await self._sleep(delay, state.halt)
+
+        state.failed += len(batch)
+        logging.warning(f"[{state.name}] 알림 {len(batch)}건 전송 실패 (재시도 {policy.max_retries}회)")
+
+    async def _sleep(self, seconds: float, halt: Optional[asyncio.Event] = None):
+        """대기 (종료 요청 시 즉시 반환 - halt: 채널 종료 이벤트, 기본은 디스패처 종료)"""
+        halt = halt or self._stop_event
+        if seconds <= 0 or halt.is_set():
+            return
+        try:
+            await asyncio.wait_for(halt.wait(), seconds)
+        except asyncio.TimeoutError:
+            pass
+
+
+# 프로세스 공용 디스패처 (이벤트 루프 스레드 1개)
+_dispatcher_instance: Optional[NotificationDispatcher] = None
+_dispatcher_lock = threading.Lock()
+
+
+def get_notification_dispatcher() -> NotificationDispatcher:
+    """공용 알림 디스패처 싱글톤 반환"""
+    global _dispatcher_instance
+    with _dispatcher_lock:
+        if _dispatcher_instance is None:
+            _dispatcher_instance = NotificationDispatcher()
+        return _dispatcher_instance
+
+
+def shutdown_notifications(timeout: float = 5.0):
+    """프로세스 종료 시 공용 디스패처 정리 (모든 채널의 남은 알림 전송 시도)"""
+    with _dispatcher_lock:
+        dispatcher = _dispatcher_instance
+    if dispatcher is not None:
+        dispatcher.stop(timeout)
+
+
 class DiscordNotifier:
     """Discord 웹훅 알림"""
     
+    MAX_CONTENT = 2000  # Discord 메시지 최대 길이
+    
     def __init__(self, webhook_url: str):
         self.webhook_url = webhook_url
         self.enabled = bool(webhook_url)
@@ -99,117 +470,307 @@ class DiscordNotifier:
             })
         
         return self.send("", embed)
+    
+    def send_batch(self, batch: List[Notification]) -> bool:
+        """디스패처용 - 1건이면 기존 형식(거래 알림은 embed), 여러 건이면 요약 1건"""
+        if len(batch) == 1:
+            data = batch[0].data
+            if 'ticker' in data and 'price' in data:
+                return self.send_trade_alert(
+                    batch[0].event_type, data['ticker'], data['price'], data.get('pnl', 0)
+                )
+        return self.send(format_digest(batch, limit=self.MAX_CONTENT))
 
 
 class TelegramNotifier:
-    """텔레그램 봇 알림"""
+    """텔레그램 봇 알림 (공용 디스패처의 채널, 채팅방당 1개 - get_telegram_client 사용)
+
+    - python-telegram-bot이 있으면 이벤트 루프에서 비동기로 직접 전송
+    - 없으면 HTTP API를 실행기 스레드에서 호출
+    - 채팅방당 초당 1건 제한, 그 사이에 쌓인 알림은 1건으로 묶어 전송
+    - 메시지는 HTML 모드 (일반 텍스트는 이스케이프)
+    """
     
-    def __init__(self, bot_token: str, chat_id: str):
+    MAX_TEXT = 4096  # 텔레그램 메시지 최대 길이
+    POLICY = ChannelPolicy(max_queue=200, min_interval=1.0, coalesce_window=1.0, max_batch=30)
+    
+    def __init__(self, bot_token: str, chat_id: str,
+                 dispatcher: NotificationDispatcher = None):
         self.bot_token = bot_token
         self.chat_id = chat_id
         self.enabled = bool(bot_token and chat_id)
-        self._queue = queue.Queue()
-        self._stop = False
+        self.dispatcher = dispatcher or get_notification_dispatcher()
+        self.channel = f"telegram:{chat_id}"
+        self._bot = None  # 루프 안에서 처음 전송할 때 생성
         
         if self.enabled:
-            self._thread = threading.Thread(target=self._worker, daemon=True)
-            self._thread.start()
+            self.dispatcher.register(self.channel, self._send_batch, self.POLICY)
     
-    def _worker(self):
-        while not self._stop:
-            try:
-                text = self._queue.get(timeout=1)
-                if text is None:
-                    break
-                
-                if requests:
-                    url = f"https://api.telegram.org/bot{self.bot_token}/sendMessage"
-                    requests.post(url, data={
-                        'chat_id': self.chat_id,
-                        'text': text,
-                        'parse_mode': 'Markdown'
-                    }, timeout=5)
-            except queue.Empty:
-                continue
-            except Exception as e:
-                logging.warning(f"텔레그램 전송 실패: {e}")
+    def send(self, message: str, event_type: EventType = EventType.INFO,
+             html_text: bool = False) -> bool:
+        """대기열에 추가 (블로킹 없음) - html_text=False면 HTML 이스케이프"""
+        if not self.enabled:
+            return False
+        text = message if html_text else html.escape(message)
+        return self.dispatcher.submit(self.channel, Notification(event_type, text))
     
-    def send(self, message: str):
-        if self.enabled:
-            self._queue.put(message)
+    async def _send_batch(self, batch: List[Notification]) -> bool:
+        text = format_digest(batch, limit=self.MAX_TEXT)
+        
+        if TELEGRAM_AVAILABLE:
+            from telegram import Bot
+            from telegram.error import RetryAfter
+            if self._bot is None:
+                self._bot = Bot(token=self.bot_token)
+            try:
+                await self._bot.send_message(chat_id=self.chat_id, text=text, parse_mode='HTML')
+                return True
+            except RetryAfter as e:
+                retry_after = e.retry_after
+                if hasattr(retry_after, 'total_seconds'):
+                    retry_after = retry_after.total_seconds()
+                raise RateLimited(float(retry_after))
+        
+        if requests:
+            url = f"https://api.telegram.org/bot{self.bot_token}/sendMessage"
+            post = functools.partial(requests.post, url, data={
+                'chat_id': self.chat_id,
+                'text': text,
+                'parse_mode': 'HTML'
+            }, timeout=5)
+            response = await asyncio.get_running_loop().run_in_executor(None, post)
+            if response.status_code == 429:
+                retry_after = response.json().get('parameters', {}).get('retry_after', 1)
+                raise RateLimited(float(retry_after))
+            return response.ok
+        
+        return False
     
     def stop(self):
-        self._stop = True
-        self._queue.put(None)
+        """공용 디스패처를 사용하므로 별도 종료 작업 없음"""
+        pass
+
+
+# 텔레그램 클라이언트 (봇 토큰, 채팅방) 별 1개
+_telegram_clients: Dict[tuple, TelegramNotifier] = {}
+_telegram_lock = threading.Lock()
+
+
+def get_telegram_client(bot_token: str, chat_id: str) -> TelegramNotifier:
+    """공유 텔레그램 클라이언트 반환 (같은 채팅방이면 같은 인스턴스)"""
+    key = (bot_token, str(chat_id))
+    with _telegram_lock:
+        client = _telegram_clients.get(key)
+        if client is None:
+            client = _telegram_clients[key] = TelegramNotifier(bot_token, chat_id)
+        return client
 
 
 class EmailNotifier:
-    """이메일 알림"""
+    """이메일 알림 (SMTP 세션 재사용)
+
+    - 연결/STARTTLS/로그인은 처음 보낼 때 한 번만 (지연 연결)
+    - 대기 중인 메일은 같은 세션으로 연달아 전송
+    - keepalive()가 NOOP으로 세션을 유지하고, idle_timeout 동안 안 쓰면 종료
+    - 끊긴 세션은 다음 전송 때 다시 연결
+    """
+    
+    KEEPALIVE_INTERVAL = 60   # NOOP 주기 (초)
+    IDLE_TIMEOUT = 600        # 이 시간 동안 전송이 없으면 세션 종료 (초)
     
     def __init__(self, smtp_server: str, smtp_port: int, 
-                 username: str, password: str, to_emails: List[str]):
+                 username: str, password: str, to_emails: List[str],
+                 use_tls: bool = True, timeout: float = 10,
+                 idle_timeout: float = None):
         self.smtp_server = smtp_server
         self.smtp_port = smtp_port
         self.username = username
         self.password = password
         self.to_emails = to_emails
+        self.use_tls = use_tls
+        self.timeout = timeout
+        self.idle_timeout = self.IDLE_TIMEOUT if idle_timeout is None else idle_timeout
         self.enabled = bool(smtp_server and username and password and to_emails)
+        
+        self._server: Optional[smtplib.SMTP] = None
+        self._last_used = 0.0
+        self._lock = threading.Lock()
+        self.connect_count = 0  # 실제 연결(핸드셰이크) 횟수
     
-    def send(self, subject: str, body: str, html: bool = False) -> bool:
+    # =========================================================================
+    # 세션 관리
+    # =========================================================================
+    def _session(self) -> smtplib.SMTP:
+        """현재 세션 반환 (없으면 연결)"""
+        if self._server is None:
+            server = smtplib.SMTP(self.smtp_server, self.smtp_port, timeout=self.timeout)
+            try:
+                if self.use_tls:
+                    server.starttls()
+                server.login(self.username, self.password)
+            except Exception:
+                server.close()
+                raise
+            self._server = server
+            self.connect_count += 1
+        return self._server
+    
+    def _close_session(self):
+        if self._server is None:
+            return
+        try:
+            self._server.quit()
+        except (smtplib.SMTPException, OSError):
+            self._server.close()
+        self._server = None
+    
+    def keepalive(self):
+        """NOOP으로 세션 유지 (오래 쓰지 않았거나 응답이 없으면 종료)"""
+        with self._lock:
+            if self._server is None:
+                return
+            if time.monotonic() - self._last_used >= self.idle_timeout:
+                self._close_session()
+                return
+            try:
+                if self._server.noop()[0] != 250:
+                    self._close_session()
+            except (smtplib.SMTPException, OSError):
+                self._server.close()
+                self._server = None
+    
+    def close(self):
+        """세션 종료"""
+        with self._lock:
+            self._close_session()
+    
+    # =========================================================================
+    # 전송
+    # =========================================================================
+    def _build_message(self, subject: str, body: str, html: bool = False) -> MIMEMultipart:
+        msg = MIMEMultipart('alternative')
+        msg['Subject'] = subject
+        msg['From'] = self.username
+        msg['To'] = ', '.join(self.to_emails)
+        
+        content_type = 'html' if html else 'plain'
+        msg.attach(MIMEText(body, content_type, 'utf-8'))
+        return msg
+    
+    def send_messages(self, messages: List[tuple]) -> int:
+        """(subject, body[, html]) 목록을 한 세션으로 전송 - 보낸 건수 반환
+
+        세션이 끊겨 있으면 한 번 다시 연결해 이어서 보냅니다.
+        """
         if not self.enabled:
-            return False
+            return 0
         
-        try:
-            msg = MIMEMultipart('alternative')
-            msg['Subject'] = subject
-            msg['From'] = self.username
-            msg['To'] = ', '.join(self.to_emails)
-            
-            content_type = 'html' if html else 'plain'
-            msg.attach(MIMEText(body, content_type, 'utf-8'))
-            
-            with smtplib.SMTP(self.smtp_server, self.smtp_port) as server:
-                server.starttls()
-                server.login(self.username, self.password)
-                server.send_message(msg)
-            
+        sent = 0
+        with self._lock:
+            for message in messages:
+                msg = self._build_message(*message)
+                for attempt in range(2):
+                    try:
+                        self._session().send_message(msg)
+                        sent += 1
+                        break
+                    except (smtplib.SMTPServerDisconnected, smtplib.SMTPConnectError, OSError) as e:
+                        if self._server is not None:
+                            self._server.close()
+                            self._server = None
+                        if attempt:
+                            logging.warning(f"이메일 전송 실패 (연결): {e}")
+                            return sent
+                    except smtplib.SMTPException as e:
+                        logging.warning(f"이메일 전송 실패: {e}")
+                        self._close_session()
+                        return sent
+            self._last_used = time.monotonic()
+        return sent
+    
+    def send(self, subject: str, body: str, html: bool = False) -> bool:
+        return self.send_messages([(subject, body, html)]) == 1
+    
+    def send_batch(self, batch: List[Notification]) -> bool:
+        """디스패처용 - 긴급 알림은 각각, 나머지는 요약 1통으로 한 세션에서 전송"""
+        urgent = [n for n in batch if n.event_type == EventType.EMERGENCY]
+        others = [n for n in batch if n.event_type != EventType.EMERGENCY]
+        
+        messages = [(f"[Upbit Trader] {n.event_type.value.upper()}", n.line()) for n in urgent]
+        if others:
+            top = max(others, key=lambda n: n.urgent).event_type
+            subject = f"[Upbit Trader] {top.value.upper()}"
+            if len(others) > 1:
+                subject += f" 외 {len(others) - 1}건"
+            messages.append((subject, format_digest(others)))
+        
+        sent = self.send_messages(messages)
+        if sent == len(messages):
             return True
-        except Exception as e:
-            logging.warning(f"이메일 전송 실패: {e}")
+        if sent == 0:
             return False
+        # 메시지는 긴급 알림 순서대로 보내므로 앞의 sent건은 긴급 알림 (요약은 마지막)
+        raise PartialDelivery(sent, urgent[sent:] + others)
 
 
 class UpbitNotificationManager:
-    """통합 알림 관리자"""
+    """통합 알림 관리자 (전송은 NotificationDispatcher가 비동기로 처리)"""
+    
+    # 채널별 기본 정책 (Discord 웹훅: 분당 30건 제한)
+    DISCORD_POLICY = ChannelPolicy(min_interval=2.0, coalesce_window=2.0)
+    EMAIL_POLICY = ChannelPolicy(max_queue=200, min_interval=30.0, coalesce_window=10.0, max_batch=100)
+    
+    # 이메일은 중요 이벤트만
+    EMAIL_EVENTS = (EventType.EMERGENCY, EventType.ERROR)
     
     def __init__(self):
         self.discord: Optional[DiscordNotifier] = None
         self.telegram: Optional[TelegramNotifier] = None
         self.email: Optional[EmailNotifier] = None
         self.event_filters: Dict[str, List[EventType]] = {}
+        self.dispatcher = get_notification_dispatcher()
+        self._email_keepalive = None
     
     def configure_discord(self, webhook_url: str, 
-                         events: List[EventType] = None):
+                         events: List[EventType] = None,
+                         policy: ChannelPolicy = None):
         """Discord 설정"""
         self.discord = DiscordNotifier(webhook_url)
         if events:
             self.event_filters['discord'] = events
+        if self.discord.enabled:
+            self.dispatcher.register('discord', self.discord.send_batch,
+                                     policy or self.DISCORD_POLICY)
     
     def configure_telegram(self, bot_token: str, chat_id: str,
                           events: List[EventType] = None):
         """텔레그램 설정"""
-        self.telegram = TelegramNotifier(bot_token, chat_id)
+        self.telegram = get_telegram_client(bot_token, chat_id)
         if events:
             self.event_filters['telegram'] = events
     
     def configure_email(self, smtp_server: str, smtp_port: int,
                        username: str, password: str, to_emails: List[str],
-                       events: List[EventType] = None):
+                       events: List[EventType] = None,
+                       policy: ChannelPolicy = None,
+                       use_tls: bool = True):
         """이메일 설정"""
+        if self.email:
+            self.email.close()
+        if self._email_keepalive:
+            self._email_keepalive.cancel()
+            self._email_keepalive = None
+        
         self.email = EmailNotifier(smtp_server, smtp_port, 
-                                   username, password, to_emails)
+                                   username, password, to_emails, use_tls=use_tls)
         if events:
             self.event_filters['email'] = events
+        if self.email.enabled:
+            self.dispatcher.register('email', self.email.send_batch,
+                                     policy or self.EMAIL_POLICY)
+            self._email_keepalive = self.dispatcher.call_periodic(
+                EmailNotifier.KEEPALIVE_INTERVAL, self.email.keepalive
+            )
     
     def _should_notify(self, channel: str, event_type: EventType) -> bool:
         if channel not in self.event_filters:
@@ -217,31 +778,21 @@ class UpbitNotificationManager:
         return event_type in self.event_filters[channel]
     
     def notify(self, event_type: EventType, message: str, **kwargs):
-        """모든 채널로 알림 전송"""
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        full_message = f"[{timestamp}] {message}"
+        """모든 채널 대기열에 알림 추가 (네트워크 I/O 없음)"""
+        notification = Notification(event_type, message, kwargs)
         
         # Discord
         if self.discord and self._should_notify('discord', event_type):
-            if 'ticker' in kwargs and 'price' in kwargs:
-                self.discord.send_trade_alert(
-                    event_type, kwargs['ticker'], 
-                    kwargs['price'], kwargs.get('pnl', 0)
-                )
-            else:
-                self.discord.send(full_message)
+            self.dispatcher.submit('discord', notification)
         
         # 텔레그램
         if self.telegram and self._should_notify('telegram', event_type):
-            self.telegram.send(full_message)
+            self.telegram.send(message, event_type)
         
         # 이메일 (중요 이벤트만)
         if self.email and self._should_notify('email', event_type):
-            if event_type in [EventType.EMERGENCY, EventType.ERROR]:
-                self.email.send(
-                    f"[Upbit Trader] {event_type.value.upper()}",
-                    full_message
-                )
+            if event_type in self.EMAIL_EVENTS:
+                self.dispatcher.submit('email', notification)
     
     def notify_buy(self, ticker: str, price: float, quantity: float):
         """매수 알림"""
@@ -265,6 +816,17 @@ class UpbitNotificationManager:
         self.notify(EventType.EMERGENCY, f"🚨 긴급: {message}")
     
     def stop(self):
-        """알림 시스템 종료"""
-        if self.telegram:
-            self.telegram.stop()
+        """이 관리자의 채널 종료 (대기 중인 알림 전송 시도)
+
+        공용 디스패처와 공유 텔레그램 클라이언트는 다른 사용처(telegram_notifier 등)가
+        쓰므로 그대로 둡니다. 프로세스 종료 시에는 shutdown_notifications()를 호출합니다.
+        """
+        if self._email_keepalive:
+            self._email_keepalive.cancel()
+            self._email_keepalive = None
+        if self.discord and self.discord.enabled:
+            self.dispatcher.unregister('discord')
+        if self.email:
+            if self.email.enabled:
+                self.dispatcher.unregister('email')
+            self.email.close()
@@ -0,0 +1,90 @@
+"""
+Upbit Orders v1.0
+주문 실행기 for Upbit Pro Algo-Trader
+
+주문 API 호출을 엔진 스레드 밖에서 우선순위 순서로 실행
+- 청산 레인(손절/트레일링 스톱/분할 익절)이 진입 레인보다 항상 먼저
+- 엔진 스레드는 submit 후 바로 반환 - 느린 주문 응답이 다음 가격 처리를 막지 않음
+- 결과 콜백은 post로 엔진 스레드에서 실행 (post가 없으면 호출 스레드에서 즉시 실행)
+"""
+
+import time
+import heapq
+import logging
+import itertools
+import threading
+from typing import Any, Callable, List, Optional, Tuple
+
+
+logger = logging.getLogger('UpbitTrader')
+
+PRIORITY_EXIT = 0   # 청산 (손절 / 트레일링 스톱 / 분할 익절)
+PRIORITY_ENTRY = 1  # 진입 (매수)
+
+
+class OrderExecutor:
+    """우선순위 큐 + 주문 전용 스레드 1개 (업비트 주문 API는 순서대로 호출)"""
+
+    def __init__(self, post: Optional[Callable[[Callable[[], Any]], Any]] = None):
+        """
+        Args:
+            post: 결과 콜백을 엔진 스레드로 넘기는 함수 (None이면 submit이 동기 실행)
+        """
+        self.post = post
+        self._cond = threading.Condition()
+        self._queue: List[Tuple[int, int, float, Callable, Callable, Optional[Callable]]] = []
+        self._seq = itertools.count()
+        self._thread: Optional[threading.Thread] = None
+        self.submitted = 0
+        self.completed = 0
+        self.max_wait = 0.0  # 큐 대기 최대 시간 (초)
+
+    def submit(self, priority: int, call: Callable[[], Any],
+               on_done: Callable[[Any], Any],
+               on_error: Optional[Callable[[Exception], Any]] = None):
+        """주문 요청 등록 (priority가 작을수록 먼저, 같은 우선순위는 등록 순)
+
+        Args:
+            call: 주문 API 호출 (주문 스레드에서 실행)
+            on_done: call 결과 처리 (엔진 스레드)
+            on_error: call 예외 처리 (엔진 스레드, None이면 로그만)
+        """
+        self.submitted += 1
+        if self.post is None:
+            self._execute(call, on_done, on_error, lambda f: f())
+            return
+
+        with self._cond:
+            heapq.heappush(self._queue, (priority, next(self._seq), time.monotonic(),
+                                         call, on_done, on_error))
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="OrderExecutor", daemon=True)
+                self._thread.start()
+            self._cond.notify()
+
+    def pending(self) -> int:
+        """대기 중인 주문 요청 수"""
+        with self._cond:
+            return len(self._queue)
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._queue:
+                    self._cond.wait()
+                _, _, queued_at, call, on_done, on_error = heapq.heappop(self._queue)
+            self.max_wait = max(self.max_wait, time.monotonic() - queued_at)
+            self._execute(call, on_done, on_error, self.post)
+
+    def _execute(self, call, on_done, on_error, post):
+        try:
+            result = call()
+        except Exception as e:
+            if on_error is not None:
+                post(lambda error=e: on_error(error))
+            else:
+                logger.error(f"주문 실행 실패: {e}")
+        else:
+            post(lambda: on_done(result))
+        finally:
+            self.completed += 1
@@ -0,0 +1,195 @@
+"""
+Upbit Positions v1.0
+포지션 상태 배열 for Upbit Pro Algo-Trader
+
+감시 종목의 포지션 상태를 종목 슬롯별 NumPy 배열(struct of arrays)로 보관
+- PositionBook: 수량 / 매수가 / 투자금 / 매수 후 최고가 / 최고 수익률 / 분할 익절 레벨
+- evaluate: 보유 종목 가격 벡터 하나로 손절 / 분할 익절 / 트레일링 스톱 일괄 판정
+- PositionView: 기존 종목 정보 dict 인터페이스 유지 (포지션 키는 배열 슬롯을 읽고 씀)
+"""
+
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from upbit_config import Config
+
+
+# 배열에 보관하는 종목 정보 키
+POSITION_FIELDS = ('qty', 'buy_price', 'invest_amt', 'high_since_buy', 'max_profit_rate', 'current')
+
+# evaluate 판정 결과
+EXIT_NONE = 0
+EXIT_STOP_LOSS = 1
+EXIT_PARTIAL = 2
+EXIT_TRAILING = 3
+
+MIN_ORDER_KRW = 5000  # 업비트 최소 주문금액
+
+
+class PositionBook:
+    """종목 슬롯별 포지션 배열 (엔진 스레드 전용)"""
+
+    def __init__(self, capacity: int = 32,
+                 levels: Sequence[Dict] = Config.PARTIAL_TAKE_PROFIT):
+        """
+        Args:
+            capacity: 초기 슬롯 수 (부족하면 두 배씩 확장)
+            levels: 분할 익절 레벨 [{'rate': 수익률%, 'sell_ratio': 매도 비율%}, ...]
+        """
+        self.levels = list(levels)
+        self.level_rates = np.array([lv['rate'] for lv in self.levels], dtype=float)
+        self.level_ratios = np.array([lv['sell_ratio'] for lv in self.levels], dtype=float)
+        self.slots: Dict[str, int] = {}
+        self.tickers: List[Optional[str]] = [None] * capacity
+        self._free: List[int] = list(range(capacity - 1, -1, -1))
+        for name in POSITION_FIELDS:
+            setattr(self, name, np.zeros(capacity))
+        self.partial_done = np.zeros((capacity, len(self.levels)), dtype=bool)
+
+    # =========================================================================
+    # 슬롯 관리
+    # =========================================================================
+    def add(self, ticker: str) -> int:
+        """종목 슬롯 할당 (이미 있으면 기존 슬롯)"""
+        slot = self.slots.get(ticker)
+        if slot is not None:
+            return slot
+        if not self._free:
+            self._grow()
+        slot = self._free.pop()
+        self.slots[ticker] = slot
+        self.tickers[slot] = ticker
+        self._clear(slot)
+        return slot
+
+    def release(self, ticker: str):
+        """종목 슬롯 반환"""
+        slot = self.slots.pop(ticker, None)
+        if slot is not None:
+            self.tickers[slot] = None
+            self._clear(slot)
+            self._free.append(slot)
+
+    def clear(self):
+        """전체 슬롯 반환"""
+        for ticker in list(self.slots):
+            self.release(ticker)
+
+    def open_position(self, slot: int, qty: float, buy_price: float, invest_amt: float):
+        """매수 체결 반영 (최고가 / 최고 수익률 / 분할 익절 레벨 초기화)"""
+        self.qty[slot] = qty
+        self.buy_price[slot] = buy_price
+        self.invest_amt[slot] = invest_amt
+        self.high_since_buy[slot] = buy_price
+        self.max_profit_rate[slot] = 0.0
+        self.partial_done[slot] = False
+
+    def close_position(self, slot: int):
+        """전량 매도 체결 반영 (수량 / 매수가 / 최고가 등 초기화)"""
+        self._clear(slot)
+
+    def _clear(self, slot: int):
+        for name in POSITION_FIELDS:
+            getattr(self, name)[slot] = 0.0
+        self.partial_done[slot] = False
+
+    def _grow(self):
+        old = len(self.tickers)
+        new = old * 2
+        for name in POSITION_FIELDS:
+            array = np.zeros(new)
+            array[:old] = getattr(self, name)
+            setattr(self, name, array)
+        done = np.zeros((new, len(self.levels)), dtype=bool)
+        done[:old] = self.partial_done
+        self.partial_done = done
+        self.tickers.extend([None] * (new - old))
+        self._free.extend(range(new - 1, old - 1, -1))
+
+    # =========================================================================
+    # 매도 조건 일괄 판정
+    # =========================================================================
+    def evaluate(self, slots: np.ndarray, loss_cut: float, use_partial_tp: bool,
+                 ts_start: float, ts_stop: float) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """보유 슬롯들의 현재가(current)로 매도 조건 판정
+
+        매수 후 최고가 / 최고 수익률도 여기서 갱신합니다.
+        우선순위는 손절 > 분할 익절 > 트레일링 스톱 (종목별 판정 1개).
+
+        Returns:
+            (수익률%, 판정 EXIT_*, 분할 익절 레벨 인덱스(-1 = 없음), 고점 대비 하락률%)
+        """
+        price = self.current[slots]
+        buy = self.buy_price[slots]
+        valid = buy > 0
+        with np.errstate(divide='ignore', invalid='ignore'):
+            rate = np.where(valid, (price - buy) / buy * 100, 0.0)
+
+        # 최고가 갱신
+        high = self.high_since_buy[slots]
+        new_high = valid & (price > high)
+        high = np.where(new_high, price, high)
+        self.high_since_buy[slots] = high
+        max_rate = np.where(new_high, rate, self.max_profit_rate[slots])
+        self.max_profit_rate[slots] = max_rate
+
+        stop = valid & (rate <= -loss_cut)
+
+        level = np.full(len(slots), -1)
+        if use_partial_tp and len(self.levels):
+            # 도달했고 아직 매도 안 한 레벨 중 최소 주문금액을 넘는 첫 레벨
+            notional = self.qty[slots, None] * (self.level_ratios / 100) * price[:, None]
+            reached = ((rate[:, None] >= self.level_rates) & (self.level_ratios > 0)
+                       & ~self.partial_done[slots] & (notional >= MIN_ORDER_KRW))
+            hit = valid & reached.any(axis=1)
+            level = np.where(hit, reached.argmax(axis=1), -1)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            drop = np.where(high > 0, (high - price) / high * 100, 0.0)
+        trailing = valid & (max_rate >= ts_start) & (drop >= ts_stop)
+
+        action = np.full(len(slots), EXIT_NONE, dtype=np.int8)
+        action[trailing] = EXIT_TRAILING
+        action[level >= 0] = EXIT_PARTIAL
+        action[stop] = EXIT_STOP_LOSS
+        return rate, action, level, drop
+
+
+class PositionView(dict):
+    """종목 정보 dict (name/state/row/target/ma5 등은 dict, 포지션 키는 PositionBook 슬롯)"""
+
+    __slots__ = ('book', 'slot')
+
+    def __init__(self, book: PositionBook, slot: int, *args, **kwargs):
+        self.book = book
+        self.slot = slot
+        super().__init__()
+        self.update(*args, **kwargs)
+
+    def __getitem__(self, key):
+        if key in POSITION_FIELDS:
+            return float(getattr(self.book, key)[self.slot])
+        return dict.__getitem__(self, key)
+
+    def __setitem__(self, key, value):
+        if key in POSITION_FIELDS:
+            getattr(self.book, key)[self.slot] = value
+        else:
+            dict.__setitem__(self, key, value)
+
+    def __contains__(self, key):
+        return key in POSITION_FIELDS or dict.__contains__(self, key)
+
+    def get(self, key, default=None):
+        return self[key] if key in self else default
+
+    def update(self, *args, **kwargs):
+        for key, value in dict(*args, **kwargs).items():
+            self[key] = value
+
+    def to_dict(self) -> Dict:
+        """포지션 키를 포함한 일반 dict (저장 / 표시용)"""
+        data = dict(self)
+        data.update({key: self[key] for key in POSITION_FIELDS})
+        return data
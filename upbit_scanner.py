@@ -0,0 +1,220 @@
+"""
+Upbit Market Scanner v1.0
+전 종목 돌파 스캐너 for Upbit Pro Algo-Trader
+
+모든 KRW 마켓(약 200개)에서 변동성 돌파 후보 선별
+- 현재가: 현재가 API 일괄 조회 (요청당 최대 200종목)
+- 캔들: CandleCache 재사용 (같은 캔들 구간 안에서는 API 재호출 없음)
+- 목표가 / MA5 / RSI / 거래량 배수: 종목 × 캔들 NumPy 배열로 일괄 계산
+- 점수 순 후보 목록 → 감시 코인 자동 구성
+"""
+
+import time
+import logging
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from upbit_startup import lazy_import
+
+try:
+    pyupbit = lazy_import('pyupbit')
+except ImportError:
+    pyupbit = None
+
+from upbit_config import Config
+from upbit_candles import CandleCache
+
+
+logger = logging.getLogger('UpbitTrader')
+
+
+@dataclass
+class ScanCandidate:
+    """스캔 후보 1종목"""
+    ticker: str
+    price: float
+    target: float
+    ma5: float
+    rsi: float
+    volume_ratio: float   # 현재 봉 거래량 / 평균 거래량
+    gap_pct: float        # 목표가 대비 (%) - 음수면 돌파 전
+    trade_value: float    # 24시간 거래대금 (원)
+    score: float
+
+
+class MarketScanner:
+    """KRW 마켓 전체 변동성 돌파 스캐너"""
+
+    def __init__(self, settings, candle_cache: Optional[CandleCache] = None):
+        """
+        Args:
+            settings: TradingSettings (캔들 간격, K, RSI/거래량 필터)
+            candle_cache: 엔진과 공유할 캔들 캐시 (None이면 자체 생성)
+        """
+        self.settings = settings
+        self.candles = candle_cache or CandleCache()
+        self.last_scan_seconds = 0.0
+        self.last_market_count = 0
+
+    # =========================================================================
+    # 스캔
+    # =========================================================================
+    def scan(self, top_n: Optional[int] = None) -> List[ScanCandidate]:
+        """전 종목 스캔 후 점수 순 후보 반환"""
+        started = time.perf_counter()
+        api_calls_before = self.candles.api_calls
+
+        snapshots = self.fetch_snapshots()
+        self.last_market_count = len(snapshots)
+
+        # 거래대금 하한 - 유동성 없는 종목은 캔들 조회 전에 제외
+        liquid = [s for s in snapshots
+                  if s.get('acc_trade_price_24h', 0) >= Config.SCANNER_MIN_TRADE_VALUE]
+
+        candidates = self.score(liquid)
+        if top_n is not None:
+            candidates = candidates[:top_n]
+
+        self.last_scan_seconds = time.perf_counter() - started
+        logger.info(
+            f"🔎 전 종목 스캔: {len(snapshots)}종목 중 {len(liquid)}종목 분석, "
+            f"후보 {len(candidates)}개 "
+            f"(캔들 조회 {self.candles.api_calls - api_calls_before}건, {self.last_scan_seconds:.1f}초)"
+        )
+        return candidates
+
+    def top_by_trade_value(self, top_n: int) -> List[str]:
+        """24시간 거래대금 상위 top_n 종목 (현재가 일괄 조회만 사용)"""
+        snapshots = self.fetch_snapshots()
+        snapshots.sort(key=lambda s: s.get('acc_trade_price_24h', 0), reverse=True)
+        return [s['market'] for s in snapshots[:top_n]]
+
+    def fetch_snapshots(self) -> List[Dict]:
+        """KRW 마켓 전체 현재가 스냅샷 (일괄 조회)"""
+        tickers = pyupbit.get_tickers(fiat="KRW")
+        if not tickers:
+            return []
+        snapshots = pyupbit.get_current_price(tickers, verbose=True)
+        if isinstance(snapshots, dict):
+            snapshots = [snapshots]
+        return snapshots or []
+
+    def score(self, snapshots: List[Dict]) -> List[ScanCandidate]:
+        """스냅샷 + 캔들 → 후보 (필터 통과 종목만, 점수 내림차순)"""
+        s = self.settings
+        interval = s.candle_interval
+        rsi_period = s.rsi_period
+        vol_period = Config.DEFAULT_VOLUME_PERIOD
+        bars = max(rsi_period + 2, vol_period + 1, 6)
+
+        # 일봉은 진행 봉을 스냅샷으로 채우므로 구간 경계까지 캐시 사용,
+        # 분봉은 진행 봉 거래량 갱신을 위해 CANDLE_CACHE_MAX_AGE마다 재조회
+        max_age = None if interval == 'day' else Config.CANDLE_CACHE_MAX_AGE
+
+        tickers: List[str] = []
+        frames = []
+        for snap in snapshots:
+            df = self.candles.get(snap['market'], interval, bars, max_age)
+            if df is None or len(df) < 2:
+                continue
+            tickers.append(snap['market'])
+            frames.append((snap, df))
+
+        if not frames:
+            return []
+
+        n = len(frames)
+        opens = np.full((n, bars), np.nan)
+        highs = np.full((n, bars), np.nan)
+        lows = np.full((n, bars), np.nan)
+        closes = np.full((n, bars), np.nan)
+        volumes = np.full((n, bars), np.nan)
+        price = np.empty(n)
+        trade_value = np.empty(n)
+
+        # 오른쪽 정렬 (마지막 열 = 진행 중인 봉)
+        for i, (snap, df) in enumerate(frames):
+            m = len(df)
+            opens[i, -m:] = df['open'].to_numpy()
+            highs[i, -m:] = df['high'].to_numpy()
+            lows[i, -m:] = df['low'].to_numpy()
+            closes[i, -m:] = df['close'].to_numpy()
+            volumes[i, -m:] = df['volume'].to_numpy()
+            price[i] = snap['trade_price']
+            trade_value[i] = snap.get('acc_trade_price_24h', 0)
+            if interval == 'day':
+                # 일봉 진행 봉은 현재가 API 값이 최신 (UTC 자정 = KST 09:00 기준 누적)
+                opens[i, -1] = snap['opening_price']
+                highs[i, -1] = snap['high_price']
+                lows[i, -1] = snap['low_price']
+                volumes[i, -1] = snap['acc_trade_volume']
+
+        # 진행 중인 봉에 현재가 반영
+        closes[:, -1] = price
+        highs[:, -1] = np.fmax(highs[:, -1], price)
+        lows[:, -1] = np.fmin(lows[:, -1], price)
+
+        # 변동성 돌파 목표가 = 현재 봉 시가 + 전 봉 변동폭 × K
+        target = opens[:, -1] + (highs[:, -2] - lows[:, -2]) * s.k_value
+
+        # MA5 (진행 중인 봉 포함 - 엔진과 동일)
+        ma5 = closes[:, -5:].mean(axis=1)
+
+        # RSI (최근 period개 변화량 단순 평균 - 엔진과 동일)
+        delta = np.diff(closes[:, -(rsi_period + 1):], axis=1)
+        avg_gain = np.nanmean(np.clip(delta, 0.0, None), axis=1)
+        avg_loss = np.nanmean(np.clip(-delta, 0.0, None), axis=1)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            rsi = np.where(avg_loss == 0, 100.0, 100.0 - 100.0 / (1.0 + avg_gain / avg_loss))
+
+            # 거래량 배수 (현재 봉 / 직전 period개 평균)
+            avg_volume = np.nanmean(volumes[:, -(vol_period + 1):-1], axis=1)
+            volume_ratio = np.where(avg_volume > 0, volumes[:, -1] / avg_volume, 0.0)
+
+            gap_pct = (price / target - 1.0) * 100
+
+        # 필터: 목표가 근접(돌파 직전 ~ 과도한 추격 전), MA5 위, RSI, 거래량
+        mask = (
+            np.isfinite(target) & np.isfinite(ma5)
+            & (gap_pct >= -Config.SCANNER_NEAR_PCT)
+            & (gap_pct <= Config.SCANNER_MAX_CHASE_PCT)
+            & (price >= ma5)
+        )
+        if s.use_rsi:
+            mask &= rsi < s.rsi_upper
+        if s.use_volume:
+            mask &= volume_ratio >= s.volume_mult
+
+        # 점수 (0~100): 목표가 근접 50 + 거래량 25 + 유동성 15 + RSI 여유 10
+        proximity = 1.0 - np.clip(np.abs(gap_pct) / Config.SCANNER_NEAR_PCT, 0.0, 1.0)
+        volume_score = np.clip(volume_ratio / (2.0 * max(s.volume_mult, 1.0)), 0.0, 1.0)
+        liquidity = np.argsort(np.argsort(trade_value)) / max(n - 1, 1)
+        rsi_room = np.clip((s.rsi_upper - rsi) / max(s.rsi_upper, 1), 0.0, 1.0)
+        score = 50 * proximity + 25 * volume_score + 15 * liquidity + 10 * rsi_room
+
+        order = [i for i in np.argsort(-score, kind='stable') if mask[i]]
+        return [
+            ScanCandidate(
+                ticker=tickers[i],
+                price=float(price[i]),
+                target=float(target[i]),
+                ma5=float(ma5[i]),
+                rsi=float(rsi[i]),
+                volume_ratio=float(volume_ratio[i]),
+                gap_pct=float(gap_pct[i]),
+                trade_value=float(trade_value[i]),
+                score=float(score[i]),
+            )
+            for i in order
+        ]
+
+
+def format_candidates(candidates: List[ScanCandidate], limit: int = 10) -> List[str]:
+    """로그 표시용 후보 요약"""
+    return [
+        f"{rank}. {c.ticker} 점수 {c.score:.0f} | 목표가 대비 {c.gap_pct:+.2f}% | "
+        f"RSI {c.rsi:.0f} | 거래량 x{c.volume_ratio:.1f} | 거래대금 {c.trade_value / 1e8:,.0f}억"
+        for rank, c in enumerate(candidates[:limit], 1)
+    ]
@@ -0,0 +1,84 @@
+"""
+Upbit Startup v1.0
+시작 속도 최적화 도구 for Upbit Pro Algo-Trader
+
+창이 뜨기 전에 쓰지 않는 무거운 모듈은 처음 사용할 때 로드
+- module_available: import 없이 설치 여부만 확인 (find_spec)
+- lazy_import: 모듈 객체만 먼저 등록, 실제 로드는 첫 속성 접근 시 (importlib LazyLoader)
+- StartupProfiler: 시작 단계별 소요 시간 기록 → 로그 한 줄 리포트
+"""
+
+import sys
+import time
+import logging
+import importlib
+import importlib.util
+from types import ModuleType
+from typing import List, Optional, Tuple
+
+
+def module_available(name: str) -> bool:
+    """모듈 설치 여부 (실제 import 없음)"""
+    try:
+        return importlib.util.find_spec(name) is not None
+    except (ImportError, ValueError):
+        return False
+
+
+def lazy_import(name: str) -> ModuleType:
+    """첫 속성 접근 시 로드되는 모듈 반환 (설치되지 않았으면 ImportError)
+
+    이미 로드된 모듈은 그대로 반환합니다. 로드는 속성에 처음 접근한
+    스레드에서 일어나므로, 워커 스레드보다 먼저 메인 스레드에서 쓰거나
+    preload()로 미리 로드해 둡니다.
+    """
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+
+    spec = importlib.util.find_spec(name)
+    if spec is None:
+        raise ImportError(f"No module named '{name}'", name=name)
+
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
+
+
+def preload(name: str) -> float:
+    """지연 모듈을 지금 로드 (소요 시간 초 반환)"""
+    start = time.perf_counter()
+    module = importlib.import_module(name)
+    getattr(module, '__file__', None)  # 속성 접근 → LazyLoader 실행
+    return time.perf_counter() - start
+
+
+class StartupProfiler:
+    """시작 단계별 경과 시간 기록"""
+
+    def __init__(self, t0: Optional[float] = None):
+        self.t0 = t0 if t0 is not None else time.perf_counter()
+        self.marks: List[Tuple[str, float]] = []
+
+    def mark(self, name: str):
+        """이전 단계 종료 시점 기록"""
+        self.marks.append((name, time.perf_counter()))
+
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.t0
+
+    def report(self) -> str:
+        """예: "시작 1.02초 (모듈 import 0.31 / QApplication 0.05 / UI 구성 0.52 / ...)" """
+        parts = []
+        prev = self.t0
+        for name, t in self.marks:
+            parts.append(f"{name} {t - prev:.2f}")
+            prev = t
+        total = (self.marks[-1][1] if self.marks else prev) - self.t0
+        return f"시작 {total:.2f}초 ({' / '.join(parts)})"
+
+    def log(self, logger: logging.Logger):
+        logger.info(f"⏱️ {self.report()}")
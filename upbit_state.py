@@ -0,0 +1,151 @@
+"""
+Upbit State Store v1.0
+엔진 상태 스냅샷 + 변경 로그 for Upbit Pro Algo-Trader
+
+재시작/크래시 후 매매 상태를 그대로 이어가기 위한 저장소
+- 스냅샷: 엔진 상태 전체를 주기적으로 원자적 재작성 (upbit_state.json)
+- 변경 로그(WAL): 스냅샷 이후 상태 변화를 한 줄씩 추가 + fsync (upbit_state.json.wal)
+- 로드: 스냅샷 위에 변경 로그를 순서대로 재적용 (크래시로 잘린 마지막 줄은 무시)
+- 상태 구성: 감시 종목/포지션, 쿨다운·보유 시작 시각, 일일 통계·연속 손익, 대기 주문
+"""
+
+import json
+import os
+import threading
+import logging
+from typing import Any, Dict, Optional
+
+from upbit_config import Config
+from upbit_trade_journal import _fsync_dir
+
+
+STATE_VERSION = 1
+
+# 종목별 항목을 담는 섹션 (나머지 섹션은 통째로 교체)
+STATE_SECTIONS = ('universe', 'cooldowns', 'holding', 'orders')
+
+
+def empty_state() -> Dict[str, Any]:
+    state: Dict[str, Any] = {section: {} for section in STATE_SECTIONS}
+    state['version'] = STATE_VERSION
+    state['stats'] = {}
+    return state
+
+
+class StateStore:
+    """엔진 상태 스냅샷 + 변경 로그 (엔진 스레드에서 사용)"""
+
+    def __init__(self, path: str = None):
+        """
+        Args:
+            path: 스냅샷 파일 경로 (기본: Config.STATE_FILE, 변경 로그는 경로 + '.wal')
+        """
+        self.path = path or Config.STATE_FILE
+        self.wal_path = self.path + '.wal'
+        self.logger = logging.getLogger('UpbitTrader')
+        self._lock = threading.Lock()
+        self._tail_checked = False
+        self.appends = 0  # 마지막 스냅샷 이후 변경 로그 줄 수
+
+    # =========================================================================
+    # 로드
+    # =========================================================================
+    def exists(self) -> bool:
+        return os.path.exists(self.path) or os.path.exists(self.wal_path)
+
+    def load(self) -> Optional[Dict[str, Any]]:
+        """스냅샷 + 변경 로그 재적용 결과 (저장된 상태가 없으면 None)"""
+        if not self.exists():
+            return None
+
+        state = empty_state()
+        if os.path.exists(self.path):
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    snapshot = json.load(f)
+            except (OSError, ValueError) as e:
+                self.logger.error(f"상태 스냅샷 읽기 실패 ({self.path}): {e}")
+                snapshot = {}
+            if snapshot.get('version') == STATE_VERSION:
+                state.update(snapshot)
+
+        replayed = 0
+        if os.path.exists(self.wal_path):
+            with open(self.wal_path, 'r', encoding='utf-8') as f:
+                for line_no, line in enumerate(f, 1):
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        self.logger.warning(f"상태 변경 로그 손상 라인 무시 ({self.wal_path}:{line_no})")
+                        continue
+                    self._apply(state, entry)
+                    replayed += 1
+        self.appends = replayed
+        return state
+
+    @staticmethod
+    def _apply(state: Dict[str, Any], entry: Dict[str, Any]):
+        """변경 로그 1줄 적용 - k가 없으면 섹션 전체 교체, v가 None이면 항목 삭제"""
+        section, key, value = entry.get('s'), entry.get('k'), entry.get('v')
+        if key is None:
+            state[section] = value
+            return
+        items = state.setdefault(section, {})
+        if value is None:
+            items.pop(key, None)
+        else:
+            items[key] = value
+
+    # =========================================================================
+    # 기록
+    # =========================================================================
+    def put(self, section: str, key: Optional[str], value: Any):
+        """상태 변화 1건 추가 (fsync 후 반환)"""
+        line = json.dumps({'s': section, 'k': key, 'v': value},
+                          ensure_ascii=False, separators=(',', ':'))
+        with self._lock:
+            if not self._tail_checked:
+                # 크래시로 잘린 마지막 줄 뒤에 이어 쓰지 않도록 줄바꿈 보정
+                if not self._ends_with_newline():
+                    line = '\n' + line
+                self._tail_checked = True
+
+            with open(self.wal_path, 'a', encoding='utf-8') as f:
+                f.write(line + '\n')
+                f.flush()
+                os.fsync(f.fileno())
+            self.appends += 1
+
+    def _ends_with_newline(self) -> bool:
+        try:
+            with open(self.wal_path, 'rb') as f:
+                f.seek(0, os.SEEK_END)
+                if f.tell() == 0:
+                    return True
+                f.seek(-1, os.SEEK_END)
+                return f.read(1) == b'\n'
+        except OSError:
+            return True
+
+    def checkpoint(self, state: Dict[str, Any]):
+        """스냅샷 원자적 재작성 후 변경 로그 비우기
+
+        스냅샷 교체가 끝난 뒤에 변경 로그를 지우므로, 그 사이 크래시가 나도
+        새 스냅샷 위에 이미 반영된 변경을 다시 적용할 뿐 상태는 같습니다.
+        """
+        state = dict(state, version=STATE_VERSION)
+        tmp_path = self.path + '.tmp'
+        with self._lock:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(state, f, ensure_ascii=False, separators=(',', ':'))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.path)
+            _fsync_dir(self.path)
+            with open(self.wal_path, 'w', encoding='utf-8'):
+                pass
+            self.appends = 0
+            self._tail_checked = True
@@ -10,14 +10,18 @@ import time
 import logging
 from typing import Tuple, Optional, Dict, Any, List
 
+from upbit_startup import lazy_import
+
+# pyupbit/pandas는 첫 사용 시 로드 (GUI 창 표시 지연 방지)
 try:
-    import pyupbit
-    import pandas as pd
+    pyupbit = lazy_import('pyupbit')
+    pd = lazy_import('pandas')
 except ImportError:
     pyupbit = None
     pd = None
 
 from upbit_config import Config
+from upbit_ticks import PriceRing
 
 
 class UpbitStrategyManager:
@@ -46,9 +50,11 @@ class UpbitStrategyManager:
         # 보유 시간 추적
         self.holding_start_times = {}  # {ticker: buy_time}
         
-        # 최근 가격 추적 (돌파 확인용)
-        self.recent_prices = {}  # {ticker: [price1, price2, ...]}
-        self.max_recent_prices = 10
+        # 최근 가격 추적 (돌파 확인 / 단기 모멘텀용 - 종목별 고정 크기 링 버퍼)
+        self.recent_prices: Dict[str, PriceRing] = {}
+        self.max_recent_prices = getattr(self.config, 'RECENT_PRICE_CAPACITY', 128)
+        # 목표가 이상 유지 시작 시각 (링 버퍼 길이와 무관한 돌파 유지 시간)
+        self.above_target_since: Dict[str, Tuple[float, float]] = {}  # {ticker: (target, since)}
         
         # 분할 익절 추적
         self.partial_profit_executed = {}  # {ticker: [executed_levels]}
@@ -336,6 +342,11 @@ class UpbitStrategyManager:
         """매도 후 재진입 쿨다운 설정"""
         minutes = minutes or Config.DEFAULT_COOLDOWN_MINUTES
         self.cooldown_tickers[ticker] = datetime.datetime.now() + datetime.timedelta(minutes=minutes)
+        timers = getattr(self.trader, 'timers', None)
+        if timers is not None:
+            # 엔진 예약 작업으로 만료 처리 (틱마다 시간 비교 없음)
+            timers.schedule(('cooldown', ticker), minutes * 60, lambda: self.clear_cooldown(ticker),
+                            f"{ticker} 재진입 쿨다운 만료")
         self.log(f"[{ticker}] 재진입 쿨다운 설정: {minutes}분")
     
     def check_cooldown(self, ticker: str) -> bool:
@@ -358,6 +369,9 @@ class UpbitStrategyManager:
         """쿨다운 해제"""
         if ticker in self.cooldown_tickers:
             del self.cooldown_tickers[ticker]
+        timers = getattr(self.trader, 'timers', None)
+        if timers is not None:
+            timers.cancel(('cooldown', ticker))
     
     # =========================================================================
     # v3.0 고급 기능: 시간 기반 청산
@@ -390,6 +404,30 @@ class UpbitStrategyManager:
         if ticker in self.holding_start_times:
             del self.holding_start_times[ticker]
     
+    # =========================================================================
+    # 상태 저장 / 복원 (재시작 이어가기)
+    # =========================================================================
+    def export_state(self) -> Dict[str, Dict[str, float]]:
+        """쿨다운 만료 / 보유 시작 시각 (epoch 초)"""
+        return {
+            'cooldowns': {t: end.timestamp() for t, end in self.cooldown_tickers.items()},
+            'holding': {t: start.timestamp() for t, start in self.holding_start_times.items()},
+        }
+    
+    def restore_state(self, cooldowns: Dict[str, float], holding: Dict[str, float]):
+        """저장된 쿨다운 / 보유 시작 시각 복원 (지난 쿨다운은 버리고 남은 쿨다운은 만료 예약)"""
+        now = time.time()
+        timers = getattr(self.trader, 'timers', None)
+        for ticker, end in cooldowns.items():
+            if end <= now:
+                continue
+            self.cooldown_tickers[ticker] = datetime.datetime.fromtimestamp(end)
+            if timers is not None:
+                timers.schedule_at(('cooldown', ticker), end, lambda t=ticker: self.clear_cooldown(t),
+                                   f"{ticker} 재진입 쿨다운 만료")
+        for ticker, start in holding.items():
+            self.holding_start_times[ticker] = datetime.datetime.fromtimestamp(start)
+    
     # =========================================================================
     # v3.0 고급 기능: 동적 포지션 사이징 (Anti-Martingale)
     # =========================================================================
@@ -452,8 +490,12 @@ class UpbitStrategyManager:
     
     def _get_trend(self, ticker: str, interval: str, period: int = 5) -> str:
         """추세 판단 (UP/DOWN/SIDEWAYS)"""
+        features = getattr(self.trader, 'features', None)
+        if features is not None:
+            # 엔진 피처 저장소: 마감 봉 기준, 봉이 바뀔 때만 재계산
+            return features.trend(ticker, interval, period) or 'SIDEWAYS'
         try:
-            df = pyupbit.get_ohlcv(ticker, interval=interval, count=period + 1)
+            df = self._get_ohlcv(ticker, interval, period + 1)
             if df is None or len(df) < period:
                 return 'SIDEWAYS'
             
@@ -483,14 +525,21 @@ class UpbitStrategyManager:
         """
         try:
             interval = self._get_candle_interval()
-            df = pyupbit.get_ohlcv(ticker, interval=interval, count=2)
-            if df is None or len(df) < 2:
-                return 'no_gap', 0.0
-            
-            prev_close = df.iloc[-2]['close']
-            curr_open = df.iloc[-1]['open']
-            
-            gap_ratio = (curr_open - prev_close) / prev_close * 100
+            features = getattr(self.trader, 'features', None)
+            if features is not None:
+                # 엔진 피처 저장소: 현재 봉이 열린 뒤 한 번만 계산
+                gap_ratio = features.gap_ratio(ticker, interval)
+                if gap_ratio is None:
+                    return 'no_gap', 0.0
+            else:
+                df = self._get_ohlcv(ticker, interval, 2)
+                if df is None or len(df) < 2:
+                    return 'no_gap', 0.0
+                
+                prev_close = df.iloc[-2]['close']
+                curr_open = df.iloc[-1]['open']
+                
+                gap_ratio = (curr_open - prev_close) / prev_close * 100
             
             if gap_ratio > Config.GAP_THRESHOLD:
                 return 'gap_up', gap_ratio
@@ -520,42 +569,65 @@ class UpbitStrategyManager:
     # =========================================================================
     # v3.0 고급 기능: 돌파 확인 (N틱 유지)
     # =========================================================================
-    def update_recent_price(self, ticker: str, price: float):
-        """최근 가격 업데이트"""
-        if ticker not in self.recent_prices:
-            self.recent_prices[ticker] = []
-        
-        self.recent_prices[ticker].append(price)
-        
-        # 최대 개수 제한
-        if len(self.recent_prices[ticker]) > self.max_recent_prices:
-            self.recent_prices[ticker] = self.recent_prices[ticker][-self.max_recent_prices:]
+    def update_recent_price(self, ticker: str, price: float, ts: float = None,
+                            target_price: float = None):
+        """최근 가격 업데이트 (링 버퍼 제자리 기록)
+
+        target_price를 주면 목표가 이상으로 올라선 시각을 기록하고,
+        목표가 미만으로 내려가거나 목표가가 바뀌면 다시 시작합니다.
+        """
+        ts = time.time() if ts is None else ts
+        ring = self.recent_prices.get(ticker)
+        if ring is None:
+            ring = self.recent_prices[ticker] = PriceRing(self.max_recent_prices)
+        ring.append(price, ts)
+        
+        if target_price:
+            entry = self.above_target_since.get(ticker)
+            if price < target_price:
+                self.above_target_since.pop(ticker, None)
+            elif entry is None or entry[0] != target_price:
+                self.above_target_since[ticker] = (target_price, ts)
     
     def check_breakout_confirmation(self, ticker: str, target_price: float, 
-                                     confirm_ticks: int = None) -> bool:
-        """목표가 돌파 후 N틱 유지 확인"""
+                                     confirm_ticks: int = None,
+                                     confirm_seconds: float = None) -> bool:
+        """목표가 돌파 후 N틱 유지 (+ confirm_seconds초 유지) 확인"""
         if not self._is_breakout_confirm_enabled():
             return True  # 비활성화 시 통과
         
         confirm_ticks = confirm_ticks or Config.DEFAULT_BREAKOUT_CONFIRM_TICKS
         
-        if ticker not in self.recent_prices:
+        ring = self.recent_prices.get(ticker)
+        if ring is None or len(ring) < confirm_ticks:
             return False
         
-        prices = self.recent_prices[ticker]
-        if len(prices) < confirm_ticks:
+        # 최근 N개 가격이 모두 목표가 이상인지 확인 (최솟값 비교)
+        if ring.min(ticks=confirm_ticks) < target_price:
+            self.log(f"[{ticker}] 돌파 확인 대기 ({confirm_ticks}틱 미충족)")
             return False
         
-        # 최근 N개 가격이 모두 목표가 이상인지 확인
-        result = all(p >= target_price for p in prices[-confirm_ticks:])
-        if not result:
-            self.log(f"[{ticker}] 돌파 확인 대기 ({confirm_ticks}틱 미충족)")
-        return result
+        # 시간 조건 (적응형 조회로 틱 간격이 달라도 같은 시간만큼 유지 확인)
+        if confirm_seconds:
+            entry = self.above_target_since.get(ticker)
+            held = time.time() - entry[1] if entry and entry[0] == target_price else 0.0
+            if held < confirm_seconds:
+                self.log(f"[{ticker}] 돌파 확인 대기 ({held:.0f}/{confirm_seconds:.0f}초 유지)")
+                return False
+        return True
+    
+    def get_short_term_momentum(self, ticker: str, seconds: float = 60) -> Tuple[float, float]:
+        """최근 seconds초 모멘텀(%)과 고저 변동폭(%) - 링 버퍼 질의"""
+        ring = self.recent_prices.get(ticker)
+        if ring is None or len(ring) < 2:
+            return 0.0, 0.0
+        return ring.momentum(seconds=seconds), ring.range_pct(seconds=seconds)
     
     def clear_recent_prices(self, ticker: str):
         """최근 가격 기록 삭제"""
         if ticker in self.recent_prices:
             del self.recent_prices[ticker]
+        self.above_target_since.pop(ticker, None)
     
     # =========================================================================
     # v3.0 고급 기능: 분할 익절 추적
@@ -597,10 +669,24 @@ class UpbitStrategyManager:
             del self.partial_profit_executed[ticker]
     
     # =========================================================================
-    # 헬퍼 메서드들 (트레이더 UI 접근)
+    # 헬퍼 메서드들 (설정 조회 - 엔진 설정 객체 우선, 없으면 트레이더 UI)
     # =========================================================================
+    def _settings(self):
+        """엔진의 TradingSettings (UI 트레이더에 직접 붙은 경우 None)"""
+        return getattr(self.trader, 'settings', None)
+    
+    def _get_ohlcv(self, ticker: str, interval: str, count: int):
+        """캔들 조회 (엔진의 실시간 캔들 / 캔들 캐시 우선 - 같은 캔들 구간에서는 API 재호출 없음)"""
+        cache = getattr(self.trader, 'candles', None) or getattr(self.trader, 'candle_cache', None)
+        if cache is not None:
+            return cache.get(ticker, interval, count)
+        return pyupbit.get_ohlcv(ticker, interval=interval, count=count)
+    
     def _get_candle_interval(self) -> str:
         """현재 설정된 캔들 간격 조회"""
+        settings = self._settings()
+        if settings is not None:
+            return settings.candle_interval
         if hasattr(self.trader, 'combo_candle'):
             return Config.CANDLE_INTERVALS.get(
                 self.trader.combo_candle.currentText(), 
@@ -610,60 +696,90 @@ class UpbitStrategyManager:
     
     def _get_k_value(self) -> float:
         """K값 조회"""
+        settings = self._settings()
+        if settings is not None:
+            return settings.k_value
         if hasattr(self.trader, 'spin_k'):
             return self.trader.spin_k.value()
         return Config.DEFAULT_K_VALUE
     
     def _get_betting_ratio(self) -> float:
         """베팅 비율 조회"""
+        settings = self._settings()
+        if settings is not None:
+            return settings.betting_ratio
         if hasattr(self.trader, 'spin_betting'):
             return self.trader.spin_betting.value()
         return Config.DEFAULT_BETTING_RATIO
     
     def _get_rsi_period(self) -> int:
         """RSI 기간 조회"""
+        settings = self._settings()
+        if settings is not None:
+            return settings.rsi_period
         if hasattr(self.trader, 'spin_rsi_period'):
             return self.trader.spin_rsi_period.value()
         return Config.DEFAULT_RSI_PERIOD
     
     def _get_volume_multiplier(self) -> float:
         """거래량 배수 조회"""
+        settings = self._settings()
+        if settings is not None:
+            return settings.volume_mult
         if hasattr(self.trader, 'spin_volume_mult'):
             return self.trader.spin_volume_mult.value()
         return Config.DEFAULT_VOLUME_MULTIPLIER
     
     def _is_cooldown_enabled(self) -> bool:
         """쿨다운 활성화 여부"""
+        settings = self._settings()
+        if settings is not None:
+            return settings.use_cooldown
         if hasattr(self.trader, 'chk_use_cooldown'):
             return self.trader.chk_use_cooldown.isChecked()
         return Config.DEFAULT_USE_COOLDOWN
     
     def _is_time_exit_enabled(self) -> bool:
         """시간 청산 활성화 여부"""
+        settings = self._settings()
+        if settings is not None:
+            return settings.use_time_exit
         if hasattr(self.trader, 'chk_use_time_exit'):
             return self.trader.chk_use_time_exit.isChecked()
         return Config.DEFAULT_USE_TIME_EXIT
     
     def _is_dynamic_position_enabled(self) -> bool:
         """동적 포지션 활성화 여부"""
+        settings = self._settings()
+        if settings is not None:
+            return settings.use_dynamic_position
         if hasattr(self.trader, 'chk_use_dynamic_position'):
             return self.trader.chk_use_dynamic_position.isChecked()
         return Config.DEFAULT_USE_DYNAMIC_POSITION
     
     def _is_mtf_enabled(self) -> bool:
         """MTF 활성화 여부"""
+        settings = self._settings()
+        if settings is not None:
+            return settings.use_mtf
         if hasattr(self.trader, 'chk_use_mtf'):
             return self.trader.chk_use_mtf.isChecked()
         return Config.DEFAULT_USE_MTF
     
     def _is_gap_analysis_enabled(self) -> bool:
         """갭 분석 활성화 여부"""
+        settings = self._settings()
+        if settings is not None:
+            return settings.use_gap_analysis
         if hasattr(self.trader, 'chk_use_gap'):
             return self.trader.chk_use_gap.isChecked()
         return Config.DEFAULT_USE_GAP_ANALYSIS
     
     def _is_breakout_confirm_enabled(self) -> bool:
         """돌파 확인 활성화 여부"""
+        settings = self._settings()
+        if settings is not None:
+            return settings.use_breakout_confirm
         if hasattr(self.trader, 'chk_use_breakout_confirm'):
             return self.trader.chk_use_breakout_confirm.isChecked()
         return Config.DEFAULT_USE_BREAKOUT_CONFIRM
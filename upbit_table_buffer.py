@@ -0,0 +1,98 @@
+"""
+Upbit Table Buffer v1.0
+모니터링 테이블 갱신 버퍼 for Upbit Pro Algo-Trader
+
+가격 틱마다 QTableWidgetItem / QColor를 새로 만들지 않도록
+셀별 최신 값만 보관했다가 정해진 주기로 한 번에 반영
+- 같은 셀에 여러 번 쓰면 마지막 값만 남음 (틱 병합)
+- 화면에 표시된 값과 같으면 다시 그리지 않음 (diff)
+- 기존 아이템을 제자리에서 수정, 색상 객체는 캐시 재사용
+"""
+
+from typing import Dict, Optional, Tuple
+
+from PyQt6.QtCore import Qt, QTimer
+from PyQt6.QtGui import QColor
+from PyQt6.QtWidgets import QTableWidget, QTableWidgetItem
+
+
+# (텍스트, 글자색, 배경색)
+CellValue = Tuple[str, Optional[str], Optional[str]]
+
+
+class TableUpdateBuffer:
+    """QTableWidget 셀 갱신 병합 버퍼 (최대 fps 회/초 반영)"""
+
+    def __init__(self, table: QTableWidget, fps: int = 5):
+        self.table = table
+        self._pending: Dict[Tuple[int, int], CellValue] = {}
+        self._shown: Dict[Tuple[int, int], CellValue] = {}
+        self._colors: Dict[str, QColor] = {}
+
+        self._timer = QTimer(table)
+        self._timer.setInterval(max(1, int(1000 / max(fps, 1))))
+        self._timer.timeout.connect(self.flush)
+        self._timer.start()
+
+    def set(self, row: int, col: int, text: str,
+            fg: Optional[str] = None, bg: Optional[str] = None):
+        """셀 값 예약 (다음 flush에서 반영)"""
+        key = (row, col)
+        value = (text, fg, bg)
+        if self._shown.get(key) == value:
+            self._pending.pop(key, None)
+        else:
+            self._pending[key] = value
+
+    def flush(self):
+        """예약된 셀 변경을 한 번에 반영"""
+        if not self._pending:
+            return
+
+        pending, self._pending = self._pending, {}
+        row_count = self.table.rowCount()
+
+        self.table.setUpdatesEnabled(False)
+        try:
+            for (row, col), value in pending.items():
+                if row >= row_count:
+                    continue
+                text, fg, bg = value
+                item = self.table.item(row, col)
+                if item is None:
+                    item = QTableWidgetItem(text)
+                    self.table.setItem(row, col, item)
+                else:
+                    item.setText(text)
+                shown = self._shown.get((row, col))
+                if shown is None or shown[1] != fg:
+                    item.setData(Qt.ItemDataRole.ForegroundRole, self._color(fg) if fg else None)
+                if shown is None or shown[2] != bg:
+                    item.setData(Qt.ItemDataRole.BackgroundRole, self._color(bg) if bg else None)
+                self._shown[(row, col)] = value
+        finally:
+            self.table.setUpdatesEnabled(True)
+
+    def remove_row(self, row: int):
+        """행 삭제 (대기 중인 변경을 먼저 반영하고 아래 행의 표시 값 캐시를 한 칸 당김)"""
+        self.flush()
+        self.table.removeRow(row)
+        self._shown = {
+            (r - 1 if r > row else r, c): value
+            for (r, c), value in self._shown.items() if r != row
+        }
+
+    def clear(self):
+        """테이블 초기화 시 호출 (표시 값 캐시 폐기)"""
+        self._pending.clear()
+        self._shown.clear()
+
+    def stop(self):
+        """갱신 타이머 중지"""
+        self._timer.stop()
+
+    def _color(self, hex_color: str) -> QColor:
+        color = self._colors.get(hex_color)
+        if color is None:
+            color = self._colors[hex_color] = QColor(hex_color)
+        return color
@@ -0,0 +1,115 @@
+"""
+Upbit Ticks v1.0
+최근 가격 링 버퍼 for Upbit Pro Algo-Trader
+
+종목별 최근 가격을 고정 크기 원형 버퍼(NumPy 가격/시각 배열)에 보관
+- append: 새 배열/리스트를 만들지 않고 제자리 덮어쓰기
+- 최근 N틱 / 최근 N초 구간 질의: 최솟값·최댓값, 모멘텀, 변동폭 (배열 뷰로 계산, 복사 없음)
+"""
+
+import time
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+
+class PriceRing:
+    """고정 크기 원형 버퍼 (가격, epoch 초)"""
+
+    __slots__ = ('capacity', '_price', '_time', '_head', '_count')
+
+    def __init__(self, capacity: int = 64):
+        self.capacity = capacity
+        self._price = np.zeros(capacity)
+        self._time = np.zeros(capacity)
+        self._head = 0   # 다음에 쓸 위치 (가장 최근 값은 head - 1)
+        self._count = 0
+
+    def append(self, price: float, ts: Optional[float] = None):
+        self._price[self._head] = price
+        self._time[self._head] = time.time() if ts is None else ts
+        self._head = (self._head + 1) % self.capacity
+        if self._count < self.capacity:
+            self._count += 1
+
+    def clear(self):
+        self._head = 0
+        self._count = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def last(self) -> Optional[float]:
+        """가장 최근 가격"""
+        return self._price.item(self._head - 1) if self._count else None
+
+    # =========================================================================
+    # 구간 선택 (오래된 → 최근 순 인덱스 구간 최대 2개)
+    # =========================================================================
+    def _segments(self, n: int) -> List[Tuple[int, int]]:
+        """최근 n개 값의 배열 구간 [(start, end), ...]"""
+        n = min(n, self._count)
+        if n <= 0:
+            return []
+        end = self._head if self._head else self.capacity
+        start = end - n
+        if start >= 0:
+            return [(start, end)]
+        return [(self.capacity + start, self.capacity), (0, end)]
+
+    def count_since(self, since: float) -> int:
+        """since(epoch 초) 이후 틱 수"""
+        count = 0
+        # 최근 구간부터 역순으로 - 각 구간 안에서 시각은 오름차순
+        for start, end in reversed(self._segments(self._count)):
+            view = self._time[start:end]
+            idx = int(np.searchsorted(view, since, side='left'))
+            count += end - start - idx
+            if idx > 0:
+                break
+        return count
+
+    def _window(self, ticks: Optional[int], seconds: Optional[float], now: Optional[float]) -> int:
+        """틱 수 또는 시간 창 → 최근 값 개수"""
+        if seconds is not None:
+            now = time.time() if now is None else now
+            return self.count_since(now - seconds)
+        return self._count if ticks is None else min(ticks, self._count)
+
+    # =========================================================================
+    # 질의
+    # =========================================================================
+    def min(self, ticks: Optional[int] = None, seconds: Optional[float] = None,
+            now: Optional[float] = None) -> Optional[float]:
+        n = self._window(ticks, seconds, now)
+        segments = self._segments(n)
+        if not segments:
+            return None
+        return min(self._price[s:e].min() for s, e in segments).item()
+
+    def max(self, ticks: Optional[int] = None, seconds: Optional[float] = None,
+            now: Optional[float] = None) -> Optional[float]:
+        n = self._window(ticks, seconds, now)
+        segments = self._segments(n)
+        if not segments:
+            return None
+        return max(self._price[s:e].max() for s, e in segments).item()
+
+    def momentum(self, ticks: Optional[int] = None, seconds: Optional[float] = None,
+                 now: Optional[float] = None) -> float:
+        """구간 첫 가격 대비 마지막 가격 변화율 (%)"""
+        n = self._window(ticks, seconds, now)
+        if n < 2:
+            return 0.0
+        first = self._price.item((self._head - n) % self.capacity)
+        return (self.last() - first) / first * 100 if first else 0.0
+
+    def range_pct(self, ticks: Optional[int] = None, seconds: Optional[float] = None,
+                  now: Optional[float] = None) -> float:
+        """구간 고저 변동폭 (마지막 가격 대비 %)"""
+        low = self.min(ticks, seconds, now)
+        high = self.max(ticks, seconds, now)
+        last = self.last()
+        if low is None or not last:
+            return 0.0
+        return (high - low) / last * 100
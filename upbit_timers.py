@@ -0,0 +1,144 @@
+"""
+Upbit Timers v1.0
+예약 작업 큐 for Upbit Pro Algo-Trader
+
+재진입 쿨다운 만료, 보유 시간 청산, 체결 확인 재시도 등 시간 기반 작업을 한 곳에서 관리
+- 만기 시각 기준 우선순위 힙 - 틱마다 목록을 훑지 않음
+- 키 단위 예약: 같은 키로 다시 예약하면 교체, cancel(key)로 취소 (힙에서는 지연 삭제)
+- pending()으로 남은 작업 조회 (키 / 설명 / 남은 시간)
+- 실제 깨우기는 주입된 scheduler(delay, func)로 가장 이른 만기 하나만 예약
+"""
+
+import time
+import heapq
+import itertools
+import logging
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+
+logger = logging.getLogger('UpbitTrader')
+
+
+class _Timer:
+    __slots__ = ('due', 'seq', 'key', 'func', 'label', 'cancelled')
+
+    def __init__(self, due: float, seq: int, key: Hashable, func: Callable[[], Any], label: str):
+        self.due = due
+        self.seq = seq
+        self.key = key
+        self.func = func
+        self.label = label
+        self.cancelled = False
+
+    def __lt__(self, other: '_Timer') -> bool:
+        return (self.due, self.seq) < (other.due, other.seq)
+
+
+class TimerQueue:
+    """키 단위 예약 작업 (엔진 스레드 전용)
+
+    만기 시각은 epoch 초(time.time)라 상태 저장 후 재시작해도 그대로 다시 예약할 수 있습니다.
+    """
+
+    def __init__(self, scheduler: Callable[[float, Callable[[], Any]], Any]):
+        """
+        Args:
+            scheduler: 지연 호출 함수 (엔진과 같은 것 - QTimer.singleShot / EngineLoop.call_later)
+        """
+        self.scheduler = scheduler
+        self._heap: List[_Timer] = []
+        self._timers: Dict[Hashable, _Timer] = {}
+        self._seq = itertools.count()
+        self._armed: Optional[float] = None  # 예약해 둔 깨우기 시각
+        self.fired = 0
+
+    # =========================================================================
+    # 예약 / 취소 / 조회
+    # =========================================================================
+    def schedule(self, key: Optional[Hashable], delay: float, func: Callable[[], Any],
+                 label: str = '') -> Hashable:
+        """delay초 후 func 실행 예약 (key가 None이면 새 키, 같은 키가 있으면 교체)"""
+        return self.schedule_at(key, time.time() + max(0.0, delay), func, label)
+
+    def schedule_at(self, key: Optional[Hashable], due: float, func: Callable[[], Any],
+                    label: str = '') -> Hashable:
+        """epoch 시각 due에 func 실행 예약"""
+        seq = next(self._seq)
+        if key is None:
+            key = ('task', seq)
+        self.cancel(key)
+        timer = _Timer(due, seq, key, func, label)
+        self._timers[key] = timer
+        heapq.heappush(self._heap, timer)
+        self._arm()
+        return key
+
+    def cancel(self, key: Hashable) -> bool:
+        """예약 취소 (없으면 False)"""
+        timer = self._timers.pop(key, None)
+        if timer is None:
+            return False
+        timer.cancelled = True
+        return True
+
+    def cancel_where(self, predicate: Callable[[Hashable], bool]) -> int:
+        """키 조건에 맞는 예약 모두 취소 (예: 특정 종목의 모든 작업)"""
+        keys = [key for key in self._timers if predicate(key)]
+        for key in keys:
+            self.cancel(key)
+        return len(keys)
+
+    def due_at(self, key: Hashable) -> Optional[float]:
+        """예약 만기 시각 (epoch 초, 없으면 None)"""
+        timer = self._timers.get(key)
+        return timer.due if timer else None
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._timers
+
+    def __len__(self) -> int:
+        return len(self._timers)
+
+    def pending(self, now: Optional[float] = None) -> List[Tuple[Hashable, str, float]]:
+        """남은 예약 [(키, 설명, 남은 초)] - 만기 순"""
+        now = time.time() if now is None else now
+        timers = sorted(self._timers.values())
+        return [(t.key, t.label, max(0.0, t.due - now)) for t in timers]
+
+    # =========================================================================
+    # 실행
+    # =========================================================================
+    def run_due(self, now: Optional[float] = None) -> int:
+        """만기가 된 작업 실행 (실행 수 반환)"""
+        now = time.time() if now is None else now
+        count = 0
+        while self._heap and self._heap[0].due <= now:
+            timer = heapq.heappop(self._heap)
+            if timer.cancelled:
+                continue
+            del self._timers[timer.key]
+            count += 1
+            self.fired += 1
+            try:
+                timer.func()
+            except Exception:
+                logger.exception(f"예약 작업 실패 ({timer.label or timer.key})")
+        return count
+
+    def _arm(self):
+        """가장 이른 만기에 깨우기 예약 (이미 더 이른 깨우기가 있으면 생략)"""
+        while self._heap and self._heap[0].cancelled:
+            heapq.heappop(self._heap)
+        if not self._heap:
+            return
+        due = self._heap[0].due
+        if self._armed is not None and self._armed <= due:
+            return
+        self._armed = due
+        self.scheduler(max(0.0, due - time.time()), lambda: self._wake(due))
+
+    def _wake(self, due: float):
+        if self._armed == due:
+            self._armed = None
+        self.run_due()
+        self._arm()
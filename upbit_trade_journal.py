@@ -0,0 +1,214 @@
+"""
+Upbit Trade Journal v1.0
+추가 전용(append-only) 거래 저널 for Upbit Pro Algo-Trader
+
+한 줄에 한 건(JSON Lines)씩 기록하고 매 기록마다 fsync
+- 체결마다 전체 파일을 다시 쓰지 않음 (기록 비용이 히스토리 크기와 무관)
+- 쓰기 도중 크래시가 나도 마지막 한 줄만 손상 (로드 시 자동 무시)
+- 주기적 압축(compaction)으로 손상 라인 정리 및 삭제 반영
+- 기존 trade_history.json (JSON 배열) 자동 이전
+"""
+
+import json
+import os
+import threading
+import logging
+from typing import Dict, Iterator, Iterable, List, Optional
+
+from upbit_config import Config
+
+
+def _fsync_dir(path: str):
+    """디렉터리 엔트리 동기화 (POSIX 전용, Windows는 무시)"""
+    dir_path = os.path.dirname(os.path.abspath(path))
+    try:
+        fd = os.open(dir_path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def iter_trade_records(path: str) -> Iterator[Dict]:
+    """거래 기록 파일 스트리밍 로드
+
+    JSON Lines 저널과 기존 JSON 배열 파일을 모두 지원합니다.
+    손상된 라인(크래시로 잘린 마지막 줄 등)은 건너뜁니다.
+    """
+    if not path or not os.path.exists(path):
+        return
+
+    with open(path, 'r', encoding='utf-8') as f:
+        # 첫 유효 문자로 형식 판별 ('[' = 기존 JSON 배열)
+        head = f.read(64).lstrip()
+        f.seek(0)
+
+        if head.startswith('['):
+            try:
+                records = json.load(f)
+            except ValueError as e:
+                logging.error(f"거래 기록 파싱 실패 ({path}): {e}")
+                return
+            for record in records:
+                if isinstance(record, dict):
+                    yield record
+            return
+
+        for line_no, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError:
+                logging.warning(f"거래 저널 손상 라인 무시 ({path}:{line_no})")
+                continue
+            if isinstance(record, dict):
+                yield record
+
+
+class TradeJournal:
+    """추가 전용 거래 저널 (JSON Lines)"""
+
+    def __init__(self, path: str = None, legacy_path: Optional[str] = None,
+                 compact_every: int = None):
+        """
+        Args:
+            path: 저널 파일 경로 (기본: Config.TRADE_HISTORY_FILE)
+            legacy_path: 이전할 기존 JSON 배열 파일 경로
+            compact_every: N건 추가마다 압축 (0 = 자동 압축 안 함)
+        """
+        self.path = path or Config.TRADE_HISTORY_FILE
+        self.legacy_path = legacy_path
+        self.compact_every = (Config.TRADE_JOURNAL_COMPACT_EVERY
+                              if compact_every is None else compact_every)
+        self.logger = logging.getLogger('UpbitTradeJournal')
+        self._lock = threading.Lock()
+        self._appends_since_compact = 0
+        self._tail_checked = False
+        self._tail_repaired = False  # 잘린 마지막 줄을 발견함 (종료 시 압축으로 정리)
+
+        self._migrate_legacy()
+
+    # =========================================================================
+    # 로드
+    # =========================================================================
+    def iter_records(self) -> Iterator[Dict]:
+        """저널 스트리밍 로드 (한 줄씩 파싱)"""
+        return iter_trade_records(self.path)
+
+    def load(self) -> List[Dict]:
+        """전체 기록 리스트로 로드"""
+        return list(self.iter_records())
+
+    # =========================================================================
+    # 기록
+    # =========================================================================
+    def append(self, record: Dict):
+        """거래 기록 1건 추가 (fsync 후 반환)"""
+        line = json.dumps(record, ensure_ascii=False, separators=(',', ':'))
+
+        with self._lock:
+            if not self._tail_checked:
+                # 크래시로 잘린 마지막 줄 뒤에 이어 쓰지 않도록 줄바꿈 보정
+                if not self._ends_with_newline():
+                    line = '\n' + line
+                    self._tail_repaired = True
+                self._tail_checked = True
+
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(line + '\n')
+                f.flush()
+                os.fsync(f.fileno())
+            self._appends_since_compact += 1
+            need_compact = (self.compact_every > 0 and
+                            self._appends_since_compact >= self.compact_every)
+
+        if need_compact:
+            self.compact()
+
+    def _ends_with_newline(self) -> bool:
+        """저널 파일이 줄바꿈으로 끝나는지 (빈 파일은 True)"""
+        try:
+            with open(self.path, 'rb') as f:
+                f.seek(0, os.SEEK_END)
+                if f.tell() == 0:
+                    return True
+                f.seek(-1, os.SEEK_END)
+                return f.read(1) == b'\n'
+        except OSError:
+            return True
+
+    def rewrite(self, records: Iterable[Dict]):
+        """저널 전체 교체 (삭제 반영용)
+
+        임시 파일에 쓰고 fsync 후 원자적으로 교체하므로
+        도중에 크래시가 나도 기존 저널은 손상되지 않습니다.
+        """
+        with self._lock:
+            self._rewrite_locked(records)
+
+    def _rewrite_locked(self, records: Iterable[Dict]):
+        """rewrite 본체 (호출자가 self._lock 보유)"""
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            for record in records:
+                f.write(json.dumps(record, ensure_ascii=False, separators=(',', ':')) + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+        _fsync_dir(self.path)
+        self._appends_since_compact = 0
+        self._tail_checked = True
+        self._tail_repaired = False
+
+    def delete_date(self, date_prefix: str) -> int:
+        """특정 날짜(YYYY-MM-DD)의 기록 삭제 - 삭제 건수 반환
+
+        읽기 → 필터 → 재작성 동안 잠금을 유지해 그 사이 추가된 기록이 사라지지 않게 합니다.
+        """
+        with self._lock:
+            kept, removed = [], 0
+            for record in self.iter_records():
+                if str(record.get('timestamp', '')).startswith(date_prefix):
+                    removed += 1
+                else:
+                    kept.append(record)
+            if removed:
+                self._rewrite_locked(kept)
+        return removed
+
+    def compact(self):
+        """저널 압축 - 손상 라인 제거 후 원자적 재작성 (읽기부터 교체까지 잠금 유지)"""
+        try:
+            with self._lock:
+                self._rewrite_locked(self.load())
+            self.logger.info(f"거래 저널 압축 완료: {self.path}")
+        except Exception as e:
+            self.logger.error(f"거래 저널 압축 실패: {e}")
+
+    def close(self):
+        """종료 처리 - 잘린 줄을 발견했을 때만 압축으로 정리 (정상 추가분은 그대로 둠)"""
+        if self._tail_repaired:
+            self.compact()
+
+    # =========================================================================
+    # 기존 파일 이전
+    # =========================================================================
+    def _migrate_legacy(self):
+        """기존 JSON 배열 파일을 저널로 이전 (저널이 없을 때 1회)"""
+        if os.path.exists(self.path):
+            return
+        if not self.legacy_path or not os.path.exists(self.legacy_path):
+            return
+
+        try:
+            records = list(iter_trade_records(self.legacy_path))
+            self.rewrite(records)
+            self.logger.info(f"거래 기록 이전 완료: {self.legacy_path} → {self.path} ({len(records)}건)")
+        except Exception as e:
+            self.logger.error(f"거래 기록 이전 실패: {e}")
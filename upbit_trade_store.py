@@ -0,0 +1,277 @@
+"""
+Upbit Trade Store v1.0
+SQLite 기반 거래 기록 저장소 for Upbit Pro Algo-Trader
+
+- timestamp / ticker / type 인덱스로 조회·집계를 SQL에서 처리
+- WAL 모드: 분석 리포트 등 다른 연결의 동시 읽기 허용
+- 기존 trade_history.json / .jsonl 가져오기
+- TradeJournal과 같은 인터페이스 (Config.TRADE_HISTORY_FILE 확장자로 선택)
+
+사용법 (기존 파일 가져오기):
+    python upbit_trade_store.py trade_history.json trade_history.db
+"""
+
+import os
+import sys
+import sqlite3
+import threading
+import logging
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence
+
+from upbit_config import Config
+from upbit_trade_journal import TradeJournal, iter_trade_records
+
+
+STORE_EXTENSIONS = ('.db', '.sqlite', '.sqlite3')
+
+# 거래 기록 컬럼 (기록 dict 키와 동일, 'id' 제외)
+TRADE_COLUMNS = ('timestamp', 'ticker', 'type', 'price', 'quantity', 'amount', 'profit', 'reason')
+
+# 정렬 허용 컬럼 (SQL 주입 방지용 화이트리스트)
+SORTABLE_COLUMNS = ('id',) + TRADE_COLUMNS
+
+
+def is_store_path(path: str) -> bool:
+    """SQLite 저장소 경로 여부 (확장자 기준)"""
+    return bool(path) and path.lower().endswith(STORE_EXTENSIONS)
+
+
+def _normalize_record(record: Dict) -> tuple:
+    """기록 dict → INSERT 파라미터 (과거 'datetime' 키도 지원)"""
+    timestamp = record.get('timestamp') or record.get('datetime') or datetime.now().isoformat()
+    price = float(record.get('price') or 0)
+    quantity = float(record.get('quantity') or 0)
+    amount = record.get('amount')
+    return (
+        str(timestamp),
+        record.get('ticker', 'UNKNOWN'),
+        record.get('type', ''),
+        price,
+        quantity,
+        float(amount) if amount is not None else price * quantity,
+        float(record.get('profit') or 0),
+        record.get('reason', '') or '',
+    )
+
+
+class TradeStore:
+    """SQLite 거래 기록 저장소"""
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS trades (
+            id        INTEGER PRIMARY KEY AUTOINCREMENT,
+            timestamp TEXT NOT NULL,
+            ticker    TEXT NOT NULL,
+            type      TEXT NOT NULL,
+            price     REAL NOT NULL DEFAULT 0,
+            quantity  REAL NOT NULL DEFAULT 0,
+            amount    REAL NOT NULL DEFAULT 0,
+            profit    REAL NOT NULL DEFAULT 0,
+            reason    TEXT NOT NULL DEFAULT ''
+        );
+        CREATE INDEX IF NOT EXISTS idx_trades_timestamp ON trades(timestamp);
+        CREATE INDEX IF NOT EXISTS idx_trades_ticker ON trades(ticker, timestamp);
+        CREATE INDEX IF NOT EXISTS idx_trades_type ON trades(type, timestamp);
+        CREATE TABLE IF NOT EXISTS meta (
+            key   TEXT PRIMARY KEY,
+            value INTEGER NOT NULL DEFAULT 0
+        );
+        INSERT OR IGNORE INTO meta (key, value) VALUES ('generation', 0);
+    """
+
+    def __init__(self, path: str = None, legacy_paths: Sequence[str] = ()):
+        """
+        Args:
+            path: DB 파일 경로
+            legacy_paths: 저장소가 비어 있을 때 가져올 기존 파일 (앞에서부터 첫 번째 존재 파일)
+        """
+        self.path = path or Config.TRADE_HISTORY_FILE
+        self.logger = logging.getLogger('UpbitTradeStore')
+        self._lock = threading.RLock()
+
+        self.conn = sqlite3.connect(self.path, timeout=10, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=FULL")
+        self.conn.executescript(self.SCHEMA)
+        self.conn.commit()
+
+        if legacy_paths and self.count() == 0:
+            for legacy in legacy_paths:
+                if legacy and os.path.exists(legacy):
+                    imported = self.import_json(legacy)
+                    self.logger.info(f"거래 기록 가져오기 완료: {legacy} → {self.path} ({imported}건)")
+                    break
+
+    # =========================================================================
+    # 기록 (TradeJournal 호환 인터페이스)
+    # =========================================================================
+    def append(self, record: Dict) -> int:
+        """거래 기록 1건 추가 (커밋 후 rowid 반환)"""
+        with self._lock:
+            cur = self.conn.execute(
+                f"INSERT INTO trades ({', '.join(TRADE_COLUMNS)}) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                _normalize_record(record)
+            )
+            self.conn.commit()
+            return cur.lastrowid
+
+    def iter_records(self) -> Iterator[Dict]:
+        """전체 기록 스트리밍 (시간순)"""
+        cur = self.conn.execute(
+            f"SELECT {', '.join(TRADE_COLUMNS)} FROM trades ORDER BY timestamp, id"
+        )
+        for row in cur:
+            yield dict(row)
+
+    def load(self) -> List[Dict]:
+        """전체 기록 리스트로 로드"""
+        return list(self.iter_records())
+
+    def rewrite(self, records: Iterable[Dict]):
+        """저장소 전체 교체 (단일 트랜잭션)"""
+        with self._lock:
+            with self.conn:
+                self.conn.execute("DELETE FROM trades")
+                self.conn.executemany(
+                    f"INSERT INTO trades ({', '.join(TRADE_COLUMNS)}) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (_normalize_record(r) for r in records)
+                )
+                self._bump_generation()
+
+    def delete_date(self, date_prefix: str) -> int:
+        """특정 날짜(YYYY-MM-DD)의 기록 삭제 - 삭제 건수 반환"""
+        with self._lock:
+            with self.conn:
+                next_day = (datetime.fromisoformat(date_prefix) + timedelta(days=1)).date().isoformat()
+                cur = self.conn.execute(
+                    "DELETE FROM trades WHERE timestamp >= ? AND timestamp < ?",
+                    (date_prefix, next_day)
+                )
+                if cur.rowcount:
+                    self._bump_generation()
+            return cur.rowcount
+
+    def _bump_generation(self):
+        """삭제/교체 세대 번호 증가 (증분 집계 캐시 무효화 신호)"""
+        self.conn.execute("UPDATE meta SET value = value + 1 WHERE key = 'generation'")
+
+    def compact(self):
+        """WAL 체크포인트 (저널 압축에 대응)"""
+        with self._lock:
+            try:
+                self.conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            except sqlite3.Error as e:
+                self.logger.error(f"WAL 체크포인트 실패: {e}")
+
+    def close(self):
+        """연결 종료"""
+        with self._lock:
+            self.compact()
+            self.conn.close()
+
+    # =========================================================================
+    # 가져오기
+    # =========================================================================
+    def import_json(self, path: str) -> int:
+        """기존 거래 기록 파일(JSON 배열 / JSON Lines) 가져오기"""
+        count = 0
+
+        def _rows():
+            nonlocal count
+            for record in iter_trade_records(path):
+                count += 1
+                yield _normalize_record(record)
+
+        with self._lock:
+            with self.conn:
+                self.conn.executemany(
+                    f"INSERT INTO trades ({', '.join(TRADE_COLUMNS)}) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    _rows()
+                )
+        return count
+
+    # =========================================================================
+    # 조회 (히스토리 탭용)
+    # =========================================================================
+    @staticmethod
+    def _where(ticker: Optional[str] = None, trade_type: Optional[str] = None,
+               since: Optional[str] = None) -> tuple:
+        clauses, params = [], []
+        if ticker:
+            clauses.append("ticker = ?")
+            params.append(ticker)
+        if trade_type:
+            clauses.append("type = ?")
+            params.append(trade_type)
+        if since:
+            clauses.append("timestamp >= ?")
+            params.append(since)
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        return where, params
+
+    def count(self, ticker: Optional[str] = None, trade_type: Optional[str] = None) -> int:
+        """기록 건수"""
+        where, params = self._where(ticker, trade_type)
+        return self.conn.execute(f"SELECT COUNT(*) FROM trades{where}", params).fetchone()[0]
+
+    def fetch(self, offset: int = 0, limit: int = 100, order_by: str = 'timestamp',
+              descending: bool = False, ticker: Optional[str] = None,
+              trade_type: Optional[str] = None) -> List[Dict]:
+        """페이지 단위 조회 (정렬/필터는 SQL에서 처리)"""
+        if order_by not in SORTABLE_COLUMNS:
+            order_by = 'timestamp'
+        direction = 'DESC' if descending else 'ASC'
+        where, params = self._where(ticker, trade_type)
+        cur = self.conn.execute(
+            f"SELECT id, {', '.join(TRADE_COLUMNS)} FROM trades{where} "
+            f"ORDER BY {order_by} {direction}, id {direction} LIMIT ? OFFSET ?",
+            params + [limit, offset]
+        )
+        return [dict(row) for row in cur]
+
+    def fetch_since(self, last_id: int = 0, limit: Optional[int] = None) -> List[Dict]:
+        """rowid가 last_id보다 큰 기록 조회 (증분 집계용, PK 범위 스캔)"""
+        sql = f"SELECT id, {', '.join(TRADE_COLUMNS)} FROM trades WHERE id > ? ORDER BY id"
+        params = [last_id]
+        if limit:
+            sql += " LIMIT ?"
+            params.append(limit)
+        return [dict(row) for row in self.conn.execute(sql, params)]
+
+    def generation(self) -> int:
+        """삭제/교체 세대 번호 - 바뀌면 기존 기록이 변경된 것"""
+        row = self.conn.execute("SELECT value FROM meta WHERE key = 'generation'").fetchone()
+        return row[0] if row else 0
+
+    def tickers(self) -> List[str]:
+        """기록된 코인 목록"""
+        cur = self.conn.execute("SELECT DISTINCT ticker FROM trades ORDER BY ticker")
+        return [row[0] for row in cur]
+
+
+def open_trade_history(path: str = None, legacy_paths: Sequence[str] = ()):
+    """Config.TRADE_HISTORY_FILE 확장자에 맞는 거래 기록 저장소 생성
+
+    .db / .sqlite → TradeStore, 그 외 → TradeJournal (JSON Lines)
+    """
+    path = path or Config.TRADE_HISTORY_FILE
+    if is_store_path(path):
+        return TradeStore(path, legacy_paths=legacy_paths)
+
+    legacy = next((p for p in legacy_paths if p and p != path and os.path.exists(p)), None)
+    return TradeJournal(path, legacy_path=legacy)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("사용법: python upbit_trade_store.py <trade_history.json> [trade_history.db]")
+        sys.exit(1)
+
+    src = sys.argv[1]
+    dst = sys.argv[2] if len(sys.argv) > 2 else Config.TRADE_HISTORY_FILE
+    store = TradeStore(dst)
+    imported = store.import_json(src)
+    store.close()
+    print(f"{src} → {dst}: {imported}건 가져오기 완료")
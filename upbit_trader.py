@@ -16,51 +16,38 @@ v2.7 기능:
 - 완료 후 자동매매 시작 옵션
 """
 
+import time
+_STARTUP_T0 = time.perf_counter()  # 시작 시간 리포트 기준점
+
 import sys
 import os
 import json
 import datetime
-import time
 import logging
 # import threading  # v2.7: 미사용 - 제거
 import gc
 from pathlib import Path
-import winreg
 
-try:
-    import pyupbit
-    import pandas as pd
-except ImportError:
+from upbit_startup import StartupProfiler, module_available, lazy_import, preload
+
+# pyupbit(+pandas)는 로드에 0.5초 이상 걸리므로 창 표시 후 로드 (첫 속성 접근 시)
+if not module_available('pyupbit'):
     print("pyupbit 라이브러리가 필요합니다. 'pip install pyupbit' 명령으로 설치해주세요.")
     sys.exit(1)
+pyupbit = lazy_import('pyupbit')
 
 from PyQt6.QtWidgets import *
 from PyQt6.QtCore import *
-from PyQt6.QtGui import QColor, QFont, QAction, QIcon, QTextCursor
-
-# v2.7: 확장 모듈 import (선택적)
-try:
-    from upbit_analytics import UpbitTradingAnalytics
-    ANALYTICS_AVAILABLE = True
-except ImportError:
-    ANALYTICS_AVAILABLE = False
-
-try:
-    from upbit_indicators import UpbitAdvancedIndicators
-    INDICATORS_AVAILABLE = True
-except ImportError:
-    INDICATORS_AVAILABLE = False
+from PyQt6.QtGui import QColor, QFont, QAction, QIcon
 
-try:
-    from upbit_backtester import UpbitBacktestEngine, volatility_breakout_strategy
-    BACKTESTER_AVAILABLE = True
-except ImportError:
-    BACKTESTER_AVAILABLE = False
+# v2.7: 확장 모듈 (선택적) - 설치 여부만 확인, 메뉴 실행 시 import
+ANALYTICS_AVAILABLE = module_available('upbit_analytics')
+INDICATORS_AVAILABLE = module_available('upbit_indicators')
+BACKTESTER_AVAILABLE = module_available('upbit_backtester')
 
 # v3.0: 분리된 모듈 import
 try:
     from upbit_config import Config as ConfigV3
-    from upbit_strategy import UpbitStrategyManager
     from upbit_dialogs import (
         PresetManagerDialog as PresetManagerDialogV3,
         HelpDialog as HelpDialogV3,
@@ -72,6 +59,17 @@ try:
 except ImportError:
     V3_MODULES_AVAILABLE = False
 
+from upbit_trade_store import open_trade_history
+from upbit_state import StateStore
+from upbit_engine import TradingEngine, TradingSettings, EngineListener, PollSchedule, read_settings_file
+from upbit_scanner import format_candidates
+from upbit_history_model import TradeHistoryModel
+from upbit_table_buffer import TableUpdateBuffer
+from upbit_log_pipeline import setup_queue_logging, LogRingBuffer, LogPaneSink
+
+STARTUP = StartupProfiler(_STARTUP_T0)
+STARTUP.mark("모듈 import")
+
 # ============================================================================
 # 설정 클래스
 # ============================================================================
@@ -167,10 +165,21 @@ class Config:
     DEFAULT_ADX_THRESHOLD = 25  # ADX >= 이 값이면 추세 강함
     DEFAULT_USE_DMI = False
     
+    # 전 종목 스캐너 - 감시 코인 자동 구성 시 상위 N개
+    SCANNER_TOP_N = 10
+    
+    # 자동 유니버스 (24시간 거래대금 상위 N종목, 매매 중 주기적 갱신)
+    DEFAULT_USE_AUTO_UNIVERSE = False
+    DEFAULT_AUTO_UNIVERSE_TOP_N = 10
+    DEFAULT_AUTO_UNIVERSE_REFRESH_MINUTES = 60
+    
     # 파일 경로
     SETTINGS_FILE = "upbit_settings.json"
     PRESETS_FILE = "upbit_presets.json"
-    TRADE_HISTORY_FILE = "trade_history.json"  # v2.5 신규
+    TRADE_HISTORY_FILE = "trade_history.db"  # .db → SQLite 저장소, .jsonl → 추가 전용 저널
+    TRADE_JOURNAL_FILE = "trade_history.jsonl"
+    LEGACY_TRADE_HISTORY_FILE = "trade_history.json"  # v2.5 형식 (자동 이전)
+    TRADE_JOURNAL_COMPACT_EVERY = 1000  # N건 추가마다 저널 압축
     LOG_DIR = "logs"
     
     # 가격 갱신 주기 (초)
@@ -183,6 +192,17 @@ class Config:
     # 메모리 관리 (v2.5 신규)
     MAX_LOG_LINES = 500
     
+    # 로그 파이프라인
+    LOG_MAX_BYTES = 5 * 1024 * 1024  # 파일 로그 로테이션 크기
+    LOG_BACKUP_COUNT = 5
+    LOG_FLUSH_INTERVAL_MS = 200  # 화면 로그 일괄 반영 주기
+    
+    # 모니터링 테이블 최대 갱신 횟수 (초당)
+    TABLE_REFRESH_FPS = 5
+    
+    # 창 표시 후 pyupbit/pandas 미리 로드까지 대기
+    STARTUP_PRELOAD_DELAY_MS = 1500
+    
     # 기본 프리셋 정의
     DEFAULT_PRESETS = {
         "aggressive": {
@@ -949,11 +969,15 @@ class SettingsDialog(QDialog):
 # 가격 갱신 스레드
 # ============================================================================
 class PriceUpdateThread(QThread):
-    """실시간 가격 갱신 스레드"""
-    price_updated = pyqtSignal(dict)
+    """실시간 가격 갱신 스레드 (현재가 스냅샷 목록을 sink로 전달 - 엔진 우편함)
+
+    종목별 조회 주기는 intervals(엔진 poll_intervals)를 따르고, 기한이 된 종목만 묶어 조회
+    """
     
-    def __init__(self, parent=None):
+    def __init__(self, sink, intervals=None, parent=None):
         super().__init__(parent)
+        self.sink = sink
+        self.schedule = PollSchedule(Config.PRICE_UPDATE_INTERVAL, intervals)
         self.coin_list = []
         self.is_running = False
     
@@ -963,18 +987,138 @@ class PriceUpdateThread(QThread):
     def run(self):
         self.is_running = True
         while self.is_running and self.coin_list:
-            try:
-                prices = pyupbit.get_current_price(self.coin_list)
-                if prices:
-                    self.price_updated.emit(prices if isinstance(prices, dict) else {self.coin_list[0]: prices})
-            except Exception as e:
-                logging.warning(f"가격 조회 실패: {e}")
-            time.sleep(Config.PRICE_UPDATE_INTERVAL)
+            coins = self.coin_list
+            now = time.monotonic()
+            due = self.schedule.due(coins, now)
+            if due:
+                try:
+                    snapshots = pyupbit.get_current_price(due, verbose=True)
+                    if snapshots:
+                        self.sink(snapshots if isinstance(snapshots, list) else [snapshots])
+                except Exception as e:
+                    logging.warning(f"가격 조회 실패: {e}")
+                self.schedule.mark(due, now)
+            # 종료 반응을 위해 최대 PRICE_UPDATE_INTERVAL씩 대기 (기한 전이면 요청 없음)
+            time.sleep(min(self.schedule.wait(coins, time.monotonic()), Config.PRICE_UPDATE_INTERVAL))
     
     def stop(self):
         self.is_running = False
 
 
+class MainThreadInvoker(QObject):
+    """워커 스레드 → Qt 메인 스레드 호출 전달 (엔진 post 함수)"""
+    _invoke = pyqtSignal(object)
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._invoke.connect(self._run)  # 수신 객체가 메인 스레드 → 큐 연결
+    
+    def post(self, func):
+        """어느 스레드에서나 호출 가능"""
+        self._invoke.emit(func)
+    
+    @pyqtSlot(object)
+    def _run(self, func):
+        func()
+
+
+class MarketScanThread(QThread):
+    """KRW 전 종목 스캔 스레드 (캔들 조회로 수 초 ~ 수십 초 소요)"""
+    scan_finished = pyqtSignal(list)
+    scan_failed = pyqtSignal(str)
+    
+    def __init__(self, engine, top_n, parent=None):
+        super().__init__(parent)
+        self.engine = engine
+        self.top_n = top_n
+    
+    def run(self):
+        try:
+            self.scan_finished.emit(self.engine.scan_market(self.top_n))
+        except Exception as e:
+            self.scan_failed.emit(str(e))
+
+
+# ============================================================================
+# 엔진 이벤트 → 화면 반영
+# ============================================================================
+# 종목 상태 → (표시 텍스트, 배경색)
+STATE_DISPLAY = {
+    '감시중': ("👀 감시중", "#00b894"),
+    '주문중': ("⏳ 주문중", "#ffc107"),
+    '보유중': ("💼 보유중", "#00b4d8"),
+    '매도완료': ("✅ 청산완료", "#6c757d"),
+    '체결확인실패': ("❓ 확인필요", "#ffc107"),
+}
+
+
+class TraderEngineListener(EngineListener):
+    """TradingEngine 이벤트를 메인 윈도우 위젯에 반영 (Qt 메인 스레드에서 호출됨)"""
+
+    def __init__(self, trader):
+        self.trader = trader
+
+    def log(self, msg):
+        self.trader.log(msg)
+
+    def universe_cleared(self):
+        self.trader.table.setRowCount(0)
+        self.trader.table_buffer.clear()
+
+    def ticker_added(self, ticker, info):
+        buf = self.trader.table_buffer
+        row = info['row']
+        current = info['current']
+        self.trader.table.insertRow(row)
+        buf.set(row, 0, ticker)
+        buf.set(row, 1, f"{current:,.0f}" if current else "-")
+        buf.set(row, 2, f"{info['target']:,.0f}")
+        buf.set(row, 3, f"{info['ma5']:,.0f}")
+        self.state_changed(ticker, info)
+
+    def ticker_removed(self, ticker, row):
+        self.trader.table_buffer.remove_row(row)
+
+    def target_changed(self, ticker, info):
+        buf = self.trader.table_buffer
+        buf.set(info['row'], 2, f"{info['target']:,.0f}")
+        buf.set(info['row'], 3, f"{info['ma5']:,.0f}")
+
+    def universe_changed(self, tickers):
+        self.trader.on_universe_changed(tickers)
+
+    def price_changed(self, ticker, info):
+        self.trader.table_buffer.set(info['row'], 1, f"{info['current']:,.0f}")
+
+    def profit_changed(self, ticker, info, profit_rate):
+        buf = self.trader.table_buffer
+        buf.set(info['row'], 7, f"{profit_rate:.2f}%",
+                "#e63946" if profit_rate >= 0 else "#4361ee")
+        buf.set(info['row'], 8, f"{info['max_profit_rate']:.2f}%")
+
+    def state_changed(self, ticker, info):
+        text, color = STATE_DISPLAY.get(info['state'], (info['state'], "#6c757d"))
+        self.trader.set_table_item(info['row'], 4, text, color)
+
+    def position_changed(self, ticker, info):
+        buf = self.trader.table_buffer
+        row = info['row']
+        buf.set(row, 5, f"{info['qty']:.8f}")
+        buf.set(row, 6, f"{info['buy_price']:,.0f}")
+        buf.set(row, 9, f"{info['invest_amt']:,.0f}")
+
+    def trade_recorded(self, record, rowid):
+        self.trader.on_trade_recorded(record, rowid)
+
+    def stats_changed(self):
+        profit = self.trader.engine.total_realized_profit
+        self.trader.lbl_total_profit.setText(f"📈 당일 실현손익: {profit:,.0f}원")
+        self.trader._update_statistics()
+
+    def balance_changed(self, balance):
+        self.trader.lbl_balance.setText(f"💰 주문가능금액: {balance:,.0f} 원")
+
+
 # ============================================================================
 # 메인 트레이더 클래스
 # ============================================================================
@@ -982,18 +1126,6 @@ class UpbitProTrader(QMainWindow):
     def __init__(self):
         super().__init__()
         
-        # 내부 변수 초기화
-        self.upbit = None
-        self.universe = {}
-        self.balance = 0
-        self.initial_balance = 0
-        self.total_realized_profit = 0
-        self.trade_count = 0
-        self.win_count = 0
-        self.is_running = False
-        self.is_connected = False
-        self.daily_loss_triggered = False
-        
         # 시스템 설정 초기화
         self.system_settings = {
             'minimize_to_tray': True,
@@ -1004,14 +1136,6 @@ class UpbitProTrader(QMainWindow):
             'sound_enabled': False
         }
         
-        # v3.0: 전략 매니저 초기화
-        if V3_MODULES_AVAILABLE:
-            self.strategy = UpbitStrategyManager(self)
-            self.logger_main = logging.getLogger('UpbitTrader')
-            self.logger_main.info("v3.0 전략 매니저 로드됨")
-        else:
-            self.strategy = None
-        
         # v3.0: 고급 기능 설정 초기화
         self.advanced_settings = {
             'use_cooldown': False,
@@ -1023,21 +1147,36 @@ class UpbitProTrader(QMainWindow):
             'use_gap_analysis': False,
             'use_breakout_confirm': False,
             'breakout_confirm_ticks': 3,
+            'breakout_confirm_seconds': 0,
         }
         
         # v2.5 신규: 거래 히스토리
-        self.trade_history = []
         self.load_trade_history()
-        
-        # 가격 갱신 스레드
-        self.price_thread = PriceUpdateThread()
-        self.price_thread.price_updated.connect(self.on_price_update)
+        self.analytics = None  # 분석 리포트용 (증분 집계 유지를 위해 재사용)
+        
+        # 매매 엔진 (GUI 독립 코어) - 이 창은 엔진 이벤트를 받아 화면만 갱신
+        # 체결 확인 등 지연 작업은 QTimer로 예약해 Qt 메인 스레드에서 실행
+        # 캔들 경계 갱신의 캔들 조회 결과는 invoker로 메인 스레드에 전달
+        self.invoker = MainThreadInvoker(self)
+        self.engine = TradingEngine(
+            trade_store=self.trade_store,
+            scheduler=lambda delay, func: QTimer.singleShot(int(delay * 1000), func),
+            listener=TraderEngineListener(self),
+            post=self.invoker.post,
+            state_store=StateStore()  # 매매 상태 스냅샷 + 변경 로그 (재시작 시 이어가기)
+        )
+        self.strategy = self.engine.strategy  # v3.0 전략 매니저 (엔진 설정 사용)
+        self.scan_thread = None
+        
+        # 가격 갱신 스레드 → 엔진 우편함 (엔진이 바쁘면 종목별 최신 가격만 전달)
+        self.price_thread = PriceUpdateThread(self.engine.mailbox.put, lambda: self.engine.poll_intervals)
         
         # 로깅 설정
         self.setup_logging()
         
         # UI 초기화
         self.init_ui()
+        STARTUP.mark("UI 구성")
         
         # 메뉴바 설정
         self.create_menu_bar()
@@ -1048,14 +1187,33 @@ class UpbitProTrader(QMainWindow):
         # 타이머 설정
         self.setup_timers()
         
-        # 설정 불러오기
+        # 설정 불러오기 (이후 위젯 변경은 엔진 설정에 즉시 반영)
         self.load_settings()
+        self._connect_settings_sync()
         
         # 처음 실행 확인
         self.check_first_run()
+        STARTUP.mark("설정/트레이")
         
         self.logger.info("프로그램 초기화 완료 (v3.0)")
 
+    def on_startup_shown(self):
+        """첫 이벤트 루프 진입 (창 표시 완료) - 시작 시간 리포트 후 지연 모듈 미리 로드"""
+        STARTUP.mark("창 표시")
+        STARTUP.log(self.logger)
+        QTimer.singleShot(Config.STARTUP_PRELOAD_DELAY_MS, self._preload_modules)
+
+    def _preload_modules(self):
+        """로그인/매매 시작 전에 pyupbit 미리 로드 (메인 스레드)
+
+        가격 갱신 스레드가 처음 로드하지 않도록 메인 스레드에서 로드합니다.
+        """
+        try:
+            elapsed = preload('pyupbit')
+            self.logger.info(f"⏱️ 지연 로드: pyupbit {elapsed:.2f}초")
+        except Exception as e:
+            self.logger.error(f"pyupbit 로드 실패: {e}")
+
     def setup_logging(self):
         """로깅 시스템 설정"""
         log_dir = Path(Config.LOG_DIR)
@@ -1066,17 +1224,16 @@ class UpbitProTrader(QMainWindow):
         self.logger = logging.getLogger('UpbitTrader')
         self.logger.setLevel(logging.DEBUG)
         
+        # 파일 기록은 백그라운드 스레드에서 (호출 스레드는 큐에 넣기만 함)
+        self.log_listener = None
         if not self.logger.handlers:
-            file_handler = logging.FileHandler(log_file, encoding='utf-8')
-            file_handler.setLevel(logging.DEBUG)
-            file_handler.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(message)s'))
-            
-            console_handler = logging.StreamHandler()
-            console_handler.setLevel(logging.INFO)
-            console_handler.setFormatter(logging.Formatter('%(levelname)s - %(message)s'))
-            
-            self.logger.addHandler(file_handler)
-            self.logger.addHandler(console_handler)
+            self.log_listener = setup_queue_logging(
+                self.logger, str(log_file),
+                max_bytes=Config.LOG_MAX_BYTES, backup_count=Config.LOG_BACKUP_COUNT
+            )
+        
+        # 화면 로그 링 버퍼 (LogPaneSink가 주기적으로 반영)
+        self.log_buffer = LogRingBuffer(Config.MAX_LOG_LINES)
 
     def init_ui(self):
         """UI 초기화"""
@@ -1195,7 +1352,12 @@ class UpbitProTrader(QMainWindow):
         self.input_coins = QLineEdit(Config.DEFAULT_COINS)
         self.input_coins.setPlaceholderText("예: KRW-BTC,KRW-ETH,KRW-XRP")
         self.input_coins.setToolTip(Config.TOOLTIPS['coins'])
-        layout.addWidget(self.input_coins, 0, 1, 1, 5)
+        layout.addWidget(self.input_coins, 0, 1, 1, 4)
+        
+        self.btn_scan = QPushButton("🔎 전 종목 스캔")
+        self.btn_scan.setToolTip(f"KRW 전 종목에서 돌파 후보를 찾아 상위 {Config.SCANNER_TOP_N}개로 감시 코인을 구성합니다.")
+        self.btn_scan.clicked.connect(self.scan_market)
+        layout.addWidget(self.btn_scan, 0, 5)
         
         # 캔들 간격
         layout.addWidget(QLabel("🕐 캔들 간격:"), 1, 0)
@@ -1367,6 +1529,31 @@ class UpbitProTrader(QMainWindow):
         group_vol.setLayout(vol_layout)
         layout.addWidget(group_vol)
         
+        # 자동 유니버스
+        group_universe = QGroupBox("🌐 자동 유니버스 (거래대금 상위)")
+        universe_layout = QGridLayout()
+        
+        self.chk_auto_universe = QCheckBox("감시 코인 자동 선택 (24시간 거래대금 상위)")
+        self.chk_auto_universe.setChecked(Config.DEFAULT_USE_AUTO_UNIVERSE)
+        self.chk_auto_universe.setToolTip("매매 시작 시 입력한 코인 대신 거래대금 상위 종목을 감시합니다.\n매매 중에도 주기적으로 순위를 다시 확인해 종목을 추가/제거합니다.\n(보유 중인 종목은 청산 후 제거)")
+        universe_layout.addWidget(self.chk_auto_universe, 0, 0, 1, 4)
+        
+        universe_layout.addWidget(QLabel("상위 종목 수:"), 1, 0)
+        self.spin_auto_top_n = QSpinBox()
+        self.spin_auto_top_n.setRange(1, 50)
+        self.spin_auto_top_n.setValue(Config.DEFAULT_AUTO_UNIVERSE_TOP_N)
+        universe_layout.addWidget(self.spin_auto_top_n, 1, 1)
+        
+        universe_layout.addWidget(QLabel("갱신 주기:"), 1, 2)
+        self.spin_auto_refresh = QSpinBox()
+        self.spin_auto_refresh.setRange(5, 1440)
+        self.spin_auto_refresh.setValue(Config.DEFAULT_AUTO_UNIVERSE_REFRESH_MINUTES)
+        self.spin_auto_refresh.setSuffix(" 분")
+        universe_layout.addWidget(self.spin_auto_refresh, 1, 3)
+        
+        group_universe.setLayout(universe_layout)
+        layout.addWidget(group_universe)
+        
         # 리스크 관리
         group_risk = QGroupBox("🛡️ 리스크 관리")
         risk_layout = QGridLayout()
@@ -1459,6 +1646,15 @@ class UpbitProTrader(QMainWindow):
             self.spin_breakout_ticks.setValue(3)
             adv_algo_layout.addWidget(self.spin_breakout_ticks, 1, 2)
             
+            adv_algo_layout.addWidget(QLabel("유지 시간:"), 1, 3)
+            self.spin_breakout_seconds = QSpinBox()
+            self.spin_breakout_seconds.setRange(0, 300)
+            self.spin_breakout_seconds.setValue(0)
+            self.spin_breakout_seconds.setSuffix("초")
+            self.spin_breakout_seconds.setSpecialValueText("사용 안 함")
+            self.spin_breakout_seconds.setToolTip("목표가 이상으로 유지되어야 하는 시간 (틱 수와 함께 확인)")
+            adv_algo_layout.addWidget(self.spin_breakout_seconds, 1, 4)
+            
             group_adv_algo.setLayout(adv_algo_layout)
             layout.addWidget(group_adv_algo)
             
@@ -1590,6 +1786,18 @@ class UpbitProTrader(QMainWindow):
         
         btn_layout.addStretch(1)
         
+        # 코인/구분 필터 (모델에서 처리)
+        self.combo_history_ticker = QComboBox()
+        self.combo_history_ticker.addItem("전체 코인", None)
+        self.combo_history_ticker.currentIndexChanged.connect(self._apply_history_filter)
+        btn_layout.addWidget(self.combo_history_ticker)
+        
+        self.combo_history_type = QComboBox()
+        for label, trade_type in (("전체 구분", None), ("매수", "BUY"), ("매도", "SELL"), ("분할매도", "PARTIAL_SELL")):
+            self.combo_history_type.addItem(label, trade_type)
+        self.combo_history_type.currentIndexChanged.connect(self._apply_history_filter)
+        btn_layout.addWidget(self.combo_history_type)
+        
         btn_clear = QPushButton("🗑️ 오늘 기록 삭제")
         btn_clear.clicked.connect(self.clear_today_history)
         btn_layout.addWidget(btn_clear)
@@ -1600,29 +1808,47 @@ class UpbitProTrader(QMainWindow):
         
         layout.addLayout(btn_layout)
         
-        # 거래 내역 테이블
-        self.history_table = QTableWidget()
-        history_cols = ["시간", "코인", "구분", "가격", "금액", "손익", "사유"]
-        self.history_table.setColumnCount(len(history_cols))
-        self.history_table.setHorizontalHeaderLabels(history_cols)
+        # 거래 내역 테이블 (모델/뷰 - 보이는 행만 지연 로드)
+        self.history_model = TradeHistoryModel(self.trade_store, self)
+        self.history_model.count_changed.connect(
+            lambda total: self.lbl_history_count.setText(f"📝 총 {total}건의 거래 기록")
+        )
+        
+        self.history_table = QTableView()
+        self.history_table.setModel(self.history_model)
         self.history_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
         self.history_table.setAlternatingRowColors(True)
-        self.history_table.setSelectionBehavior(QTableWidget.SelectionBehavior.SelectRows)
-        self.history_table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        self.history_table.setSelectionBehavior(QTableView.SelectionBehavior.SelectRows)
+        self.history_table.setEditTriggers(QTableView.EditTrigger.NoEditTriggers)
         self.history_table.verticalHeader().setDefaultSectionSize(30)
+        self.history_table.setSortingEnabled(True)
+        self.history_table.sortByColumn(0, Qt.SortOrder.DescendingOrder)
         
         layout.addWidget(self.history_table)
         
-        # 기존 히스토리 로드
-        self._load_history_to_table()
+        self._refresh_history_tickers()
+        self.lbl_history_count.setText(f"📝 총 {self.history_model.total_count()}건의 거래 기록")
         
         return widget
 
-    def _load_history_to_table(self):
-        """기존 거래 기록을 테이블에 로드"""
-        for record in self.trade_history:
-            self._add_history_row(record)
-        self.lbl_history_count.setText(f"📝 총 {len(self.trade_history)}건의 거래 기록")
+    def _apply_history_filter(self):
+        """히스토리 코인/구분 필터 적용"""
+        self.history_model.set_filter(
+            self.combo_history_ticker.currentData(),
+            self.combo_history_type.currentData()
+        )
+
+    def _refresh_history_tickers(self):
+        """필터 콤보에 기록된 코인 목록 반영"""
+        current = self.combo_history_ticker.currentData()
+        self.combo_history_ticker.blockSignals(True)
+        self.combo_history_ticker.clear()
+        self.combo_history_ticker.addItem("전체 코인", None)
+        for ticker in self.history_model.tickers():
+            self.combo_history_ticker.addItem(ticker, ticker)
+        index = self.combo_history_ticker.findData(current)
+        self.combo_history_ticker.setCurrentIndex(max(index, 0))
+        self.combo_history_ticker.blockSignals(False)
 
     def clear_today_history(self):
         """오늘의 거래 기록 삭제"""
@@ -1632,16 +1858,21 @@ class UpbitProTrader(QMainWindow):
             QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No)
         
         if reply == QMessageBox.StandardButton.Yes:
-            self.trade_history = [r for r in self.trade_history 
-                                  if not r['timestamp'].startswith(today)]
-            self.save_trade_history()
-            self.history_table.setRowCount(0)
-            self._load_history_to_table()
+            try:
+                self.trade_store.delete_date(today)
+            except Exception as e:
+                self.logger.error(f"거래 기록 삭제 실패: {e}")
+            self.history_model.reset_records()
+            self._refresh_history_tickers()
             self.log("🗑️ 오늘의 거래 기록이 삭제되었습니다")
 
+    def _has_trade_records(self) -> bool:
+        """저장된 거래 기록 존재 여부 (첫 건만 확인)"""
+        return next(iter(self.trade_store.iter_records()), None) is not None
+
     def export_history(self):
         """거래 기록 내보내기"""
-        if not self.trade_history:
+        if not self._has_trade_records():
             QMessageBox.information(self, "알림", "내보낼 거래 기록이 없습니다.")
             return
         
@@ -1651,7 +1882,7 @@ class UpbitProTrader(QMainWindow):
             with open(filename, 'w', newline='', encoding='utf-8-sig') as f:
                 writer = csv.DictWriter(f, fieldnames=['timestamp', 'ticker', 'type', 'price', 'quantity', 'amount', 'profit', 'reason'])
                 writer.writeheader()
-                writer.writerows(self.trade_history)
+                writer.writerows(self.trade_store.iter_records())
             QMessageBox.information(self, "완료", f"거래 기록이 {filename}에 저장되었습니다.")
             self.log(f"💾 거래 기록 내보내기: {filename}")
         except Exception as e:
@@ -1674,11 +1905,16 @@ class UpbitProTrader(QMainWindow):
         self.table.setMinimumHeight(200)
         self.table.verticalHeader().setDefaultSectionSize(35)  # 행 높이 증가
         
+        # 셀 갱신은 버퍼에 모았다가 주기적으로 반영 (틱마다 아이템 생성 방지)
+        self.table_buffer = TableUpdateBuffer(self.table, Config.TABLE_REFRESH_FPS)
+        
         # 로그 창
-        self.log_text = QTextEdit()
+        self.log_text = QPlainTextEdit()
         self.log_text.setMinimumHeight(150)
         self.log_text.setReadOnly(True)
         self.log_text.setPlaceholderText("로그가 여기에 표시됩니다...")
+        self.log_sink = LogPaneSink(self.log_text, self.log_buffer,
+                                    Config.MAX_LOG_LINES, Config.LOG_FLUSH_INTERVAL_MS)
         
         splitter.addWidget(self.table)
         splitter.addWidget(self.log_text)
@@ -1895,6 +2131,8 @@ class UpbitProTrader(QMainWindow):
 
     def set_startup_registry(self, enable):
         """Windows 시작 프로그램 레지스트리 설정"""
+        import winreg  # Windows 전용 - 설정 변경 시에만 필요
+        
         key_path = r"Software\Microsoft\Windows\CurrentVersion\Run"
         app_name = "UpbitProTrader"
         
@@ -1939,54 +2177,117 @@ class UpbitProTrader(QMainWindow):
         self.status_time.setText(now.strftime("%Y-%m-%d %H:%M:%S"))
         
         # v2.7: 자정 일일 통계 초기화
-        if not hasattr(self, '_last_reset_date'):
-            self._last_reset_date = now.date()
-        
-        if now.date() != self._last_reset_date:
-            self._last_reset_date = now.date()
-            self._reset_daily_stats()
-    
-    def _reset_daily_stats(self):
-        """일일 통계 초기화 (자정 자동 실행)"""
-        self.daily_loss_triggered = False
-        self.total_realized_profit = 0
-        self.trade_count = 0
-        self.win_count = 0
-        
-        # UI 업데이트
-        self.lbl_total_profit.setText("📈 당일 실현손익: 0원")
-        self._update_statistics()
-        
-        self.log("📅 일일 통계 초기화 (자정)")
-        self.logger.info("일일 통계 초기화")
+        self.engine.check_day_rollover(now)
 
     # ------------------------------------------------------------------
     # 설정 저장/불러오기
     # ------------------------------------------------------------------
+    def current_settings(self) -> TradingSettings:
+        """위젯 값 → 엔진 설정 객체"""
+        settings = TradingSettings(
+            coins=[c for c in self.input_coins.text().replace(" ", "").split(',') if c],
+            candle=self.combo_candle.currentText(),
+            betting_ratio=self.spin_betting.value(),
+            k_value=self.spin_k.value(),
+            ts_start=self.spin_ts_start.value(),
+            ts_stop=self.spin_ts_stop.value(),
+            loss_cut=self.spin_loss.value(),
+            use_rsi=self.chk_use_rsi.isChecked(),
+            rsi_upper=self.spin_rsi_upper.value(),
+            rsi_period=self.spin_rsi_period.value(),
+            use_macd=self.chk_use_macd.isChecked(),
+            use_volume=self.chk_use_volume.isChecked(),
+            volume_mult=self.spin_volume_mult.value(),
+            use_risk=self.chk_use_risk.isChecked(),
+            max_daily_loss=self.spin_max_loss.value(),
+            max_holdings=self.spin_max_holdings.value(),
+            use_partial_tp=self.chk_use_partial_tp.isChecked(),
+            auto_universe=self.chk_auto_universe.isChecked(),
+            auto_universe_top_n=self.spin_auto_top_n.value(),
+            auto_universe_refresh_minutes=self.spin_auto_refresh.value(),
+        )
+        # v3.0 고급 기능 (모듈이 있을 때만 위젯 존재)
+        if hasattr(self, 'chk_use_cooldown'):
+            settings.use_cooldown = self.chk_use_cooldown.isChecked()
+            settings.cooldown_minutes = self.spin_cooldown.value()
+            settings.use_time_exit = self.chk_use_time_exit.isChecked()
+            settings.max_holding_hours = self.spin_max_holding_hours.value()
+            settings.use_dynamic_position = self.chk_use_dynamic_position.isChecked()
+            settings.use_mtf = self.chk_use_mtf.isChecked()
+            settings.use_gap_analysis = self.chk_use_gap.isChecked()
+            settings.use_breakout_confirm = self.chk_use_breakout_confirm.isChecked()
+            settings.breakout_confirm_ticks = self.spin_breakout_ticks.value()
+            settings.breakout_confirm_seconds = self.spin_breakout_seconds.value()
+        return settings
+
+    def apply_settings_to_widgets(self, settings: TradingSettings):
+        """엔진 설정 객체 → 위젯 값"""
+        self.input_coins.setText(",".join(settings.coins))
+        self.combo_candle.setCurrentText(settings.candle)
+        self.spin_betting.setValue(settings.betting_ratio)
+        self.spin_k.setValue(settings.k_value)
+        self.spin_ts_start.setValue(settings.ts_start)
+        self.spin_ts_stop.setValue(settings.ts_stop)
+        self.spin_loss.setValue(settings.loss_cut)
+        self.chk_use_rsi.setChecked(settings.use_rsi)
+        self.spin_rsi_upper.setValue(settings.rsi_upper)
+        self.spin_rsi_period.setValue(settings.rsi_period)
+        self.chk_use_macd.setChecked(settings.use_macd)
+        self.chk_use_volume.setChecked(settings.use_volume)
+        self.spin_volume_mult.setValue(settings.volume_mult)
+        self.chk_use_risk.setChecked(settings.use_risk)
+        self.spin_max_loss.setValue(settings.max_daily_loss)
+        self.spin_max_holdings.setValue(settings.max_holdings)
+        self.chk_use_partial_tp.setChecked(settings.use_partial_tp)
+        self.chk_auto_universe.setChecked(settings.auto_universe)
+        self.spin_auto_top_n.setValue(settings.auto_universe_top_n)
+        self.spin_auto_refresh.setValue(settings.auto_universe_refresh_minutes)
+        if hasattr(self, 'chk_use_cooldown'):
+            self.chk_use_cooldown.setChecked(settings.use_cooldown)
+            self.spin_cooldown.setValue(settings.cooldown_minutes)
+            self.chk_use_time_exit.setChecked(settings.use_time_exit)
+            self.spin_max_holding_hours.setValue(settings.max_holding_hours)
+            self.chk_use_dynamic_position.setChecked(settings.use_dynamic_position)
+            self.chk_use_mtf.setChecked(settings.use_mtf)
+            self.chk_use_gap.setChecked(settings.use_gap_analysis)
+            self.chk_use_breakout_confirm.setChecked(settings.use_breakout_confirm)
+            self.spin_breakout_ticks.setValue(settings.breakout_confirm_ticks)
+            self.spin_breakout_seconds.setValue(settings.breakout_confirm_seconds)
+
+    def _connect_settings_sync(self):
+        """전략 위젯 변경 시 엔진 설정 갱신 (매매 중 변경도 즉시 반영)"""
+        spins = [self.spin_betting, self.spin_k, self.spin_ts_start, self.spin_ts_stop,
+                 self.spin_loss, self.spin_rsi_upper, self.spin_rsi_period,
+                 self.spin_volume_mult, self.spin_max_loss, self.spin_max_holdings,
+                 self.spin_auto_top_n, self.spin_auto_refresh]
+        checks = [self.chk_use_rsi, self.chk_use_macd, self.chk_use_volume,
+                  self.chk_use_risk, self.chk_use_partial_tp, self.chk_auto_universe]
+        if hasattr(self, 'chk_use_cooldown'):
+            spins += [self.spin_cooldown, self.spin_max_holding_hours, self.spin_breakout_ticks,
+                      self.spin_breakout_seconds]
+            checks += [self.chk_use_cooldown, self.chk_use_time_exit, self.chk_use_dynamic_position,
+                       self.chk_use_mtf, self.chk_use_gap, self.chk_use_breakout_confirm]
+        for spin in spins:
+            spin.valueChanged.connect(self._sync_engine_settings)
+        for chk in checks:
+            chk.toggled.connect(self._sync_engine_settings)
+        self.combo_candle.currentTextChanged.connect(self._sync_engine_settings)
+        self.input_coins.textChanged.connect(self._sync_engine_settings)
+        self._sync_engine_settings()
+
+    def _sync_engine_settings(self, *args):
+        self.engine.settings = self.current_settings()
+
     def save_settings(self):
         """설정 저장"""
-        settings = {
-            "coins": self.input_coins.text(),
-            "candle": self.combo_candle.currentText(),
-            "betting_ratio": self.spin_betting.value(),
-            "k_value": self.spin_k.value(),
-            "ts_start": self.spin_ts_start.value(),
-            "ts_stop": self.spin_ts_stop.value(),
-            "loss_cut": self.spin_loss.value(),
-            "use_rsi": self.chk_use_rsi.isChecked(),
-            "rsi_upper": self.spin_rsi_upper.value(),
-            "rsi_period": self.spin_rsi_period.value(),
-            "use_volume": self.chk_use_volume.isChecked(),
-            "volume_mult": self.spin_volume_mult.value(),
-            "use_risk": self.chk_use_risk.isChecked(),
-            "max_daily_loss": self.spin_max_loss.value(),
-            "max_holdings": self.spin_max_holdings.value(),
+        settings = self.current_settings().to_dict()
+        settings.update({
             # v2.7: API 키 저장 (base64 인코딩)
             "access_key": self.input_access.text().strip(),
             "secret_key": self.input_secret.text().strip(),
             # 시스템 설정
             "system": self.system_settings
-        }
+        })
         
         try:
             with open(Config.SETTINGS_FILE, 'w', encoding='utf-8') as f:
@@ -1999,24 +2300,8 @@ class UpbitProTrader(QMainWindow):
         """설정 불러오기"""
         try:
             if os.path.exists(Config.SETTINGS_FILE):
-                with open(Config.SETTINGS_FILE, 'r', encoding='utf-8') as f:
-                    s = json.load(f)
-                
-                self.input_coins.setText(s.get("coins", Config.DEFAULT_COINS))
-                self.combo_candle.setCurrentText(s.get("candle", Config.DEFAULT_CANDLE))
-                self.spin_betting.setValue(s.get("betting_ratio", Config.DEFAULT_BETTING_RATIO))
-                self.spin_k.setValue(s.get("k_value", Config.DEFAULT_K_VALUE))
-                self.spin_ts_start.setValue(s.get("ts_start", Config.DEFAULT_TS_START))
-                self.spin_ts_stop.setValue(s.get("ts_stop", Config.DEFAULT_TS_STOP))
-                self.spin_loss.setValue(s.get("loss_cut", Config.DEFAULT_LOSS_CUT))
-                self.chk_use_rsi.setChecked(s.get("use_rsi", Config.DEFAULT_USE_RSI))
-                self.spin_rsi_upper.setValue(s.get("rsi_upper", Config.DEFAULT_RSI_UPPER))
-                self.spin_rsi_period.setValue(s.get("rsi_period", Config.DEFAULT_RSI_PERIOD))
-                self.chk_use_volume.setChecked(s.get("use_volume", Config.DEFAULT_USE_VOLUME))
-                self.spin_volume_mult.setValue(s.get("volume_mult", Config.DEFAULT_VOLUME_MULTIPLIER))
-                self.chk_use_risk.setChecked(s.get("use_risk", Config.DEFAULT_USE_RISK_MGMT))
-                self.spin_max_loss.setValue(s.get("max_daily_loss", Config.DEFAULT_MAX_DAILY_LOSS))
-                self.spin_max_holdings.setValue(s.get("max_holdings", Config.DEFAULT_MAX_HOLDINGS))
+                s = read_settings_file(Config.SETTINGS_FILE)
+                self.apply_settings_to_widgets(TradingSettings.from_dict(s))
                 
                 # 시스템 설정 불러오기
                 if "system" in s:
@@ -2049,28 +2334,20 @@ class UpbitProTrader(QMainWindow):
         self.lbl_connection.setStyleSheet("color: #ffc107; font-weight: bold;")
         
         try:
-            self.upbit = pyupbit.Upbit(access, secret)
-            balance = self.upbit.get_balance("KRW")
+            balance = self.engine.connect(access, secret)
             
-            if balance is not None:
-                self.is_connected = True
-                self.balance = balance
-                self.initial_balance = balance
-                
-                self.lbl_balance.setText(f"💰 주문가능금액: {balance:,.0f} 원")
-                self.lbl_connection.setText("● 연결됨")
-                self.lbl_connection.setStyleSheet("color: #00b894; font-weight: bold;")
-                self.btn_start.setEnabled(True)
-                self.btn_batch_sell.setEnabled(True)
-                self.btn_batch_buy.setEnabled(True)
-                
-                self.log(f"✅ 업비트 API 연결 성공 (잔고: {balance:,.0f}원)")
-                self.logger.info(f"API 연결 성공, 잔고: {balance:,.0f}원")
-            else:
-                raise Exception("잔고 조회 실패")
+            self.lbl_connection.setText("● 연결됨")
+            self.lbl_connection.setStyleSheet("color: #00b894; font-weight: bold;")
+            self.btn_start.setEnabled(True)
+            self.btn_batch_sell.setEnabled(True)
+            self.btn_batch_buy.setEnabled(True)
+            
+            self.log(f"✅ 업비트 API 연결 성공 (잔고: {balance:,.0f}원)")
+            self.logger.info(f"API 연결 성공, 잔고: {balance:,.0f}원")
+            
+            self.offer_resume()
                 
         except Exception as e:
-            self.is_connected = False
             self.lbl_connection.setText("● 연결 실패")
             self.lbl_connection.setStyleSheet("color: #e63946; font-weight: bold;")
             self.log(f"❌ API 연결 실패: {e}")
@@ -2078,14 +2355,8 @@ class UpbitProTrader(QMainWindow):
             QMessageBox.critical(self, "오류", f"API 연결에 실패했습니다.\n{e}")
 
     def get_balance(self):
-        """잔고 조회"""
-        if not self.upbit:
-            return
-        try:
-            self.balance = self.upbit.get_balance("KRW")
-            self.lbl_balance.setText(f"💰 주문가능금액: {self.balance:,.0f} 원")
-        except Exception as e:
-            self.logger.error(f"잔고 조회 실패: {e}")
+        """잔고 조회 (화면 반영은 balance_changed 이벤트)"""
+        self.engine.refresh_balance()
 
     # ------------------------------------------------------------------
     # 매매 시작/중지
@@ -2095,808 +2366,126 @@ class UpbitProTrader(QMainWindow):
         coins_text = self.input_coins.text().replace(" ", "")
         coins = [c for c in coins_text.split(',') if c]
         
-        if not coins:
+        # 자동 유니버스: 엔진이 거래대금 상위 종목 선택
+        if self.chk_auto_universe.isChecked():
+            coins = None
+        elif not coins:
             QMessageBox.warning(self, "경고", "감시할 코인을 입력해주세요.")
             return
         
         # 코인 코드 검증
-        invalid_coins = [c for c in coins if not c.startswith("KRW-")]
+        invalid_coins = [c for c in coins or [] if not c.startswith("KRW-")]
         if invalid_coins:
             QMessageBox.warning(self, "경고", 
                 f"잘못된 코인 코드: {', '.join(invalid_coins)}\n코인 코드는 'KRW-' 형식이어야 합니다.")
             return
         
-        self.universe = {}
-        self.table.setRowCount(0)
-        self.is_running = True
-        self.daily_loss_triggered = False
+        self._launch_engine(lambda: self.engine.start(coins))
+
+    def offer_resume(self):
+        """저장된 매매 상태가 있으면 이어서 매매할지 확인 (연결 직후)"""
+        if self.engine.is_running:
+            return
+        state = self.engine.load_state()
+        if state is None:
+            return
         
+        universe = state['universe']
+        held = sum(1 for data in universe.values() if data.get('qty', 0) > 0)
+        reply = QMessageBox.question(self, "매매 재개",
+            f"이전 매매 상태가 있습니다 (감시 {len(universe)}종목, 보유 {held}종목).\n"
+            "잔고와 맞춘 뒤 이어서 매매하시겠습니까?",
+            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No, QMessageBox.StandardButton.Yes)
+        if reply == QMessageBox.StandardButton.Yes:
+            self._launch_engine(lambda: self.engine.resume(state))
+
+    def _launch_engine(self, start):
+        """엔진 시작(새로 시작 / 상태 재개) 후 가격 모니터링 시작"""
         self.btn_start.setEnabled(False)
         self.btn_stop.setEnabled(True)
         self.status_trading.setText("● 분석 중")
         self.status_trading.setStyleSheet("color: #00b4d8;")
         
-        candle_interval = Config.CANDLE_INTERVALS[self.combo_candle.currentText()]
-        
-        for coin in coins:
-            try:
-                # 목표가 및 MA 계산
-                target_price = self.calculate_target_price(coin, candle_interval)
-                ma5 = self.calculate_ma(coin, candle_interval, 5)
-                current_price = pyupbit.get_current_price(coin)
-                
-                if target_price is None or ma5 is None:
-                    self.log(f"[WARN] {coin} 데이터 조회 실패")
-                    continue
-                
-                self.universe[coin] = {
-                    'name': coin,
-                    'state': '감시중',
-                    'row': len(self.universe),
-                    'target': target_price,
-                    'ma5': ma5,
-                    'current': current_price or 0,
-                    'qty': 0,
-                    'buy_price': 0,
-                    'invest_amt': 0,
-                    'high_since_buy': 0,
-                    'max_profit_rate': 0.0
-                }
-                
-                row = self.universe[coin]['row']
-                self.table.insertRow(row)
-                self.table.setItem(row, 0, QTableWidgetItem(coin))
-                self.table.setItem(row, 1, QTableWidgetItem(f"{current_price:,.0f}" if current_price else "-"))
-                self.table.setItem(row, 2, QTableWidgetItem(f"{target_price:,.0f}"))
-                self.table.setItem(row, 3, QTableWidgetItem(f"{ma5:,.0f}"))
-                self.set_table_item(row, 4, "👀 감시중", "#00b894")
-                
-                self.log(f"[{coin}] 목표가:{target_price:,.0f}, MA5:{ma5:,.0f}")
-                
-            except Exception as e:
-                self.log(f"[ERROR] {coin} 초기화 실패: {e}")
-                self.logger.error(f"{coin} 초기화 실패: {e}")
+        # 목표가/MA 계산 및 테이블 행 추가는 엔진 이벤트로 처리
+        self.engine.settings = self.current_settings()
+        count = start()
         
-        if self.universe:
+        if count:
             # 가격 모니터링 시작
-            self.price_thread.set_coins(list(self.universe.keys()))
+            self.price_thread.set_coins(list(self.engine.universe.keys()))
             self.price_thread.start()
             
             self.status_trading.setText("● 매매 중")
             self.status_trading.setStyleSheet("color: #00b894;")
-            self.status_realtime.setText(f"실시간: {len(self.universe)}종목 감시")
-            
-            self.log(f"🚀 자동매매 시작 (총 {len(self.universe)} 코인)")
-            self.logger.info(f"매매 시작: {len(self.universe)} 코인")
+            self.status_realtime.setText(f"실시간: {count}종목 감시")
         else:
             self.stop_trading()
             QMessageBox.warning(self, "경고", "유효한 코인이 없습니다.")
 
-    def stop_trading(self):
-        """매매 중지"""
-        self.is_running = False
-        self.price_thread.stop()
-        
-        self.btn_start.setEnabled(True)
-        self.btn_stop.setEnabled(False)
-        self.status_trading.setText("● 중지됨")
-        self.status_trading.setStyleSheet("color: #e63946;")
-        self.status_realtime.setText("실시간: 비활성")
-        
-        self.log("⏹️ 매매가 중지되었습니다")
-        self.logger.info("매매 중지")
-
-    # ------------------------------------------------------------------
-    # 전략 계산
-    # ------------------------------------------------------------------
-    def calculate_target_price(self, ticker, interval):
-        """변동성 돌파 목표가 계산"""
-        try:
-            df = pyupbit.get_ohlcv(ticker, interval=interval, count=2)
-            if df is None or len(df) < 2:
-                return None
-            
-            prev_high = df.iloc[-2]['high']
-            prev_low = df.iloc[-2]['low']
-            volatility = prev_high - prev_low
-            
-            current_open = df.iloc[-1]['open']
-            k = self.spin_k.value()
-            
-            return current_open + (volatility * k)
-        except Exception as e:
-            self.logger.error(f"목표가 계산 실패 ({ticker}): {e}")
-            return None
+    def on_universe_changed(self, tickers):
+        """매매 중 감시 종목 변경 → 가격 조회 대상/상태바 갱신"""
+        self.price_thread.set_coins(list(tickers))
+        self.status_realtime.setText(f"실시간: {len(tickers)}종목 감시")
 
-    def calculate_ma(self, ticker, interval, period=5):
-        """이동평균 계산"""
-        try:
-            df = pyupbit.get_ohlcv(ticker, interval=interval, count=period+1)
-            if df is None or len(df) < period:
-                return None
-            return df['close'].rolling(window=period).mean().iloc[-1]
-        except Exception as e:
-            self.logger.error(f"MA 계산 실패 ({ticker}): {e}")
-            return None
-
-    def calculate_rsi(self, ticker, period=14):
-        """RSI 계산"""
-        try:
-            interval = Config.CANDLE_INTERVALS[self.combo_candle.currentText()]
-            df = pyupbit.get_ohlcv(ticker, interval=interval, count=period+2)
-            if df is None or len(df) < period + 1:
-                return 50
-            
-            delta = df['close'].diff()
-            gain = delta.where(delta > 0, 0)
-            loss = (-delta).where(delta < 0, 0)
-            
-            avg_gain = gain.rolling(window=period).mean().iloc[-1]
-            avg_loss = loss.rolling(window=period).mean().iloc[-1]
-            
-            if avg_loss == 0:
-                return 100
-            
-            rs = avg_gain / avg_loss
-            return 100 - (100 / (1 + rs))
-        except Exception as e:
-            return 50
-
-    def calculate_macd(self, ticker):
-        """MACD 계산 (MACD, Signal, Histogram 반환)"""
-        try:
-            interval = Config.CANDLE_INTERVALS[self.combo_candle.currentText()]
-            df = pyupbit.get_ohlcv(ticker, interval=interval, count=50)
-            if df is None or len(df) < 30:
-                return 0, 0, 0
-            
-            close = df['close']
-            
-            # EMA 계산
-            ema_fast = close.ewm(span=Config.DEFAULT_MACD_FAST, adjust=False).mean()
-            ema_slow = close.ewm(span=Config.DEFAULT_MACD_SLOW, adjust=False).mean()
-            
-            # MACD = 단기 EMA - 장기 EMA
-            macd = ema_fast - ema_slow
-            
-            # Signal = MACD의 9일 EMA
-            signal = macd.ewm(span=Config.DEFAULT_MACD_SIGNAL, adjust=False).mean()
-            
-            # Histogram = MACD - Signal
-            histogram = macd - signal
-            
-            return macd.iloc[-1], signal.iloc[-1], histogram.iloc[-1]
-        except Exception as e:
-            self.logger.error(f"MACD 계산 실패 ({ticker}): {e}")
-            return 0, 0, 0
-
-    def calculate_bollinger_bands(self, ticker):
-        """볼린저 밴드 계산 (상단, 중간, 하단 반환)"""
-        try:
-            interval = Config.CANDLE_INTERVALS[self.combo_candle.currentText()]
-            period = Config.DEFAULT_BB_PERIOD
-            df = pyupbit.get_ohlcv(ticker, interval=interval, count=period + 5)
-            if df is None or len(df) < period:
-                return None, None, None
-            
-            close = df['close']
-            
-            # 중간선 (SMA)
-            middle = close.rolling(window=period).mean().iloc[-1]
-            
-            # 표준편차
-            std = close.rolling(window=period).std().iloc[-1]
-            
-            # 상단/하단 밴드
-            upper = middle + (std * Config.DEFAULT_BB_STD)
-            lower = middle - (std * Config.DEFAULT_BB_STD)
-            
-            return upper, middle, lower
-        except Exception as e:
-            self.logger.error(f"볼린저 밴드 계산 실패 ({ticker}): {e}")
-            return None, None, None
-
-    def calculate_atr(self, ticker, period=14):
-        """ATR (Average True Range) 계산"""
-        try:
-            interval = Config.CANDLE_INTERVALS[self.combo_candle.currentText()]
-            df = pyupbit.get_ohlcv(ticker, interval=interval, count=period + 5)
-            if df is None or len(df) < period:
-                return None
-            
-            high = df['high']
-            low = df['low']
-            close = df['close']
-            
-            # True Range 계산 (DataFrame 내장 연산 사용)
-            tr1 = high - low
-            tr2 = (high - close.shift()).abs()
-            tr3 = (low - close.shift()).abs()
-            
-            # 각 행에서 최대값 선택
-            df['tr'] = tr1
-            df.loc[tr2 > df['tr'], 'tr'] = tr2
-            df.loc[tr3 > df['tr'], 'tr'] = tr3
-            
-            # ATR = True Range의 이동평균
-            atr = df['tr'].rolling(window=period).mean().iloc[-1]
-            return atr
-        except Exception as e:
-            self.logger.error(f"ATR 계산 실패 ({ticker}): {e}")
-            return None
-
-    def calculate_volume_avg(self, ticker, period=20):
-        """평균 거래량 계산"""
-        try:
-            interval = Config.CANDLE_INTERVALS[self.combo_candle.currentText()]
-            df = pyupbit.get_ohlcv(ticker, interval=interval, count=period + 1)
-            if df is None or len(df) < period:
-                return None, None
-            
-            current_volume = df.iloc[-1]['volume']
-            avg_volume = df['volume'].iloc[:-1].mean()
-            
-            return current_volume, avg_volume
-        except Exception as e:
-            return None, None
-
-    def calculate_stoch_rsi(self, ticker, rsi_period=14, stoch_period=14, k_period=3, d_period=3):
-        """스토캐스틱 RSI 계산 (v2.5 신규)"""
-        try:
-            interval = Config.CANDLE_INTERVALS[self.combo_candle.currentText()]
-            df = pyupbit.get_ohlcv(ticker, interval=interval, count=rsi_period + stoch_period + 10)
-            if df is None or len(df) < rsi_period + stoch_period:
-                return 50, 50  # 기본값
-            
-            # RSI 계산
-            delta = df['close'].diff()
-            gain = delta.where(delta > 0, 0)
-            loss = (-delta).where(delta < 0, 0)
-            avg_gain = gain.rolling(window=rsi_period).mean()
-            avg_loss = loss.rolling(window=rsi_period).mean()
-            rs = avg_gain / avg_loss
-            rsi = 100 - (100 / (1 + rs))
-            
-            # 스토캐스틱 RSI 계산
-            rsi_min = rsi.rolling(window=stoch_period).min()
-            rsi_max = rsi.rolling(window=stoch_period).max()
-            stoch_rsi = (rsi - rsi_min) / (rsi_max - rsi_min) * 100
-            
-            # %K, %D
-            k = stoch_rsi.rolling(window=k_period).mean().iloc[-1]
-            d = stoch_rsi.rolling(window=d_period).mean().iloc[-1]
-            
-            return k if not pd.isna(k) else 50, d if not pd.isna(d) else 50
-        except Exception as e:
-            self.logger.error(f"스토캐스틱 RSI 계산 실패 ({ticker}): {e}")
-            return 50, 50
-
-    def calculate_dmi_adx(self, ticker, period=14):
-        """DMI와 ADX 계산 (v2.7) - 추세 강도 측정"""
-        try:
-            interval = Config.CANDLE_INTERVALS[self.combo_candle.currentText()]
-            df = pyupbit.get_ohlcv(ticker, interval=interval, count=period * 3)
-            if df is None or len(df) < period * 2:
-                return 0, 0, 0  # +DI, -DI, ADX
-            
-            high = df['high']
-            low = df['low']
-            close = df['close']
-            
-            # +DM, -DM 계산
-            plus_dm = high.diff()
-            minus_dm = -low.diff()
-            plus_dm[plus_dm < 0] = 0
-            minus_dm[minus_dm < 0] = 0
-            
-            # 조건: +DM > -DM일 때만 +DM 유효
-            plus_dm[(plus_dm < minus_dm) | (plus_dm < 0)] = 0
-            minus_dm[(minus_dm < plus_dm) | (minus_dm < 0)] = 0
-            
-            # True Range
-            tr1 = high - low
-            tr2 = (high - close.shift()).abs()
-            tr3 = (low - close.shift()).abs()
-            tr = pd.concat([tr1, tr2, tr3], axis=1).max(axis=1)
-            
-            # 평활화 (Wilder 스무딩)
-            atr = tr.rolling(window=period).mean()
-            
-            # ZeroDivision 방지: ATR이 0인 경우 처리
-            atr_safe = atr.replace(0, float('nan'))
-            plus_di = 100 * (plus_dm.rolling(window=period).mean() / atr_safe)
-            minus_di = 100 * (minus_dm.rolling(window=period).mean() / atr_safe)
-            
-            # DX와 ADX - ZeroDivision 방지
-            di_sum = plus_di + minus_di
-            di_sum_safe = di_sum.replace(0, float('nan'))
-            dx = 100 * (abs(plus_di - minus_di) / di_sum_safe)
-            adx = dx.rolling(window=period).mean()
-            
-            # NaN 처리
-            plus_di_val = plus_di.iloc[-1]
-            minus_di_val = minus_di.iloc[-1]
-            adx_val = adx.iloc[-1]
-            
-            return (
-                0 if pd.isna(plus_di_val) else plus_di_val,
-                0 if pd.isna(minus_di_val) else minus_di_val,
-                0 if pd.isna(adx_val) else adx_val
-            )
-        except Exception as e:
-            self.logger.error(f"DMI/ADX 계산 실패 ({ticker}): {e}")
-            return 0, 0, 0
-
-    def api_call_with_retry(self, func, *args, max_retries=None, delay=None):
-        """API 호출 재시도 래퍼 (v2.5 신규)"""
-        max_retries = max_retries or Config.API_MAX_RETRIES
-        delay = delay or Config.API_RETRY_DELAY
-        
-        for attempt in range(max_retries):
-            try:
-                result = func(*args)
-                return result
-            except Exception as e:
-                if attempt < max_retries - 1:
-                    self.logger.warning(f"API 호출 실패 (시도 {attempt + 1}/{max_retries}): {e}")
-                    time.sleep(delay * (attempt + 1))
-                else:
-                    self.logger.error(f"API 호출 최종 실패: {e}")
-                    raise
-
-    def calculate_entry_score(self, ticker, curr_price, info):
-        """진입 점수 계산 (v2.5 신규) - 0~100점"""
-        score = 0
-        reasons = []
-        weights = Config.ENTRY_WEIGHTS
-        
-        # 1. 목표가 돌파 (필수 조건이지만 점수로도 반영)
-        if curr_price >= info['target']:
-            score += weights['target_break']
-            reasons.append(f"+{weights['target_break']} 목표가 돌파")
-        
-        # 2. MA5 필터
-        if curr_price >= info['ma5']:
-            score += weights['ma_filter']
-            reasons.append(f"+{weights['ma_filter']} MA5 위")
-        
-        # 3. RSI 최적 구간
-        if self.chk_use_rsi.isChecked():
-            rsi = self.calculate_rsi(ticker, self.spin_rsi_period.value())
-            if 30 <= rsi <= 70:
-                score += weights['rsi_optimal']
-                reasons.append(f"+{weights['rsi_optimal']} RSI {rsi:.1f} (최적)")
-            elif rsi < 30:
-                score += weights['rsi_optimal'] // 2  # 과매도는 절반 점수
-                reasons.append(f"+{weights['rsi_optimal']//2} RSI {rsi:.1f} (과매도)")
-        else:
-            score += weights['rsi_optimal']  # RSI 미사용시 만점
-        
-        # 4. MACD 골든크로스
-        if hasattr(self, 'chk_use_macd') and self.chk_use_macd.isChecked():
-            macd, signal, histogram = self.calculate_macd(ticker)
-            if macd > signal:
-                score += weights['macd_golden']
-                reasons.append(f"+{weights['macd_golden']} MACD 골든크로스")
-        else:
-            score += weights['macd_golden']  # MACD 미사용시 만점
-        
-        # 5. 거래량 확인
-        if self.chk_use_volume.isChecked():
-            curr_vol, avg_vol = self.calculate_volume_avg(ticker, Config.DEFAULT_VOLUME_PERIOD)
-            if curr_vol and avg_vol:
-                required_vol = avg_vol * self.spin_volume_mult.value()
-                if curr_vol >= required_vol:
-                    score += weights['volume_confirm']
-                    reasons.append(f"+{weights['volume_confirm']} 거래량 충분")
-        else:
-            score += weights['volume_confirm']
-        
-        # 6. 볼린저 밴드 포지션
-        upper, middle, lower = self.calculate_bollinger_bands(ticker)
-        if lower and middle:
-            if lower <= curr_price <= middle:  # 하단~중간: 최적
-                score += weights['bb_position']
-                reasons.append(f"+{weights['bb_position']} BB 최적 구간")
-            elif middle < curr_price <= upper:  # 중간~상단: 절반
-                score += weights['bb_position'] // 2
-                reasons.append(f"+{weights['bb_position']//2} BB 중상단")
-        
-        return score, reasons
-
-    # ------------------------------------------------------------------
-    # 가격 업데이트 및 조건 확인
-    # ------------------------------------------------------------------
-    def on_price_update(self, prices):
-        """실시간 가격 업데이트"""
-        if not self.is_running:
+    def scan_market(self):
+        """전 종목 스캔 (백그라운드) → 상위 후보로 감시 코인 구성"""
+        if self.scan_thread is not None and self.scan_thread.isRunning():
             return
         
-        for ticker, price in prices.items():
-            if ticker not in self.universe:
-                continue
-            
-            info = self.universe[ticker]
-            info['current'] = price
-            
-            # 현재가 UI 업데이트
-            self.table.setItem(info['row'], 1, QTableWidgetItem(f"{price:,.0f}"))
-            
-            # 매수 로직
-            if info['state'] == '감시중' and info['qty'] == 0:
-                self._check_buy_condition(ticker, price, info)
-            
-            # 매도 로직
-            elif info['state'] == '보유중' and info['qty'] > 0:
-                self._check_sell_condition(ticker, price, info)
-
-    def _check_buy_condition(self, ticker, curr, info):
-        """매수 조건 확인"""
-        # 1. 목표가 돌파
-        if curr < info['target']:
-            return
+        self.engine.settings = self.current_settings()
+        self.btn_scan.setEnabled(False)
+        self.btn_scan.setText("🔎 스캔 중...")
+        self.log("🔎 KRW 전 종목 스캔 시작...")
         
-        # 2. MA5 위
-        if curr < info['ma5']:
-            return
-        
-        # 3. RSI 필터
-        if self.chk_use_rsi.isChecked():
-            rsi = self.calculate_rsi(ticker, self.spin_rsi_period.value())
-            if rsi >= self.spin_rsi_upper.value():
-                self.log(f"[{ticker}] RSI {rsi:.1f} >= {self.spin_rsi_upper.value()} (과매수) 진입 보류")
-                return
-        
-        # 4. MACD 필터 (골든크로스: MACD > Signal)
-        if hasattr(self, 'chk_use_macd') and self.chk_use_macd.isChecked():
-            macd, signal, histogram = self.calculate_macd(ticker)
-            if macd <= signal:
-                self.log(f"[{ticker}] MACD {macd:.2f} <= Signal {signal:.2f} (하락세) 진입 보류")
-                return
-        
-        # 5. 거래량 필터
-        if self.chk_use_volume.isChecked():
-            curr_vol, avg_vol = self.calculate_volume_avg(ticker, Config.DEFAULT_VOLUME_PERIOD)
-            if curr_vol and avg_vol:
-                required_vol = avg_vol * self.spin_volume_mult.value()
-                if curr_vol < required_vol:
-                    self.log(f"[{ticker}] 거래량 부족 ({curr_vol:,.0f} < {required_vol:,.0f}) 진입 보류")
-                    return
-        
-        # 6. 리스크 관리
-        if not self.check_risk_limits():
-            return
-        
-        # 7. v2.7: 진입 점수 체크 (선택적)
-        score, reasons = self.calculate_entry_score(ticker, curr, info)
-        if score < Config.ENTRY_SCORE_THRESHOLD:
-            self.log(f"[{ticker}] 진입 점수 {score:.0f} < {Config.ENTRY_SCORE_THRESHOLD} 진입 보류")
-            return
-        
-        # 매수 실행
-        self.log(f"[{ticker}] 진입 조건 충족 (점수: {score:.0f})")
-        self.execute_buy(ticker, curr)
-
-    def _check_sell_condition(self, ticker, curr, info):
-        """매도 조건 확인"""
-        buy_p = info['buy_price']
-        if buy_p == 0:
+        self.scan_thread = MarketScanThread(self.engine, Config.SCANNER_TOP_N, self)
+        self.scan_thread.scan_finished.connect(self.on_scan_finished)
+        self.scan_thread.scan_failed.connect(self.on_scan_failed)
+        self.scan_thread.finished.connect(self._on_scan_thread_done)
+        self.scan_thread.start()
+    
+    def on_scan_finished(self, candidates):
+        if not candidates:
+            self.log("🔎 조건에 맞는 후보가 없습니다 (감시 코인 유지)")
             return
         
-        profit_rate = (curr - buy_p) / buy_p * 100
-        
-        # 최고가 갱신
-        if curr > info['high_since_buy']:
-            info['high_since_buy'] = curr
-            info['max_profit_rate'] = profit_rate
-        
-        # UI 업데이트
-        row = info['row']
-        profit_item = QTableWidgetItem(f"{profit_rate:.2f}%")
-        if profit_rate >= 0:
-            profit_item.setForeground(QColor("#e63946"))
+        for line in format_candidates(candidates, Config.SCANNER_TOP_N):
+            self.log(f"  {line}")
+        self.input_coins.setText(",".join(c.ticker for c in candidates))
+        if self.engine.is_running:
+            self.log("🔎 감시 코인을 갱신했습니다 (다음 매매 시작 시 적용)")
         else:
-            profit_item.setForeground(QColor("#4361ee"))
-        self.table.setItem(row, 7, profit_item)
-        self.table.setItem(row, 8, QTableWidgetItem(f"{info['max_profit_rate']:.2f}%"))
-        
-        # 1. 손절
-        loss_limit = -self.spin_loss.value()
-        if profit_rate <= loss_limit:
-            self.log(f"🛑 [{ticker}] 손절 조건 ({profit_rate:.2f}%) → 매도")
-            self.execute_sell(ticker, "손절")
-            return
-        
-        # 2. 분할 익절 (v2.7 신규)
-        if hasattr(self, 'chk_use_partial_tp') and self.chk_use_partial_tp.isChecked():
-            partial_sold = info.get('partial_sold', [])
-            for level in Config.PARTIAL_TAKE_PROFIT:
-                rate = level['rate']
-                sell_ratio = level['sell_ratio']
-                
-                # 이 레벨에서 이미 매도했는지 확인
-                if rate in partial_sold:
-                    continue
-                
-                # 수익률 조건 충족
-                if profit_rate >= rate and sell_ratio > 0:
-                    partial_qty = info['qty'] * (sell_ratio / 100)
-                    if partial_qty * curr >= 5000:  # 최소 주문금액 확인
-                        self.log(f"💰 [{ticker}] {rate}% 도달 → {sell_ratio}% 분할 익절")
-                        self._execute_partial_sell(ticker, partial_qty, f"분할익절 {rate}%")
-                        info.setdefault('partial_sold', []).append(rate)
-                        return  # 한 번에 하나의 분할 매도만
-        
-        # 3. 트레일링 스톱
-        ts_start = self.spin_ts_start.value()
-        ts_stop = self.spin_ts_stop.value()
-        
-        if info['max_profit_rate'] >= ts_start:
-            drop = (info['high_since_buy'] - curr) / info['high_since_buy'] * 100
-            if drop >= ts_stop:
-                self.log(f"🎯 [{ticker}] 트레일링 스톱 (고점 대비 -{drop:.2f}%) → 이익 실현")
-                self.execute_sell(ticker, "TS")
-
-    # ------------------------------------------------------------------
-    # 주문 실행
-    # ------------------------------------------------------------------
-    def execute_buy(self, ticker, curr_price):
-        """매수 주문"""
-        if not self.upbit:
-            return
-        
-        ratio = self.spin_betting.value() / 100
-        bet_cash = self.balance * ratio
-        
-        if bet_cash < 5000:  # 업비트 최소 주문금액
-            self.log(f"[{ticker}] 매수금액 부족 (최소 5,000원)")
-            return
-        
-        try:
-            # 시장가 매수
-            result = self.upbit.buy_market_order(ticker, bet_cash)
-            
-            if result and 'uuid' in result:
-                info = self.universe[ticker]
-                info['state'] = '주문중'
-                self.set_table_item(info['row'], 4, "⏳ 주문중", "#ffc107")
-                
-                self.log(f"📤 [{ticker}] 매수 주문: {bet_cash:,.0f}원")
-                self.logger.info(f"매수 주문: {ticker} {bet_cash:,.0f}원")
-                
-                # 체결 확인
-                QTimer.singleShot(2000, lambda: self.check_buy_execution(ticker, result['uuid']))
-            else:
-                self.log(f"[ERROR] 매수 주문 실패: {result}")
-                
-        except Exception as e:
-            self.log(f"[ERROR] 매수 주문 실패: {e}")
-            self.logger.error(f"매수 주문 실패 ({ticker}): {e}")
-
-    def check_buy_execution(self, ticker, uuid, retry_count=0):
-        """매수 체결 확인 (최대 30회 재시도, 60초 타임아웃)"""
-        MAX_RETRIES = 30  # 최대 30회 (60초)
-        
-        try:
-            order = self.upbit.get_order(uuid)
-            if order and order.get('state') == 'done':
-                info = self.universe[ticker]
-                
-                # 체결 정보
-                executed_volume = float(order.get('executed_volume', 0))
-                paid_fee = float(order.get('paid_fee', 0))
-                total_price = float(order.get('price', 0)) + paid_fee
-                
-                if executed_volume > 0:
-                    avg_price = total_price / executed_volume
-                    
-                    info['qty'] = executed_volume
-                    info['buy_price'] = avg_price
-                    info['invest_amt'] = total_price
-                    info['high_since_buy'] = avg_price
-                    info['state'] = '보유중'
-                    
-                    row = info['row']
-                    self.table.setItem(row, 5, QTableWidgetItem(f"{executed_volume:.8f}"))
-                    self.table.setItem(row, 6, QTableWidgetItem(f"{avg_price:,.0f}"))
-                    self.table.setItem(row, 9, QTableWidgetItem(f"{total_price:,.0f}"))
-                    self.set_table_item(row, 4, "💼 보유중", "#00b4d8")
-                    
-                    self.log(f"✅ [{ticker}] 매수 체결: {executed_volume:.8f} @ {avg_price:,.0f}원")
-                    
-                    # v2.7: 거래 기록 추가
-                    self.add_trade_record(ticker, 'BUY', avg_price, executed_volume, 0, '매수 체결')
-                    
-                    self.get_balance()
-            elif order and order.get('state') == 'cancel':
-                # 주문 취소됨
-                info = self.universe.get(ticker)
-                if info:
-                    info['state'] = '감시중'
-                    self.set_table_item(info['row'], 4, "👀 감시중", "#00b894")
-                self.log(f"⚠️ [{ticker}] 매수 주문 취소됨")
-            else:
-                # 아직 체결 안됨, 재시도 횟수 확인
-                if retry_count < MAX_RETRIES:
-                    QTimer.singleShot(2000, lambda: self.check_buy_execution(ticker, uuid, retry_count + 1))
-                else:
-                    # 타임아웃 - 상태 복원
-                    self.log(f"[ERROR] [{ticker}] 매수 체결 확인 타임아웃 (60초)")
-                    self.logger.error(f"매수 체결 확인 타임아웃: {ticker}, uuid={uuid}")
-                    info = self.universe.get(ticker)
-                    if info:
-                        info['state'] = '체결확인실패'
-                        self.set_table_item(info['row'], 4, "❓ 확인필요", "#ffc107")
-        except Exception as e:
-            self.logger.error(f"체결 확인 실패 ({ticker}): {e}")
-
-    def execute_sell(self, ticker, reason):
-        """매도 주문"""
-        if not self.upbit:
-            return
-        
-        info = self.universe[ticker]
-        qty = info['qty']
-        if qty == 0:
-            return
-        
-        try:
-            result = self.upbit.sell_market_order(ticker, qty)
-            
-            if result and 'uuid' in result:
-                self.log(f"📤 [{ticker}] 매도 주문: {qty:.8f} ({reason})")
-                self.logger.info(f"매도 주문: {ticker} {qty:.8f} ({reason})")
-                
-                QTimer.singleShot(2000, lambda: self.check_sell_execution(ticker, result['uuid'], reason))
-            else:
-                self.log(f"[ERROR] 매도 주문 실패: {result}")
-                
-        except Exception as e:
-            self.log(f"[ERROR] 매도 주문 실패: {e}")
-            self.logger.error(f"매도 주문 실패 ({ticker}): {e}")
+            self.log(f"🔎 감시 코인을 상위 {len(candidates)}개 후보로 구성했습니다")
     
-    def _execute_partial_sell(self, ticker, qty, reason):
-        """부분 매도 주문 (v2.7 신규 - 분할 익절용)"""
-        if not self.upbit:
-            return
-        
-        info = self.universe.get(ticker)
-        if not info or qty <= 0:
-            return
-        
-        try:
-            result = self.upbit.sell_market_order(ticker, qty)
-            
-            if result and 'uuid' in result:
-                self.log(f"📤 [{ticker}] 분할 매도: {qty:.8f} ({reason})")
-                self.logger.info(f"분할 매도: {ticker} {qty:.8f} ({reason})")
-                
-                # 체결 확인 (분할 매도용)
-                QTimer.singleShot(2000, lambda: self._check_partial_sell_execution(
-                    ticker, result['uuid'], qty, reason
-                ))
-            else:
-                self.log(f"[ERROR] 분할 매도 실패: {result}")
-                
-        except Exception as e:
-            self.log(f"[ERROR] 분할 매도 실패: {e}")
-            self.logger.error(f"분할 매도 실패 ({ticker}): {e}")
+    def on_scan_failed(self, error):
+        self.log(f"❌ 전 종목 스캔 실패: {error}")
+        self.logger.error(f"전 종목 스캔 실패: {error}")
     
-    def _check_partial_sell_execution(self, ticker, uuid, qty, reason, retry_count=0):
-        """분할 매도 체결 확인"""
-        MAX_RETRIES = 30
-        
-        try:
-            order = self.upbit.get_order(uuid)
-            if order and order.get('state') == 'done':
-                info = self.universe.get(ticker)
-                if not info:
-                    return
-                
-                executed_volume = float(order.get('executed_volume', 0))
-                trades_price = float(order.get('trades', [{}])[0].get('price', 0)) if order.get('trades') else 0
-                
-                # 보유 수량 감소
-                info['qty'] -= executed_volume
-                
-                # 손익 계산 (부분)
-                sell_amount = executed_volume * trades_price
-                buy_portion = info['invest_amt'] * (executed_volume / (info['qty'] + executed_volume))
-                profit = sell_amount - buy_portion
-                
-                self.total_realized_profit += profit
-                self.trade_count += 1
-                if profit > 0:
-                    self.win_count += 1
-                
-                # UI 업데이트
-                self.lbl_total_profit.setText(f"📈 당일 실현손익: {self.total_realized_profit:,.0f}원")
-                self.table.setItem(info['row'], 5, QTableWidgetItem(f"{info['qty']:.8f}"))
-                
-                self.log(f"✅ [{ticker}] 분할 매도 체결 (손익: {profit:+,.0f}원)")
-                self.add_trade_record(ticker, 'PARTIAL_SELL', trades_price, executed_volume, profit, reason)
-                
-                self.get_balance()
-            else:
-                if retry_count < MAX_RETRIES:
-                    QTimer.singleShot(2000, lambda: self._check_partial_sell_execution(
-                        ticker, uuid, qty, reason, retry_count + 1
-                    ))
-                else:
-                    self.log(f"[ERROR] [{ticker}] 분할 매도 체결 확인 타임아웃")
-        except Exception as e:
-            self.logger.error(f"분할 매도 체결 확인 실패 ({ticker}): {e}")
+    def _on_scan_thread_done(self):
+        self.btn_scan.setEnabled(True)
+        self.btn_scan.setText("🔎 전 종목 스캔")
 
-    def check_sell_execution(self, ticker, uuid, reason, retry_count=0):
-        """매도 체결 확인 (최대 30회 재시도, 60초 타임아웃)"""
-        MAX_RETRIES = 30  # 최대 30회 (60초)
+    def stop_trading(self):
+        """매매 중지"""
+        self.engine.stop()
+        self.price_thread.stop()
         
-        try:
-            order = self.upbit.get_order(uuid)
-            if order and order.get('state') == 'done':
-                info = self.universe[ticker]
-                
-                executed_volume = float(order.get('executed_volume', 0))
-                trades_price = float(order.get('trades', [{}])[0].get('price', 0)) if order.get('trades') else 0
-                
-                # 손익 계산
-                sell_amount = executed_volume * trades_price
-                buy_amount = info['invest_amt']
-                profit = sell_amount - buy_amount
-                
-                self.total_realized_profit += profit
-                self.trade_count += 1
-                if profit > 0:
-                    self.win_count += 1
-                
-                # UI 업데이트
-                profit_text = f"📈 당일 실현손익: {self.total_realized_profit:,.0f}원"
-                self.lbl_total_profit.setText(profit_text)
-                
-                info['qty'] = 0
-                info['state'] = '매도완료'
-                self.set_table_item(info['row'], 4, "✅ 청산완료", "#6c757d")
-                
-                self.log(f"✅ [{ticker}] 매도 체결 (손익: {profit:+,.0f}원)")
-                
-                # v2.7: 거래 기록 추가
-                self.add_trade_record(ticker, 'SELL', trades_price, executed_volume, profit, reason)
-                
-                self._update_statistics()
-                self.get_balance()
-            elif order and order.get('state') == 'cancel':
-                # 주문 취소됨
-                self.log(f"⚠️ [{ticker}] 매도 주문 취소됨")
-                info = self.universe.get(ticker)
-                if info and info['qty'] > 0:
-                    info['state'] = '보유중'
-                    self.set_table_item(info['row'], 4, "💼 보유중", "#00b4d8")
-            else:
-                # 아직 체결 안됨, 재시도 횟수 확인
-                if retry_count < MAX_RETRIES:
-                    QTimer.singleShot(2000, lambda: self.check_sell_execution(ticker, uuid, reason, retry_count + 1))
-                else:
-                    # 타임아웃 - 로그만 기록 (실제 주문은 여전히 대기 중일 수 있음)
-                    self.log(f"[ERROR] [{ticker}] 매도 체결 확인 타임아웃 (60초)")
-                    self.logger.error(f"매도 체결 확인 타임아웃: {ticker}, uuid={uuid}")
-                    info = self.universe.get(ticker)
-                    if info:
-                        info['state'] = '체결확인실패'
-                        self.set_table_item(info['row'], 4, "❓ 확인필요", "#ffc107")
-        except Exception as e:
-            self.logger.error(f"매도 체결 확인 실패 ({ticker}): {e}")
+        self.btn_start.setEnabled(True)
+        self.btn_stop.setEnabled(False)
+        self.status_trading.setText("● 중지됨")
+        self.status_trading.setStyleSheet("color: #e63946;")
+        self.status_realtime.setText("실시간: 비활성")
 
     # ------------------------------------------------------------------
     # 일괄 매도/매수 기능 (v2.6 신규)
     # ------------------------------------------------------------------
     def get_all_holdings(self):
         """현재 보유 중인 모든 KRW 마켓 코인 조회"""
-        if not self.upbit:
+        if not self.engine.upbit:
             return []
         
         holdings = []
         try:
-            balances = self.upbit.get_balances()
+            balances = self.engine.upbit.get_balances()
             for item in balances:
                 currency = item.get('currency', '')
                 balance = float(item.get('balance', 0))
@@ -2925,7 +2514,7 @@ class UpbitProTrader(QMainWindow):
 
     def execute_batch_sell(self):
         """모든 보유 코인 일괄 시장가 매도"""
-        if not self.upbit:
+        if not self.engine.upbit:
             QMessageBox.warning(self, "경고", "먼저 API에 연결해주세요.")
             return
         
@@ -2969,7 +2558,7 @@ class UpbitProTrader(QMainWindow):
             ticker = holding['ticker']
             qty = holding['qty']
             try:
-                result = self.upbit.sell_market_order(ticker, qty)
+                result = self.engine.upbit.sell_market_order(ticker, qty)
                 if result and 'uuid' in result:
                     self.log(f"  ✅ [{ticker}] 매도 주문: {qty:.8f}")
                     self.add_trade_record(ticker, 'SELL', 0, qty, 0, "일괄매도")
@@ -2992,7 +2581,7 @@ class UpbitProTrader(QMainWindow):
 
     def execute_batch_buy(self):
         """입력된 코인들 현재가로 일괄 매수"""
-        if not self.upbit:
+        if not self.engine.upbit:
             QMessageBox.warning(self, "경고", "먼저 API에 연결해주세요.")
             return
         
@@ -3006,20 +2595,20 @@ class UpbitProTrader(QMainWindow):
         
         # 잔고 확인
         self.get_balance()
-        if self.balance < 5000 * len(coins):
+        if self.engine.balance < 5000 * len(coins):
             QMessageBox.warning(self, "경고", 
-                f"잔고가 부족합니다.\n필요 최소 금액: {5000 * len(coins):,}원\n현재 잔고: {self.balance:,.0f}원")
+                f"잔고가 부족합니다.\n필요 최소 금액: {5000 * len(coins):,}원\n현재 잔고: {self.engine.balance:,.0f}원")
             return
         
         # 투자금 계산 (균등 분배)
-        invest_per_coin = self.balance / len(coins)
+        invest_per_coin = self.engine.balance / len(coins)
         
         # 1차 확인
         coins_text_display = "\n".join([f"  • {c}: {invest_per_coin:,.0f}원" for c in coins])
         reply = QMessageBox.warning(self, "⚠️ 일괄 매수 확인",
             f"정말로 아래 코인들을 매수하시겠습니까?\n\n"
             f"【매수 계획】\n{coins_text_display}\n\n"
-            f"💰 총 투자금: {self.balance:,.0f}원\n"
+            f"💰 총 투자금: {self.engine.balance:,.0f}원\n"
             f"📊 종목당 투자금: {invest_per_coin:,.0f}원\n\n"
             f"⚠️ 이 작업은 취소할 수 없습니다!",
             QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
@@ -3050,7 +2639,7 @@ class UpbitProTrader(QMainWindow):
                     self.log(f"  ⚠️ [{coin}] 최소 주문금액 미달")
                     continue
                 
-                result = self.upbit.buy_market_order(coin, buy_amount)
+                result = self.engine.upbit.buy_market_order(coin, buy_amount)
                 if result and 'uuid' in result:
                     self.log(f"  ✅ [{coin}] 매수 주문: {buy_amount:,.0f}원")
                     bought_count += 1
@@ -3072,29 +2661,6 @@ class UpbitProTrader(QMainWindow):
 
     # ------------------------------------------------------------------
     # 유틸리티
-    def check_risk_limits(self):
-        """리스크 한도 체크"""
-        if not self.chk_use_risk.isChecked():
-            return True
-        
-        # 일일 손실 한도
-        if self.initial_balance > 0:
-            loss_rate = (self.total_realized_profit / self.initial_balance) * 100
-            max_loss = -self.spin_max_loss.value()
-            
-            if loss_rate <= max_loss:
-                if not self.daily_loss_triggered:
-                    self.daily_loss_triggered = True
-                    self.log(f"🛑 일일 손실 한도 도달! ({loss_rate:.2f}%)")
-                return False
-        
-        # 최대 보유 종목
-        holdings = sum(1 for info in self.universe.values() if info['qty'] > 0)
-        if holdings >= self.spin_max_holdings.value():
-            return False
-        
-        return True
-
     def apply_preset(self, preset_type):
         """프리셋 적용"""
         if preset_type in Config.DEFAULT_PRESETS:
@@ -3102,51 +2668,33 @@ class UpbitProTrader(QMainWindow):
             self.apply_preset_values(preset)
 
     def set_table_item(self, row, col, text, bg_color):
-        """테이블 아이템 설정"""
-        item = QTableWidgetItem(text)
-        item.setBackground(QColor(bg_color))
-        item.setForeground(QColor("#1a1a2e"))
-        self.table.setItem(row, col, item)
+        """테이블 아이템 설정 (갱신 버퍼 경유)"""
+        self.table_buffer.set(row, col, text, "#1a1a2e", bg_color)
 
     def _update_statistics(self):
         """통계 업데이트"""
-        self.stat_trades.setText(f"📊 총 거래 횟수\n{self.trade_count} 회")
+        engine = self.engine
+        self.stat_trades.setText(f"📊 총 거래 횟수\n{engine.trade_count} 회")
         
-        winrate = (self.win_count / self.trade_count * 100) if self.trade_count > 0 else 0
+        winrate = (engine.win_count / engine.trade_count * 100) if engine.trade_count > 0 else 0
         self.stat_winrate.setText(f"🎯 승률\n{winrate:.1f} %")
         
-        self.stat_profit.setText(f"💰 총 실현손익\n{self.total_realized_profit:,.0f} 원")
+        self.stat_profit.setText(f"💰 총 실현손익\n{engine.total_realized_profit:,.0f} 원")
         
-        holdings = sum(1 for info in self.universe.values() if info['qty'] > 0)
-        self.stat_holdings.setText(f"📦 보유 종목\n{holdings} 개")
+        self.stat_holdings.setText(f"📦 보유 종목\n{engine.holdings_count()} 개")
 
     def reset_statistics(self):
         """통계 초기화"""
         reply = QMessageBox.question(self, "확인", "거래 통계를 초기화하시겠습니까?",
                                     QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No, QMessageBox.StandardButton.No)
         if reply == QMessageBox.StandardButton.Yes:
-            self.total_realized_profit = 0
-            self.trade_count = 0
-            self.win_count = 0
-            self._update_statistics()
-            self.lbl_total_profit.setText("📈 당일 실현손익: 0 원")
+            self.engine.reset_statistics()
             self.log("🔄 통계 초기화됨")
 
     def log(self, msg):
-        """로그 출력 (v2.5 메모리 제한 적용)"""
+        """로그 출력 (링 버퍼에 추가, 화면 반영은 LogPaneSink 타이머에서 일괄)"""
         t = datetime.datetime.now().strftime("[%H:%M:%S]")
-        self.log_text.append(f"{t} {msg}")
-        
-        # 메모리 제한: 최대 로그 라인 수 보다 많으면 오래된 로그 삭제
-        if self.log_text.document().blockCount() > Config.MAX_LOG_LINES:
-            cursor = self.log_text.textCursor()
-            cursor.movePosition(QTextCursor.MoveOperation.Start)
-            cursor.movePosition(QTextCursor.MoveOperation.Down, 
-                              QTextCursor.MoveMode.KeepAnchor, 50)
-            cursor.removeSelectedText()
-        
-        sb = self.log_text.verticalScrollBar()
-        sb.setValue(sb.maximum())
+        self.log_buffer.append(f"{t} {msg}")
     
     # ------------------------------------------------------------------
     # v2.7: 도구 메뉴 함수
@@ -3158,9 +2706,11 @@ class UpbitProTrader(QMainWindow):
                 QMessageBox.warning(self, "경고", "upbit_analytics 모듈을 찾을 수 없습니다.")
                 return
             
-            analytics = UpbitTradingAnalytics(Config.TRADE_HISTORY_FILE)
+            if self.analytics is None:
+                from upbit_analytics import UpbitTradingAnalytics
+                self.analytics = UpbitTradingAnalytics(Config.TRADE_HISTORY_FILE)
             output_path = "analytics_report.html"
-            analytics.generate_report_html(output_path)
+            self.analytics.generate_report_html(output_path)
             
             self.log(f"📊 거래 분석 리포트 생성: {output_path}")
             os.startfile(output_path)
@@ -3185,6 +2735,7 @@ class UpbitProTrader(QMainWindow):
             
             self.log(f"🧪 [{ticker}] 백테스트 시작...")
             
+            from upbit_backtester import UpbitBacktestEngine, volatility_breakout_strategy
             engine = UpbitBacktestEngine(initial_capital=10_000_000)
             result = engine.run_backtest(ticker, volatility_breakout_strategy, 
                                         interval="day", count=200)
@@ -3201,7 +2752,7 @@ class UpbitProTrader(QMainWindow):
     def export_trade_history(self):
         """거래 내역 CSV 내보내기"""
         try:
-            if not self.trade_history:
+            if not self._has_trade_records():
                 QMessageBox.information(self, "알림", "내보낼 거래 내역이 없습니다.")
                 return
             
@@ -3211,7 +2762,7 @@ class UpbitProTrader(QMainWindow):
             with open(filename, 'w', newline='', encoding='utf-8-sig') as f:
                 writer = csv.DictWriter(f, fieldnames=['timestamp', 'ticker', 'type', 'price', 'quantity', 'amount', 'profit', 'reason'])
                 writer.writeheader()
-                writer.writerows(self.trade_history)
+                writer.writerows(self.trade_store.iter_records())
             
             self.log(f"💾 거래 내역 내보내기: {filename}")
             os.startfile(os.path.dirname(os.path.abspath(filename)) or '.')
@@ -3220,73 +2771,25 @@ class UpbitProTrader(QMainWindow):
             QMessageBox.critical(self, "오류", f"내보내기 실패: {e}")
 
     def load_trade_history(self):
-        """거래 히스토리 불러오기 (v2.5 신규)"""
-        try:
-            if os.path.exists(Config.TRADE_HISTORY_FILE):
-                with open(Config.TRADE_HISTORY_FILE, 'r', encoding='utf-8') as f:
-                    self.trade_history = json.load(f)
-        except Exception as e:
-            self.trade_history = []
-            logging.error(f"거래 히스토리 로드 실패: {e}")
+        """거래 히스토리 저장소 열기 (SQLite 저장소 / 추가 전용 저널)
 
-    def save_trade_history(self):
-        """거래 히스토리 저장 (v2.5 신규)"""
-        try:
-            with open(Config.TRADE_HISTORY_FILE, 'w', encoding='utf-8') as f:
-                json.dump(self.trade_history, f, ensure_ascii=False, indent=2)
-        except Exception as e:
-            self.logger.error(f"거래 히스토리 저장 실패: {e}")
+        기록은 히스토리 탭 모델이 필요한 만큼만 조회합니다.
+        """
+        self.trade_store = open_trade_history(
+            Config.TRADE_HISTORY_FILE,
+            legacy_paths=(Config.TRADE_JOURNAL_FILE, Config.LEGACY_TRADE_HISTORY_FILE)
+        )
 
     def add_trade_record(self, ticker, trade_type, price, quantity, profit=0, reason=""):
-        """거래 기록 추가 (v2.5 신규)"""
-        record = {
-            'timestamp': datetime.datetime.now().isoformat(),
-            'ticker': ticker,
-            'type': trade_type,  # 'BUY' or 'SELL'
-            'price': price,
-            'quantity': quantity,
-            'amount': price * quantity,
-            'profit': profit,
-            'reason': reason
-        }
-        self.trade_history.append(record)
-        
-        # 히스토리 테이블 업데이트
-        if hasattr(self, 'history_table'):
-            self._add_history_row(record)
-        
-        # 자동 저장
-        self.save_trade_history()
+        """거래 기록 추가 (v2.5 신규) - 저장은 엔진, 화면 반영은 on_trade_recorded"""
+        self.engine.record_trade(ticker, trade_type, price, quantity, profit, reason)
 
-    def _add_history_row(self, record):
-        """히스토리 테이블에 행 추가"""
-        row = self.history_table.rowCount()
-        self.history_table.insertRow(row)
-        
-        # 타임스탬프 파싱
-        ts = datetime.datetime.fromisoformat(record['timestamp'])
-        
-        self.history_table.setItem(row, 0, QTableWidgetItem(ts.strftime("%m/%d %H:%M")))
-        self.history_table.setItem(row, 1, QTableWidgetItem(record['ticker']))
-        
-        type_item = QTableWidgetItem(record['type'])
-        if record['type'] == 'BUY':
-            type_item.setForeground(QColor("#e63946"))
-        else:
-            type_item.setForeground(QColor("#4361ee"))
-        self.history_table.setItem(row, 2, type_item)
-        
-        self.history_table.setItem(row, 3, QTableWidgetItem(f"{record['price']:,.0f}"))
-        self.history_table.setItem(row, 4, QTableWidgetItem(f"{record['amount']:,.0f}"))
-        
-        profit_item = QTableWidgetItem(f"{record['profit']:+,.0f}" if record['profit'] else "-")
-        if record['profit'] > 0:
-            profit_item.setForeground(QColor("#e63946"))
-        elif record['profit'] < 0:
-            profit_item.setForeground(QColor("#4361ee"))
-        self.history_table.setItem(row, 5, profit_item)
-        
-        self.history_table.setItem(row, 6, QTableWidgetItem(record.get('reason', '')))
+    def on_trade_recorded(self, record, rowid):
+        """히스토리 테이블에 1행 삽입"""
+        if hasattr(self, 'history_model'):
+            self.history_model.add_record(record, rowid)
+            if self.combo_history_ticker.findData(record['ticker']) < 0:
+                self._refresh_history_tickers()
 
     # ------------------------------------------------------------------
     # v3.0: 긴급 청산
@@ -3305,47 +2808,11 @@ class UpbitProTrader(QMainWindow):
     
     def get_all_holdings(self):
         """현재 보유 중인 모든 코인 정보 반환"""
-        holdings = []
-        
-        for ticker, info in self.universe.items():
-            if info.get('state') == '보유중' and info.get('qty', 0) > 0:
-                buy_price = info.get('buy_price', 0)
-                current = info.get('current', 0)
-                
-                if buy_price > 0:
-                    pnl = (current - buy_price) / buy_price * 100
-                else:
-                    pnl = 0
-                
-                holdings.append({
-                    'ticker': ticker,
-                    'qty': info.get('qty', 0),
-                    'buy_price': buy_price,
-                    'current': current,
-                    'pnl': pnl
-                })
-        
-        return holdings
+        return self.engine.get_holdings()
     
     def execute_emergency_close(self):
         """긴급 전량 청산 실행"""
-        holdings = self.get_all_holdings()
-        
-        if not holdings:
-            self.log("⚠️ 청산할 보유 코인이 없습니다")
-            return
-        
-        self.log("🚨 긴급 전량 청산 시작")
-        
-        for h in holdings:
-            ticker = h['ticker']
-            try:
-                self.execute_sell(ticker, "긴급청산")
-                self.log(f"🚨 [{ticker}] 긴급 청산 완료")
-            except Exception as e:
-                self.log(f"[ERROR] {ticker} 긴급 청산 실패: {e}")
-        
-        self.log("🚨 긴급 전량 청산 종료")
+        self.engine.close_all_positions("긴급청산")
 
     def closeEvent(self, event):
         """종료 처리"""
@@ -3356,7 +2823,7 @@ class UpbitProTrader(QMainWindow):
             self.send_notification("Upbit Pro Trader", "트레이로 최소화되었습니다. 더블클릭으로 다시 열 수 있습니다.")
             return
         
-        if self.is_running:
+        if self.engine.is_running:
             reply = QMessageBox.question(self, "종료 확인",
                 "매매가 진행 중입니다. 정말 종료하시겠습니까?",
                 QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No, QMessageBox.StandardButton.No)
@@ -3366,12 +2833,15 @@ class UpbitProTrader(QMainWindow):
         
         # v2.7: 종료 전 설정 저장
         self.save_settings()
-        self.save_trade_history()
+        self.engine.checkpoint_state()
+        self.trade_store.close()
         
         self.price_thread.stop()
         self.price_thread.wait()
         self.tray_icon.hide()
         self.logger.info("프로그램 종료")
+        if self.log_listener:
+            self.log_listener.stop()  # 큐에 남은 로그 기록 후 종료
         event.accept()
 
 
@@ -3381,8 +2851,12 @@ class UpbitProTrader(QMainWindow):
 if __name__ == "__main__":
     app = QApplication(sys.argv)
     app.setStyle('Fusion')
+    STARTUP.mark("QApplication")
     
     trader = UpbitProTrader()
-    trader.show()
+    # 트레이 최소화 시작 옵션 (Windows 시작 프로그램 등록 시 유용)
+    if not (trader.system_settings.get('start_minimized') and QSystemTrayIcon.isSystemTrayAvailable()):
+        trader.show()
+    QTimer.singleShot(0, trader.on_startup_shown)
     
     sys.exit(app.exec())
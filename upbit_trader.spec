@@ -27,6 +27,21 @@ datas = [
     ('upbit_config.py', '.'),
     ('upbit_strategy.py', '.'),
     ('upbit_dialogs.py', '.'),
+    ('upbit_trade_journal.py', '.'),
+    ('upbit_trade_store.py', '.'),
+    ('upbit_history_model.py', '.'),
+    ('upbit_table_buffer.py', '.'),
+    ('upbit_log_pipeline.py', '.'),
+    ('upbit_engine.py', '.'),
+    ('upbit_startup.py', '.'),
+    ('upbit_candles.py', '.'),
+    ('upbit_scanner.py', '.'),
+    ('upbit_features.py', '.'),
+    ('upbit_positions.py', '.'),
+    ('upbit_orders.py', '.'),
+    ('upbit_timers.py', '.'),
+    ('upbit_ticks.py', '.'),
+    ('upbit_state.py', '.'),
     # v2.7 확장 모듈
     ('upbit_analytics.py', '.'),
     ('upbit_indicators.py', '.'),